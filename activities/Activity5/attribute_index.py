@@ -0,0 +1,426 @@
+"""
+Attribute Index for Direct Property Lookups
+===========================================
+This module builds an inverted index over node attributes so that property
+queries can be answered without traversing the graph.
+
+For queries like "type warehouse" or "region north" the set of matching
+nodes does not depend on traversal order at all, yet bfs_search_all_components
+visits every node to find them. The index stores:
+
+    type, region, priority   value -> sorted array of node indices
+    capacity                 node indices sorted by capacity, plus the
+                             sorted capacities for binary search
+
+so type/region/priority lookups return a ready-made posting list and
+capacity_min/capacity_max become a bisect plus a slice. Both cost
+O(log N + result) instead of O(N + E).
+
+The index can be persisted next to the graph file (graph_large.gidx) and
+is memory-mapped when loaded again.
+
+Usage:
+    python attribute_index.py <graph_file>
+
+Examples:
+    python attribute_index.py graph_large.json
+    python attribute_index.py graph_large.gbin
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+
+from csr_graph import as_csr_graph, graph_nodes
+from graph_binary import BINARY_EXTENSION, load_graph_binary
+from graph_stream import load_graph_streaming
+from search_criteria import Criterion, check_limit, compile_or_report
+
+
+MAGIC = b"ATTRIDX\0"
+FORMAT_VERSION = 1
+INDEX_EXTENSION = ".gidx"
+
+# Attributes with one posting list per distinct value
+POSTING_ATTRIBUTES = ["type", "region", "priority"]
+
+_PREAMBLE = struct.Struct("<8sII")
+_EMPTY = array('i')
+
+
+def _attribute_column(csr, attribute):
+    """
+    Return one attribute for every node, in node index order.
+
+    Args:
+        csr (CSRGraph): Graph
+        attribute (str): type, region, priority or capacity
+
+    Returns:
+        list: Attribute value per node
+    """
+    if csr.columns is not None:
+        column = csr.columns[attribute]
+        if csr.categories is not None and attribute in csr.categories:
+            names = csr.categories[attribute]
+            return [names[code] for code in column]
+        return list(column)
+    return [node[attribute] for node in graph_nodes(csr)]
+
+
+def graph_fingerprint(csr):
+    """
+    Summarise a graph's size and indexed attributes to detect stale indexes.
+
+    Column-backed graphs are checksummed over the raw column buffers and
+    the category names their codes refer to, so checking a persisted index
+    creates no Python objects per node. Graphs that kept node dictionaries
+    are checksummed over their attribute values.
+
+    Args:
+        csr (CSRGraph): Graph
+
+    Returns:
+        dict: num_nodes, num_edges and a CRC32 of the indexed attributes
+    """
+    checksum = 0
+    if csr.columns is not None:
+        for attribute in POSTING_ATTRIBUTES + ["capacity"]:
+            checksum = zlib.crc32(csr.columns[attribute], checksum)
+        categories = {attribute: list(csr.categories[attribute])
+                      for attribute in ("type", "region")}
+        checksum = zlib.crc32(json.dumps(categories).encode("utf-8"), checksum)
+    else:
+        for attribute in POSTING_ATTRIBUTES + ["capacity"]:
+            values = _attribute_column(csr, attribute)
+            checksum = zlib.crc32(json.dumps(values).encode("utf-8"), checksum)
+    return {"num_nodes": csr.num_nodes, "num_edges": csr.num_edges, "checksum": checksum}
+
+
+class AttributeIndex:
+    """
+    Inverted index over type, region and priority, and a sorted capacity index.
+
+    Attributes:
+        postings (dict): {attribute: {value_key: array of node indices}}
+            where value_key is the value as a string
+        capacity_order (array): Node indices sorted by capacity
+        sorted_capacity (array): Capacities in the same order
+        fingerprint (dict): Fingerprint of the graph the index was built for
+    """
+
+    def __init__(self, postings, capacity_order, sorted_capacity, fingerprint):
+        self.postings = postings
+        self.capacity_order = capacity_order
+        self.sorted_capacity = sorted_capacity
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, graph):
+        """
+        Build the index from a graph in one pass per attribute.
+
+        Args:
+            graph (dict, CSRGraph or GraphHandle): Graph structure
+
+        Returns:
+            AttributeIndex: Index over the graph's node attributes
+        """
+        csr = as_csr_graph(graph)
+
+        postings = {}
+        for attribute in POSTING_ATTRIBUTES:
+            lists = {}
+            for i, value in enumerate(_attribute_column(csr, attribute)):
+                key = str(value)
+                posting = lists.get(key)
+                if posting is None:
+                    posting = lists[key] = array('i')
+                posting.append(i)
+            postings[attribute] = lists
+
+        capacity = _attribute_column(csr, "capacity")
+        capacity_order = array('i', sorted(range(csr.num_nodes), key=capacity.__getitem__))
+        sorted_capacity = array('i', [capacity[i] for i in capacity_order])
+
+        return cls(postings, capacity_order, sorted_capacity, graph_fingerprint(csr))
+
+    def lookup(self, search_property, search_value):
+        """
+        Return the indices of all nodes matching one search criterion.
+
+        Args:
+            search_property (str): type, region, priority, capacity_min or capacity_max
+            search_value (str): Value to match
+
+        Returns:
+            array or memoryview: Matching node indices. Posting lists are in
+            node index order; capacity ranges are in capacity order.
+
+        Raises:
+            ValueError: If the property is unknown or the value is not an
+                integer where one is required
+        """
+        if search_property in ["type", "region"]:
+            return self.postings[search_property].get(search_value, _EMPTY)
+
+        if search_property == "priority":
+            key = str(_parse_int(search_property, search_value))
+            return self.postings["priority"].get(key, _EMPTY)
+
+        if search_property == "capacity_min":
+            start = bisect_left(self.sorted_capacity,
+                                _parse_int(search_property, search_value))
+            return self.capacity_order[start:]
+
+        if search_property == "capacity_max":
+            end = bisect_right(self.sorted_capacity,
+                               _parse_int(search_property, search_value))
+            return self.capacity_order[:end]
+
+        raise ValueError(f"Unknown search property '{search_property}'")
+
+    def lookup_criteria(self, criteria):
+        """
+        Return the indices of all nodes matching compiled criteria.
+
+        Single criteria are answered by lookup(); AND/OR combinations
+        intersect or unite the posting lists of their terms.
+
+        Args:
+            criteria (Criterion or CompoundCriteria): Compiled criteria
+                (see search_criteria.py)
+
+        Returns:
+            array, memoryview or list: Matching node indices. Combined
+            criteria are returned in node index order.
+        """
+        if isinstance(criteria, Criterion):
+            return self.lookup(criteria.search_property, criteria.search_value)
+
+        matches = set(self.lookup_criteria(criteria.children[0]))
+        for child in criteria.children[1:]:
+            if criteria.operator == "and":
+                matches.intersection_update(self.lookup_criteria(child))
+            else:
+                matches.update(self.lookup_criteria(child))
+        return sorted(matches)
+
+    def save(self, filename):
+        """
+        Write the index to a memory-mappable file.
+
+        Args:
+            filename (str): Output filename (usually *.gidx)
+        """
+        data = array('i')
+        table = {}
+        for attribute, lists in self.postings.items():
+            table[attribute] = {}
+            for key, posting in lists.items():
+                table[attribute][key] = [len(data), len(posting)]
+                data.extend(posting)
+        capacity_offset = len(data)
+        data.extend(self.capacity_order)
+        data.extend(self.sorted_capacity)
+
+        header = json.dumps({
+            "byteorder": sys.byteorder,
+            "fingerprint": self.fingerprint,
+            "postings": table,
+            "capacity_offset": capacity_offset,
+            "num_nodes": len(self.capacity_order)
+        }).encode("utf-8")
+        header += b" " * (-(_PREAMBLE.size + len(header)) % 8)
+
+        with open(filename, 'wb') as f:
+            f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+            f.write(header)
+            f.write(data.tobytes())
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Memory-map an index written by save().
+
+        Args:
+            filename (str): Index filename
+
+        Returns:
+            AttributeIndex: Index backed by the mapped file
+
+        Raises:
+            ValueError: If the file is not a supported index file
+        """
+        with open(filename, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_length = _PREAMBLE.unpack_from(mapped, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"'{filename}' is not a supported attribute index file")
+        header = json.loads(bytes(mapped[_PREAMBLE.size:_PREAMBLE.size + header_length]))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"'{filename}' was written on a {header['byteorder']}-endian machine")
+
+        data = memoryview(mapped)[_PREAMBLE.size + header_length:].cast('i')
+        postings = {
+            attribute: {key: data[start:start + count]
+                        for key, (start, count) in lists.items()}
+            for attribute, lists in header["postings"].items()
+        }
+        start, n = header["capacity_offset"], header["num_nodes"]
+        return cls(postings, data[start:start + n], data[start + n:start + 2 * n],
+                   header["fingerprint"])
+
+
+def _parse_int(search_property, search_value):
+    """
+    Parse an integer search value with the usual error message.
+
+    Args:
+        search_property (str): Property the value belongs to
+        search_value (str): Value to parse
+
+    Returns:
+        int: Parsed value
+
+    Raises:
+        ValueError: If the value is not an integer
+    """
+    try:
+        return int(search_value)
+    except ValueError:
+        raise ValueError(f"{search_property} requires an integer value") from None
+
+
+def index_filename_for(filename):
+    """
+    Return the index filename that belongs next to a graph file.
+
+    Args:
+        filename (str): Graph file such as "graph_large.json"
+
+    Returns:
+        str: Index file such as "graph_large.gidx"
+    """
+    return os.path.splitext(filename)[0] + INDEX_EXTENSION
+
+
+def _load_or_build(csr):
+    """
+    Load the persisted index for a graph if it is current, else build it.
+
+    Args:
+        csr (CSRGraph): Graph
+
+    Returns:
+        AttributeIndex: Index for the graph
+    """
+    if csr.source_file is not None:
+        index_file = index_filename_for(csr.source_file)
+        if os.path.exists(index_file):
+            try:
+                index = AttributeIndex.load(index_file)
+            except ValueError:
+                index = None
+            if index is not None and index.fingerprint == graph_fingerprint(csr):
+                return index
+    return AttributeIndex.build(csr)
+
+
+def get_attribute_index(graph):
+    """
+    Return the attribute index of a graph, loading or building it once.
+
+    The index is kept with the graph's shared CSR form (see csr_graph.py),
+    so later queries reuse it until the graph is invalidated. A persisted
+    .gidx file next to the graph's source file is used when its
+    fingerprint still matches.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+
+    Returns:
+        AttributeIndex: Index for the graph
+    """
+    return as_csr_graph(graph).derived_structure("attribute_index", _load_or_build)
+
+
+def indexed_search(graph, search_property, search_value=None, limit=None):
+    """
+    Answer a property query from the attribute index, without traversal.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        search_property (str): Property to search by, a criteria expression
+            or compiled criteria (see search_criteria.py)
+        search_value (str): Value to match (None for expressions)
+        limit (int): Return at most this many matches (None for all)
+
+    Returns:
+        tuple: (found_nodes, nodes_examined, time_taken)
+            found_nodes (list): Node IDs that match criteria
+            nodes_examined (int): Index entries read (equal to the matches)
+            time_taken (float): Time in seconds
+
+    Raises:
+        ValueError: If limit is negative
+    """
+    check_limit(limit)
+
+    start_time = time.time()
+
+    csr = as_csr_graph(graph)
+    index = get_attribute_index(csr)
+
+    criteria = compile_or_report(search_property, search_value)
+    matches = _EMPTY if criteria is None else index.lookup_criteria(criteria)
+
+    node_ids = csr.node_ids
+    found_nodes = [node_ids[i] for i in matches[:limit]]
+
+    end_time = time.time()
+    return found_nodes, len(found_nodes), end_time - start_time
+
+
+def main():
+    """
+    Build an attribute index for a graph file and save it next to the graph.
+    """
+    if len(sys.argv) != 2:
+        print("Usage: python attribute_index.py <graph_file>")
+        print()
+        print("Examples:")
+        print("  python attribute_index.py graph_large.json")
+        print("  python attribute_index.py graph_large.gbin")
+        sys.exit(1)
+
+    filename = sys.argv[1]
+    try:
+        if filename.endswith(BINARY_EXTENSION):
+            csr = load_graph_binary(filename)
+        else:
+            csr = load_graph_streaming(filename)
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found!")
+        sys.exit(1)
+    except ValueError as error:
+        print(f"Error: File '{filename}' is not a valid graph file ({error})!")
+        sys.exit(1)
+
+    index_file = index_filename_for(filename)
+    AttributeIndex.build(csr).save(index_file)
+    print(f"Index saved to {index_file}")
+
+
+if __name__ == "__main__":
+    main()
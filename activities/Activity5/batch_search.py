@@ -0,0 +1,309 @@
+"""
+Batch Property Search
+=====================
+This module answers many BFS property searches against one graph at once.
+
+Running bfs_search.py once per query loads the graph, builds its CSR form
+and walks every node again for each query. The BFS discovery order does
+not depend on the search criteria, though: only the check at each
+discovered node does. A batch therefore
+
+1. loads the graph once,
+2. runs one BFS over all components to get the discovery order (cached
+   with the graph, see CSRGraph.derived_structure()),
+3. evaluates every query as a match mask over the shared attribute
+   columns (see search_criteria.py), and
+4. picks each query's matches out of the discovery order.
+
+Each query returns exactly the nodes, in the same order, that
+bfs_search_all_components() returns for it.
+
+Query files have one query per line, either "property value" or a
+criteria expression; blank lines and lines starting with # are ignored:
+
+    type warehouse
+    region north
+    capacity_min 3000
+    type=hub and priority=5
+
+Usage:
+    python batch_search.py <graph_size> <query_file> [--limit K] [--compare]
+
+    graph_size: small, medium, or large
+    query_file: file with one query per line
+    --limit K: keep only the first K matches of each query
+    --compare: also run every query separately with bfs_search.py
+
+Examples:
+    python batch_search.py large queries.txt
+    python batch_search.py large queries.txt --limit 20 --compare
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import sys
+import time
+from array import array
+from itertools import compress, islice
+from operator import itemgetter
+
+from bfs_search import bfs_search_all_components, iter_bfs_indices
+from csr_graph import as_csr_graph, get_metadata
+from graph_stream import open_named_graph
+from search_criteria import SEARCH_PROPERTIES, check_limit, compile_criteria
+
+
+def _bfs_order(csr):
+    """
+    Return the order in which a BFS over all components discovers the nodes.
+
+    Args:
+        csr (CSRGraph): Graph
+
+    Returns:
+        array: Node indices in discovery order
+    """
+    return array('i', iter_bfs_indices(csr, b"\x01" * csr.num_nodes))
+
+
+def bfs_order(graph):
+    """
+    Return the BFS discovery order of a graph, computing it once per graph.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+
+    Returns:
+        array: Node indices in discovery order
+    """
+    return as_csr_graph(graph).derived_structure("bfs_order", _bfs_order)
+
+
+def parse_query(line):
+    """
+    Parse one query line.
+
+    A line is "property value" when it starts with a search property
+    followed by a space; the value is then taken as it is, even if it
+    contains "=". Any other line is a criteria expression.
+
+    Args:
+        line (str): "property value" or a criteria expression
+
+    Returns:
+        Criterion or CompoundCriteria: Validated criteria
+
+    Raises:
+        ValueError: If the query is invalid
+    """
+    parts = line.split(None, 1)
+    if (len(parts) == 2 and parts[0].lower() in SEARCH_PROPERTIES and
+            not parts[1].startswith("=")):
+        return compile_criteria(parts[0].lower(), parts[1].strip())
+    if "=" in line:
+        return compile_criteria(line)
+    if len(parts) != 2:
+        raise ValueError(f"Expected 'property value' or property=value terms, got '{line}'")
+    return compile_criteria(parts[0].lower(), parts[1].strip())
+
+
+def load_queries(filename):
+    """
+    Read and validate the queries in a query file.
+
+    Args:
+        filename (str): Query file, one query per line
+
+    Returns:
+        list: Compiled criteria, in file order
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If a query is invalid (the message names the line)
+    """
+    queries = []
+    with open(filename, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                queries.append(parse_query(line))
+            except ValueError as error:
+                raise ValueError(f"line {line_number}: {error}") from None
+    return queries
+
+
+def batch_search(graph, queries, limit=None):
+    """
+    Answer many property searches with a single BFS traversal.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        queries (list): Criteria expressions or compiled criteria
+            (see search_criteria.py), or (search_property, search_value)
+            pairs
+        limit (int): Keep only the first K matches of each query
+            (None for all)
+
+    Returns:
+        tuple: (results, stats)
+            results (list): One (found_nodes, time_taken) tuple per query,
+                found_nodes in BFS discovery order
+            stats (dict): "nodes_explored" and "traversal_time" of the
+                shared traversal, "total_time" of the whole batch
+
+    Raises:
+        ValueError: If a query is invalid or limit is negative
+    """
+    check_limit(limit)
+
+    start_time = time.time()
+
+    compiled = [compile_criteria(*query) if isinstance(query, tuple) else compile_criteria(query)
+                for query in queries]
+
+    csr = as_csr_graph(graph)
+    order = bfs_order(csr)
+    traversal_time = time.time() - start_time
+    node_ids = csr.node_ids
+
+    # Identical queries share one mask and one result
+    answers = {}
+    results = []
+    for criteria in compiled:
+        query_start = time.time()
+        key = criteria.describe()
+        if key not in answers:
+            mask = criteria.mask(csr)
+            # mask permuted into discovery order, then the matching indices kept
+            in_order = itemgetter(*order)(mask) if len(order) > 1 else [mask[i] for i in order]
+            answers[key] = [node_ids[i] for i in islice(compress(order, in_order), limit)]
+        results.append((answers[key], time.time() - query_start))
+
+    stats = {
+        "nodes_explored": len(order),
+        "traversal_time": traversal_time,
+        "total_time": time.time() - start_time
+    }
+    return results, stats
+
+
+def display_results(queries, results, stats, graph):
+    """
+    Display one summary line per query.
+
+    Args:
+        queries (list): Compiled criteria
+        results (list): (found_nodes, time_taken) per query
+        stats (dict): Batch statistics from batch_search()
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+    """
+    print("\n" + "="*70)
+    print("BATCH SEARCH RESULTS")
+    print("="*70)
+    metadata = get_metadata(graph)
+    print(f"Graph: {metadata['graph_type']} ({metadata['num_nodes']} nodes)")
+    print(f"Queries: {len(queries)}")
+    print(f"Nodes Explored: {stats['nodes_explored']} (one traversal, " +
+          f"{stats['traversal_time']:.6f} seconds)")
+    print(f"Time Taken: {stats['total_time']:.6f} seconds")
+    print("="*70)
+
+    for criteria, (found_nodes, time_taken) in zip(queries, results):
+        first = ", ".join(found_nodes[:3])
+        if len(found_nodes) > 3:
+            first += ", ..."
+        print(f"  {criteria.describe():<40} {len(found_nodes):>7} found " +
+              f"({time_taken:.6f} s)  {first}")
+    print()
+
+
+def main():
+    """
+    Main function to run a batch of BFS searches from command line.
+    """
+    args = sys.argv[1:]
+    compare = "--compare" in args
+    if compare:
+        args.remove("--compare")
+
+    limit = None
+    if "--limit" in args:
+        position = args.index("--limit")
+        try:
+            limit = int(args[position + 1])
+        except (IndexError, ValueError):
+            limit = -1
+        if limit < 0:
+            print("Error: --limit requires a non-negative integer value")
+            sys.exit(1)
+        del args[position:position + 2]
+
+    if len(args) != 2:
+        print("Usage: python batch_search.py <graph_size> <query_file> [--limit K] [--compare]")
+        print()
+        print("Arguments:")
+        print("  graph_size: small, medium, or large")
+        print("  query_file: one query per line, \"property value\" or \"property=value and ...\"")
+        print("  --limit K: keep only the first K matches of each query")
+        print("  --compare: also run every query separately with bfs_search.py")
+        print()
+        print("Examples:")
+        print("  python batch_search.py large queries.txt")
+        print("  python batch_search.py large queries.txt --limit 20 --compare")
+        sys.exit(1)
+
+    graph_size = args[0].lower()
+    query_file = args[1]
+
+    # Validate graph size
+    if graph_size not in ["small", "medium", "large"]:
+        print(f"Error: Invalid graph size '{graph_size}'")
+        print("Valid options: small, medium, large")
+        sys.exit(1)
+
+    # Validate every query before loading the graph
+    try:
+        queries = load_queries(query_file)
+    except FileNotFoundError:
+        print(f"Error: File '{query_file}' not found!")
+        sys.exit(1)
+    except ValueError as error:
+        print(f"Error: {query_file}, {error}")
+        sys.exit(1)
+    if not queries:
+        print(f"Error: No queries in '{query_file}'")
+        sys.exit(1)
+
+    # Load graph (memory-mapped .gbin if present, else streamed from JSON or graphs.zip)
+    graph = open_named_graph(graph_size)
+    metadata = get_metadata(graph)
+    print(f"Loaded graph with {metadata['num_nodes']} nodes " +
+          f"and {metadata['num_edges']} edges")
+
+    print(f"\nRunning {len(queries)} queries in one traversal...")
+    results, stats = batch_search(graph, queries, limit=limit)
+    display_results(queries, results, stats, graph)
+
+    if compare:
+        print("Running every query separately...")
+        total_time = 0.0
+        mismatches = 0
+        for criteria, (found_nodes, _) in zip(queries, results):
+            separate, _, time_taken = bfs_search_all_components(graph, criteria, None,
+                                                                limit=limit)
+            total_time += time_taken
+            mismatches += separate != found_nodes
+        print(f"Separate searches: {total_time:.6f} seconds " +
+              f"(batch: {stats['total_time']:.6f} seconds)")
+        if mismatches:
+            print(f"Warning: {mismatches} queries returned different results")
+        else:
+            print("All queries returned the same nodes in the same order")
+        print()
+
+
+if __name__ == "__main__":
+    main()
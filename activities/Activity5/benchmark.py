@@ -0,0 +1,471 @@
+"""
+Search Benchmark Suite
+======================
+This module times BFS and Greedy Best-First Search over a matrix of graph
+sizes, algorithms and queries, and compares the results with a baseline.
+
+Every graph is generated from a fixed seed with graph_generator.py, so two
+runs (or two machines) benchmark exactly the same graphs. For each
+(size, algorithm, query) case the suite
+
+1. runs the search WARMUP times untimed, which also fills the per-graph
+   caches an interactive session would have warm (CSR form, heuristic
+   context),
+2. times REPEAT full searches with time.perf_counter_ns(), with garbage
+   collection paused as timeit does, and reports the median and 95th
+   percentile,
+3. records the nodes explored and edges checked (deterministic, so any
+   change means the search now behaves differently), and
+4. runs the search once more under tracemalloc to record its peak memory.
+
+Results are written as JSON. Given a baseline file from an earlier run, a
+case is flagged when its peak memory grew by more than the threshold, when
+its counters changed, or when its median time grew by more than the
+threshold and also exceeds the baseline's 95th percentile (so a slowdown
+within the baseline's own run-to-run spread is not reported).
+
+Query files use the batch_search.py format: one "property value" or
+criteria expression per line.
+
+Usage:
+    python benchmark.py [--sizes N,N,...] [--algorithms bfs,greedy] [--queries FILE]
+                        [--seed S] [--repeat N] [--warmup N] [--output FILE]
+                        [--baseline FILE] [--threshold PCT]
+
+Examples:
+    python benchmark.py --output baseline.json
+    python benchmark.py --baseline baseline.json --output current.json
+    python benchmark.py --sizes 10000,50000 --algorithms greedy --repeat 5
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import contextlib
+import gc
+import io
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+try:
+    import numpy as np
+except ImportError:  # NumPy only changes how masks are evaluated; recorded with results
+    np = None
+
+from batch_search import load_queries, parse_query
+from bfs_search import iter_bfs_matches
+from csr_graph import CSRGraph
+from graph_generator import generate_structured_graph
+from greedy_search import iter_greedy_matches
+
+
+RESULTS_VERSION = 1
+
+DEFAULT_SIZES = [500, 3000, 10000]
+DEFAULT_SEED = 42
+DEFAULT_REPEAT = 15
+DEFAULT_WARMUP = 2
+
+# Default property/value matrix: one query per search property plus an expression
+DEFAULT_QUERIES = ["type warehouse", "region north", "capacity_min 3000",
+                   "capacity_max 500", "priority 5", "type=hub and priority=5"]
+
+ALGORITHMS = {"bfs": iter_bfs_matches, "greedy": iter_greedy_matches}
+
+# A case is a regression when it is this much slower (or bigger) than the baseline...
+DEFAULT_THRESHOLD = 10.0  # percent
+# ...and by at least this much, so timer noise on tiny searches is not flagged
+MIN_TIME_DELTA_NS = 200_000
+MIN_MEMORY_DELTA = 64 * 1024
+
+
+def percentile(values, percent):
+    """
+    Return a nearest-rank percentile.
+
+    Args:
+        values (list): Measurements
+        percent (float): Percentile between 0 and 100
+
+    Returns:
+        Value at that percentile
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def generate_benchmark_graph(num_nodes, seed):
+    """
+    Generate a benchmark graph reproducibly.
+
+    Args:
+        num_nodes (int): Number of nodes
+        seed (int): Random seed passed to graph_generator.py
+
+    Returns:
+        CSRGraph: Generated graph
+    """
+    # The generator reports progress; keep it out of the results table
+    with contextlib.redirect_stdout(io.StringIO()):
+        graph = generate_structured_graph(num_nodes, f"benchmark_{num_nodes}", seed)
+    return CSRGraph.from_graph(graph)
+
+
+def _run_search(search, csr, criteria):
+    """
+    Run one complete search.
+
+    Args:
+        search (callable): iter_bfs_matches or iter_greedy_matches
+        csr (CSRGraph): Graph
+        criteria: Compiled criteria
+
+    Returns:
+        tuple: (matches found, stats dict)
+    """
+    stats = {}
+    found = 0
+    for _ in search(csr, criteria, stats=stats):
+        found += 1
+    return found, stats
+
+
+def benchmark_case(search, csr, criteria, repeat=DEFAULT_REPEAT, warmup=DEFAULT_WARMUP):
+    """
+    Benchmark one algorithm on one query.
+
+    Args:
+        search (callable): iter_bfs_matches or iter_greedy_matches
+        csr (CSRGraph): Graph
+        criteria: Compiled criteria
+        repeat (int): Timed runs
+        warmup (int): Untimed runs first
+
+    Returns:
+        dict: Counters, peak memory and timings in nanoseconds
+    """
+    for _ in range(warmup):
+        _run_search(search, csr, criteria)
+
+    times = []
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            found, stats = _run_search(search, csr, criteria)
+            times.append(time.perf_counter_ns() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    # Memory is measured in a separate run: tracing slows every allocation down
+    tracemalloc.start()
+    try:
+        _run_search(search, csr, criteria)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "found": found,
+        "nodes_explored": stats.get("nodes_explored", 0),
+        "edges_checked": stats.get("edges_checked", 0),
+        "peak_memory_bytes": peak_memory,
+        "median_ns": int(statistics.median(times)),
+        "p95_ns": percentile(times, 95),
+        "min_ns": min(times),
+        "times_ns": times
+    }
+
+
+def run_benchmarks(sizes, algorithms, queries, seed=DEFAULT_SEED,
+                   repeat=DEFAULT_REPEAT, warmup=DEFAULT_WARMUP, progress=None):
+    """
+    Benchmark every (size, algorithm, query) combination.
+
+    Args:
+        sizes (list): Graph sizes in nodes
+        algorithms (list): Names from ALGORITHMS
+        queries (list): Compiled criteria
+        seed (int): Graph generation seed
+        repeat (int): Timed runs per case
+        warmup (int): Untimed runs per case
+        progress (callable): Optional; called with each finished case
+
+    Returns:
+        dict: Results document with "metadata" and "cases"
+    """
+    cases = []
+    for num_nodes in sizes:
+        csr = generate_benchmark_graph(num_nodes, seed)
+        for algorithm in algorithms:
+            for criteria in queries:
+                case = {"algorithm": algorithm, "nodes": csr.num_nodes,
+                        "edges": csr.num_edges, "query": criteria.describe()}
+                case.update(benchmark_case(ALGORITHMS[algorithm], csr, criteria,
+                                           repeat, warmup))
+                cases.append(case)
+                if progress is not None:
+                    progress(case)
+        del csr
+
+    return {
+        "metadata": {
+            "version": RESULTS_VERSION,
+            "seed": seed,
+            "repeat": repeat,
+            "warmup": warmup,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "numpy": np.__version__ if np is not None else None,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "cases": cases
+    }
+
+
+def case_key(case):
+    """
+    Return the key that identifies a case across result files.
+
+    Args:
+        case (dict): Case from run_benchmarks()
+
+    Returns:
+        tuple: (algorithm, nodes, query)
+    """
+    return (case["algorithm"], case["nodes"], case["query"])
+
+
+def compare_with_baseline(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare benchmark results with a baseline.
+
+    Args:
+        results (dict): Current results from run_benchmarks()
+        baseline (dict): Earlier results
+        threshold (float): Allowed growth in percent
+
+    Returns:
+        list: (case, baseline case or None, list of problems) per current case
+    """
+    baseline_cases = {case_key(case): case for case in baseline["cases"]}
+    factor = 1 + threshold / 100
+    comparisons = []
+    for case in results["cases"]:
+        base = baseline_cases.get(case_key(case))
+        problems = []
+        if base is not None:
+            if (case["median_ns"] > base["median_ns"] * factor and
+                    case["median_ns"] > base["p95_ns"] and
+                    case["median_ns"] - base["median_ns"] >= MIN_TIME_DELTA_NS):
+                problems.append("slower")
+            if (case["peak_memory_bytes"] > base["peak_memory_bytes"] * factor and
+                    case["peak_memory_bytes"] - base["peak_memory_bytes"] >= MIN_MEMORY_DELTA):
+                problems.append("more memory")
+            for counter in ("found", "nodes_explored", "edges_checked"):
+                if case[counter] != base[counter]:
+                    problems.append(f"{counter} changed")
+        comparisons.append((case, base, problems))
+    return comparisons
+
+
+def display_case(case):
+    """
+    Print one summary line for a finished case.
+
+    Args:
+        case (dict): Case from run_benchmarks()
+    """
+    print(f"  {case['algorithm']:<7}{case['nodes']:>9}  {case['query']:<32}" +
+          f"{case['median_ns'] / 1e6:>10.3f}{case['p95_ns'] / 1e6:>10.3f}" +
+          f"{case['nodes_explored']:>10}{case['edges_checked']:>11}" +
+          f"{case['peak_memory_bytes'] / 1024:>10.1f}")
+
+
+def display_comparison(comparisons, baseline, results):
+    """
+    Display the comparison with the baseline.
+
+    Args:
+        comparisons (list): Output of compare_with_baseline()
+        baseline (dict): Baseline results
+        results (dict): Current results
+
+    Returns:
+        int: Number of flagged cases
+    """
+    print("\n" + "="*70)
+    print("COMPARISON WITH BASELINE")
+    print("="*70)
+    for field in ("python", "implementation", "machine", "system", "numpy", "seed"):
+        if baseline["metadata"].get(field) != results["metadata"].get(field):
+            print(f"Warning: baseline {field} is {baseline['metadata'].get(field)}, " +
+                  f"now {results['metadata'].get(field)}")
+
+    flagged = 0
+    for case, base, problems in comparisons:
+        label = f"{case['algorithm']:<7}{case['nodes']:>9}  {case['query']:<32}"
+        if base is None:
+            print(f"  {label}  new case")
+            continue
+        ratio = case["median_ns"] / max(1, base["median_ns"])
+        status = "REGRESSION: " + ", ".join(problems) if problems else "ok"
+        if problems:
+            flagged += 1
+        print(f"  {label}{ratio:>7.2f}x  {status}")
+    print("="*70)
+    print(f"Flagged cases: {flagged} of {len(comparisons)}")
+    return flagged
+
+
+def _parse_list(option, text, convert):
+    """
+    Parse a comma-separated option value, exiting on invalid input.
+
+    Args:
+        option (str): Option name, for the error message
+        text (str): Option value
+        convert (callable): Converts one item
+
+    Returns:
+        list: Converted items
+    """
+    try:
+        items = [convert(item.strip()) for item in text.split(",") if item.strip()]
+    except ValueError:
+        items = []
+    if not items:
+        print(f"Error: {option} requires a comma-separated list")
+        sys.exit(1)
+    return items
+
+
+def main():
+    """
+    Main function to run the benchmark suite from command line.
+    """
+    args = sys.argv[1:]
+    options = {"--sizes": None, "--algorithms": None, "--queries": None, "--seed": None,
+               "--repeat": None, "--warmup": None, "--output": None, "--baseline": None,
+               "--threshold": None}
+    for option in list(options):
+        if option in args:
+            position = args.index(option)
+            if position + 1 >= len(args):
+                print(f"Error: {option} requires a value")
+                sys.exit(1)
+            options[option] = args[position + 1]
+            del args[position:position + 2]
+
+    if args:
+        print("Usage: python benchmark.py [--sizes N,N,...] [--algorithms bfs,greedy] [--queries FILE]")
+        print("                           [--seed S] [--repeat N] [--warmup N] [--output FILE]")
+        print("                           [--baseline FILE] [--threshold PCT]")
+        print()
+        print("Options:")
+        print(f"  --sizes: graph sizes to generate (default: {','.join(map(str, DEFAULT_SIZES))})")
+        print(f"  --algorithms: {', '.join(ALGORITHMS)} (default: all)")
+        print("  --queries FILE: batch_search.py query file (default: built-in matrix)")
+        print(f"  --seed S: graph generation seed (default: {DEFAULT_SEED})")
+        print(f"  --repeat N / --warmup N: timed and untimed runs per case " +
+              f"(default: {DEFAULT_REPEAT} / {DEFAULT_WARMUP})")
+        print("  --output FILE: write the results as JSON")
+        print("  --baseline FILE: flag regressions against earlier results")
+        print(f"  --threshold PCT: allowed slowdown before flagging (default: {DEFAULT_THRESHOLD:g})")
+        print()
+        print("Examples:")
+        print("  python benchmark.py --output baseline.json")
+        print("  python benchmark.py --baseline baseline.json --output current.json")
+        sys.exit(1)
+
+    sizes = DEFAULT_SIZES
+    if options["--sizes"] is not None:
+        sizes = _parse_list("--sizes", options["--sizes"], int)
+    algorithms = list(ALGORITHMS)
+    if options["--algorithms"] is not None:
+        algorithms = _parse_list("--algorithms", options["--algorithms"], str.lower)
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHMS:
+            print(f"Error: Unknown algorithm '{algorithm}'")
+            print(f"Valid options: {', '.join(ALGORITHMS)}")
+            sys.exit(1)
+
+    numbers = {"--seed": DEFAULT_SEED, "--repeat": DEFAULT_REPEAT,
+               "--warmup": DEFAULT_WARMUP, "--threshold": DEFAULT_THRESHOLD}
+    for option, default in numbers.items():
+        if options[option] is None:
+            continue
+        try:
+            numbers[option] = type(default)(options[option])
+        except ValueError:
+            print(f"Error: {option} requires a numeric value")
+            sys.exit(1)
+    if numbers["--repeat"] < 1 or numbers["--warmup"] < 0 or min(sizes) < 1:
+        print("Error: --repeat and --sizes must be positive, --warmup not negative")
+        sys.exit(1)
+
+    # Validate queries and baseline before spending time on graphs
+    try:
+        if options["--queries"] is not None:
+            queries = load_queries(options["--queries"])
+        else:
+            queries = [parse_query(line) for line in DEFAULT_QUERIES]
+    except FileNotFoundError:
+        print(f"Error: File '{options['--queries']}' not found!")
+        sys.exit(1)
+    except ValueError as error:
+        print(f"Error: {options['--queries']}, {error}")
+        sys.exit(1)
+    if not queries:
+        print(f"Error: No queries in '{options['--queries']}'")
+        sys.exit(1)
+
+    baseline = None
+    if options["--baseline"] is not None:
+        try:
+            with open(options["--baseline"], 'r') as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            print(f"Error: File '{options['--baseline']}' not found!")
+            sys.exit(1)
+        except json.JSONDecodeError:
+            print(f"Error: '{options['--baseline']}' is not a benchmark results file")
+            sys.exit(1)
+        if baseline.get("metadata", {}).get("version") != RESULTS_VERSION:
+            print(f"Error: '{options['--baseline']}' has an unsupported results version")
+            sys.exit(1)
+
+    print(f"Benchmarking {', '.join(algorithms)} on {len(sizes)} graph sizes x " +
+          f"{len(queries)} queries (seed {numbers['--seed']}, " +
+          f"{numbers['--warmup']} warm-up + {numbers['--repeat']} timed runs)")
+    print("\n" + "="*70)
+    print(f"  {'search':<7}{'nodes':>9}  {'query':<32}{'median ms':>10}{'p95 ms':>10}" +
+          f"{'explored':>10}{'edges':>11}{'peak KiB':>10}")
+    results = run_benchmarks(sizes, algorithms, queries, numbers["--seed"],
+                             numbers["--repeat"], numbers["--warmup"], progress=display_case)
+    print("="*70)
+
+    if options["--output"] is not None:
+        with open(options["--output"], 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {options['--output']}")
+
+    if baseline is not None:
+        comparisons = compare_with_baseline(results, baseline, numbers["--threshold"])
+        if display_comparison(comparisons, baseline, results):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,27 @@ This module implements BFS for searching nodes in a weighted directed graph
 based on node properties.
 
 Usage:
-    python bfs_search.py <graph_size> <search_property> <search_value>
+    python bfs_search.py <graph_size> <search_property> <search_value> [--indexed] [--limit K]
+    python bfs_search.py <graph_size> "<criteria>" [--indexed] [--limit K]
+    python bfs_search.py ... --instrument FILE [--profile] [--trace-memory]
 
     graph_size: small, medium, or large
     search_property: type, region, capacity_min, priority
     search_value: value to search for
+    criteria: property=value terms combined with "and"/"or"
+    --indexed: answer from the attribute index instead of traversing
+    --limit K: stop after the first K matches
+    --instrument FILE: write phase timings and work counters as JSON
+        (see instrumentation.py)
 
 Examples:
     python bfs_search.py small type warehouse
     python bfs_search.py medium region north
     python bfs_search.py large capacity_min 3000
+    python bfs_search.py large type warehouse --indexed
+    python bfs_search.py large "type=warehouse and capacity_min=3000"
+    python bfs_search.py large capacity_min 100 --limit 20
+    python bfs_search.py large type warehouse --instrument bfs.json --profile
 
 Author: AI Course Materials
 Date: February 2026
@@ -24,6 +35,13 @@ import json
 import sys
 import time
 from collections import deque
+from itertools import islice
+
+from attribute_index import indexed_search
+from csr_graph import as_csr_graph, get_metadata, get_node
+from graph_stream import open_named_graph
+from instrumentation import instrumentation_from_args, write_report
+from search_criteria import check_limit, compile_criteria, compile_or_report, match_mask
 
 
 def load_graph(filename):
@@ -49,198 +67,233 @@ def load_graph(filename):
         sys.exit(1)
 
 
-def build_adjacency_list(graph):
+def matches_search_criteria(node, search_property, search_value):
     """
-    Build adjacency list representation from graph data.
+    Check if a node matches the search criteria.
+
+    The searches use compiled criteria and match masks instead (see
+    search_criteria.py); this checks a single node dictionary.
 
     Args:
-        graph (dict): Graph structure
+        node (dict): Node data
+        search_property (str): Property to search by
+        search_value (str): Value to match
 
     Returns:
-        dict: Adjacency list {node_id: [list of neighbor node_ids]}
+        bool: True if node matches criteria (False, with an error printed,
+            if the criteria are invalid)
     """
-    adjacency_list = {node_id: [] for node_id in graph["nodes"].keys()}
+    criteria = compile_or_report(search_property, search_value)
+    return criteria is not None and criteria(node)
 
-    for edge in graph["edges"]:
-        source = edge["source"]
-        target = edge["target"]
-        adjacency_list[source].append(target)
 
-    return adjacency_list
+def iter_bfs_indices(csr, match, start=None, stats=None):
+    """
+    Run BFS over a CSR graph and yield the indices of matching nodes.
 
+    BFS Algorithm:
+    1. Start from a given node
+    2. Explore all neighbors at current level before moving deeper
+    3. Use a queue (FIFO) to maintain order of exploration
+    4. Track visited nodes to avoid cycles
 
-def matches_search_criteria(node, search_property, search_value):
-    """
-    Check if a node matches the search criteria.
+    Without a start node every node not reached yet starts a new BFS, so
+    all connected components are searched. Each node is discovered exactly
+    once (the visited bitmap is the deduplication), so matches are yielded
+    in discovery order without ever checking earlier results.
+
+    This is the traversal behind iter_bfs_matches(); batch_search.py runs
+    it with a mask that matches every node to get the discovery order.
 
     Args:
-        node (dict): Node data
-        search_property (str): Property to search by
-        search_value (str): Value to match
+        csr (CSRGraph): Graph
+        match (bytes-like): One byte per node index, nonzero where the node
+            matches
+        start (int): Starting node index, or None for all components
+        stats (dict): Optional dict; "nodes_explored", "edges_checked" and
+            "queued" (nodes still waiting in the queue) are kept up to date
+            whenever a match is yielded and when the search ends
+
+    Yields:
+        int: Indices of the matching nodes, in discovery order
+    """
+    # Compact integer-indexed adjacency for efficient neighbor lookup
+    offsets, targets = csr.offsets, csr.targets
 
-    Returns:
-        bool: True if node matches criteria
+    if start is None:
+        starts = range(csr.num_nodes)
+    else:
+        starts = (start,)
+
+    visited = bytearray(csr.num_nodes)  # Track visited nodes (one byte per node)
+    nodes_explored = 0  # Counters for performance analysis
+    edges_checked = 0
+
+    for start in starts:
+        if visited[start]:
+            continue
+
+        # BFS from this starting node
+        queue = deque([start])  # FIFO queue for BFS
+        visited[start] = 1
+
+        # Check if start node matches criteria
+        if match[start]:
+            if stats is not None:
+                stats["nodes_explored"] = nodes_explored
+                stats["edges_checked"] = edges_checked
+                stats["queued"] = len(queue)
+            yield start
+
+        # BFS main loop
+        while queue:
+            # Dequeue the front node (FIFO - First In First Out)
+            current = queue.popleft()
+            nodes_explored += 1
+            first_edge, end_edge = offsets[current], offsets[current + 1]
+            edges_checked += end_edge - first_edge
+
+            # Explore each neighbor
+            for neighbor in targets[first_edge:end_edge]:
+                # Only visit if not already visited (prevents cycles)
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    queue.append(neighbor)
+
+                    # Check if neighbor matches search criteria
+                    if match[neighbor]:
+                        if stats is not None:
+                            stats["nodes_explored"] = nodes_explored
+                            stats["edges_checked"] = edges_checked
+                            stats["queued"] = len(queue)
+                        yield neighbor
+
+    if stats is not None:
+        stats["nodes_explored"] = nodes_explored
+        stats["edges_checked"] = edges_checked
+        stats["queued"] = 0
+
+
+def iter_bfs_matches(graph, search_property, search_value=None, start_node_id=None,
+                     stats=None):
     """
-    if search_property == "type":
-        return node["type"] == search_value
+    Run BFS and yield matching node IDs as they are discovered.
 
-    elif search_property == "region":
-        return node["region"] == search_value
+    The criteria are evaluated once as a match mask, then the traversal of
+    iter_bfs_indices() yields the matching nodes in discovery order.
 
-    elif search_property == "capacity_min":
-        try:
-            min_capacity = int(search_value)
-            return node["capacity"] >= min_capacity
-        except ValueError:
-            print(f"Error: capacity_min requires an integer value")
-            return False
+    Because this is a generator, the caller can stop early, e.g. with
+    itertools.islice(iter_bfs_matches(...), k); the traversal then goes no
+    further than needed to find k matches.
 
-    elif search_property == "capacity_max":
-        try:
-            max_capacity = int(search_value)
-            return node["capacity"] <= max_capacity
-        except ValueError:
-            print(f"Error: capacity_max requires an integer value")
-            return False
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        search_property (str): Property to search by, a criteria expression
+            such as "type=hub and priority=5", or compiled criteria
+            (see search_criteria.py)
+        search_value (str): Value to match (None for expressions)
+        start_node_id (str): Starting node ID, or None for all components
+        stats (dict): Optional dict; "nodes_explored" and "edges_checked"
+            are kept up to date whenever a match is yielded and when the
+            search ends, together with "queued" (nodes still waiting in
+            the queue); "prepare_time" is set to the seconds spent on
+            graph conversion and criteria evaluation before traversing
+
+    Yields:
+        str: Node IDs that match criteria, in discovery order
+    """
+    prepare_start = time.perf_counter()
 
-    elif search_property == "priority":
-        try:
-            priority = int(search_value)
-            return node["priority"] == priority
-        except ValueError:
-            print(f"Error: priority requires an integer value")
-            return False
+    csr = as_csr_graph(graph)
+    node_ids = csr.node_ids
 
-    else:
-        print(f"Error: Unknown search property '{search_property}'")
-        return False
+    # Criteria are validated and evaluated once: match[i] is 1 if node i matches
+    match = match_mask(csr, search_property, search_value)
+
+    if stats is not None:
+        stats["prepare_time"] = time.perf_counter() - prepare_start
+
+    start = None if start_node_id is None else csr.index_of(start_node_id)
+    for node in iter_bfs_indices(csr, match, start, stats):
+        yield node_ids[node]
 
 
-def bfs_search(graph, start_node_id, search_property, search_value):
+def bfs_search(graph, start_node_id, search_property, search_value, limit=None):
     """
     Perform Breadth-First Search to find all nodes matching criteria.
 
-    BFS Algorithm:
-    1. Start from a given node
-    2. Explore all neighbors at current level before moving deeper
-    3. Use a queue (FIFO) to maintain order of exploration
-    4. Track visited nodes to avoid cycles
+    The traversal runs on the integer-indexed CSR form of the graph (see
+    csr_graph.py); dictionary graphs are converted once and the CSR form
+    is reused by later searches on the same graph. See iter_bfs_matches()
+    for the algorithm and for streaming the matches one at a time.
 
     Args:
-        graph (dict): Graph structure
+        graph (dict, CSRGraph or GraphHandle): Graph structure
         start_node_id (str): Starting node ID
-        search_property (str): Property to search by
-        search_value (str): Value to match
+        search_property (str): Property to search by, a criteria expression
+            such as "type=hub and priority=5", or compiled criteria
+            (see search_criteria.py)
+        search_value (str): Value to match (None for expressions)
+        limit (int): Stop after this many matches (None for all)
 
     Returns:
         tuple: (found_nodes, nodes_explored, time_taken)
             found_nodes (list): List of node IDs that match criteria
             nodes_explored (int): Total number of nodes explored
             time_taken (float): Time in seconds
+
+    Raises:
+        ValueError: If limit is negative
     """
+    check_limit(limit)
 
     start_time = time.time()
 
-    # Build adjacency list for efficient neighbor lookup
-    adjacency_list = build_adjacency_list(graph)
-
-    # Initialize BFS data structures
-    queue = deque([start_node_id])  # FIFO queue for BFS
-    visited = set([start_node_id])  # Track visited nodes
-    found_nodes = []  # Nodes that match search criteria
-    nodes_explored = 0  # Counter for performance analysis
-
-    # Check if start node matches criteria
-    start_node = graph["nodes"][start_node_id]
-    if matches_search_criteria(start_node, search_property, search_value):
-        found_nodes.append(start_node_id)
-
-    # BFS main loop
-    while queue:
-        # Dequeue the front node (FIFO - First In First Out)
-        current_node_id = queue.popleft()
-        nodes_explored += 1
-
-        # Get all neighbors of current node
-        neighbors = adjacency_list.get(current_node_id, [])
-
-        # Explore each neighbor
-        for neighbor_id in neighbors:
-            # Only visit if not already visited (prevents cycles)
-            if neighbor_id not in visited:
-                visited.add(neighbor_id)
-                queue.append(neighbor_id)
-
-                # Check if neighbor matches search criteria
-                neighbor_node = graph["nodes"][neighbor_id]
-                if matches_search_criteria(neighbor_node, search_property, search_value):
-                    found_nodes.append(neighbor_id)
+    stats = {}
+    matches = iter_bfs_matches(graph, search_property, search_value,
+                               start_node_id=start_node_id, stats=stats)
+    found_nodes = list(islice(matches, limit))
 
     end_time = time.time()
     time_taken = end_time - start_time
 
-    return found_nodes, nodes_explored, time_taken
+    return found_nodes, stats.get("nodes_explored", 0), time_taken
 
 
-def bfs_search_all_components(graph, search_property, search_value):
+def bfs_search_all_components(graph, search_property, search_value, limit=None,
+                              stats=None):
     """
     Perform BFS across all connected components in the graph.
 
     This ensures we search the entire graph even if it's not fully connected.
 
     Args:
-        graph (dict): Graph structure
-        search_property (str): Property to search by
-        search_value (str): Value to match
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        search_property (str): Property to search by, or a criteria expression
+        search_value (str): Value to match (None for expressions)
+        limit (int): Stop after this many matches (None for all)
+        stats (dict): Optional dict to receive the search statistics
+            (see iter_bfs_matches())
 
     Returns:
         tuple: (found_nodes, nodes_explored, time_taken)
-    """
-    start_time = time.time()
-
-    adjacency_list = build_adjacency_list(graph)
-    all_node_ids = list(graph["nodes"].keys())
-
-    visited_global = set()
-    found_nodes = []
-    total_nodes_explored = 0
 
-    # Iterate through all nodes to handle disconnected components
-    for start_node_id in all_node_ids:
-        if start_node_id in visited_global:
-            continue
-
-        # BFS from this starting node
-        queue = deque([start_node_id])
-        visited_global.add(start_node_id)
-
-        # Check start node
-        start_node = graph["nodes"][start_node_id]
-        if matches_search_criteria(start_node, search_property, search_value):
-            if start_node_id not in found_nodes:
-                found_nodes.append(start_node_id)
-
-        # BFS loop
-        while queue:
-            current_node_id = queue.popleft()
-            total_nodes_explored += 1
-
-            neighbors = adjacency_list.get(current_node_id, [])
+    Raises:
+        ValueError: If limit is negative
+    """
+    check_limit(limit)
 
-            for neighbor_id in neighbors:
-                if neighbor_id not in visited_global:
-                    visited_global.add(neighbor_id)
-                    queue.append(neighbor_id)
+    start_time = time.time()
 
-                    neighbor_node = graph["nodes"][neighbor_id]
-                    if matches_search_criteria(neighbor_node, search_property, search_value):
-                        if neighbor_id not in found_nodes:
-                            found_nodes.append(neighbor_id)
+    if stats is None:
+        stats = {}
+    matches = iter_bfs_matches(graph, search_property, search_value, stats=stats)
+    found_nodes = list(islice(matches, limit))
 
     end_time = time.time()
     time_taken = end_time - start_time
 
-    return found_nodes, total_nodes_explored, time_taken
+    return found_nodes, stats.get("nodes_explored", 0), time_taken
 
 
 def display_results(found_nodes, nodes_explored, time_taken, graph, search_property, search_value):
@@ -251,16 +304,20 @@ def display_results(found_nodes, nodes_explored, time_taken, graph, search_prope
         found_nodes (list): Node IDs that match criteria
         nodes_explored (int): Total nodes explored
         time_taken (float): Time in seconds
-        graph (dict): Graph structure
-        search_property (str): Property searched
-        search_value (str): Value searched for
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        search_property (str): Property searched, or a criteria expression
+        search_value (str): Value searched for (None for expressions)
     """
     print("\n" + "="*70)
     print("BFS SEARCH RESULTS")
     print("="*70)
-    print(f"Graph: {graph['metadata']['graph_type']} ({graph['metadata']['num_nodes']} nodes)")
-    print(f"Search Property: {search_property}")
-    print(f"Search Value: {search_value}")
+    metadata = get_metadata(graph)
+    print(f"Graph: {metadata['graph_type']} ({metadata['num_nodes']} nodes)")
+    if search_value is None:
+        print(f"Search Criteria: {search_property}")
+    else:
+        print(f"Search Property: {search_property}")
+        print(f"Search Value: {search_value}")
     print(f"Nodes Explored: {nodes_explored}")
     print(f"Nodes Found: {len(found_nodes)}")
     print(f"Time Taken: {time_taken:.6f} seconds")
@@ -271,7 +328,7 @@ def display_results(found_nodes, nodes_explored, time_taken, graph, search_prope
         # Display first 10 matches
         display_limit = min(10, len(found_nodes))
         for i, node_id in enumerate(found_nodes[:display_limit]):
-            node = graph["nodes"][node_id]
+            node = get_node(graph, node_id)
             print(f"  {i+1}. {node['name']} (ID: {node_id})")
             print(f"      Type: {node['type']}, Region: {node['region']}, " +
                   f"Capacity: {node['capacity']}, Priority: {node['priority']}")
@@ -289,25 +346,56 @@ def main():
     Main function to run BFS search from command line.
     """
     # Check command line arguments
-    if len(sys.argv) != 4:
-        print("Usage: python bfs_search.py <graph_size> <search_property> <search_value>")
+    args = sys.argv[1:]
+    instrumentation, instrument_output = instrumentation_from_args(args)
+    indexed = "--indexed" in args
+    if indexed:
+        args.remove("--indexed")
+
+    limit = None
+    if "--limit" in args:
+        position = args.index("--limit")
+        try:
+            limit = int(args[position + 1])
+        except (IndexError, ValueError):
+            limit = -1
+        if limit < 0:
+            print("Error: --limit requires a non-negative integer value")
+            sys.exit(1)
+        del args[position:position + 2]
+
+    if len(args) not in (2, 3):
+        print("Usage: python bfs_search.py <graph_size> <search_property> <search_value> [--indexed] [--limit K]")
+        print("       python bfs_search.py <graph_size> \"<criteria>\" [--indexed] [--limit K]")
         print()
         print("Arguments:")
         print("  graph_size: small, medium, or large")
         print("  search_property: type, region, capacity_min, capacity_max, or priority")
         print("  search_value: value to search for")
+        print("  criteria: property=value terms combined with \"and\"/\"or\"")
+        print("  --indexed: answer from the attribute index instead of traversing")
+        print("  --limit K: stop after the first K matches")
+        print("  --instrument FILE: write phase timings and work counters as JSON (- for stdout)")
+        print("  --profile / --trace-memory: add cProfile / tracemalloc data to the JSON")
         print()
         print("Examples:")
         print("  python bfs_search.py small type warehouse")
         print("  python bfs_search.py medium region north")
         print("  python bfs_search.py large capacity_min 3000")
         print("  python bfs_search.py small priority 5")
+        print("  python bfs_search.py large type warehouse --indexed")
+        print("  python bfs_search.py large \"type=warehouse and capacity_min=3000\"")
+        print("  python bfs_search.py large capacity_min 100 --limit 20")
         sys.exit(1)
 
     # Parse arguments
-    graph_size = sys.argv[1].lower()
-    search_property = sys.argv[2].lower()
-    search_value = sys.argv[3]
+    graph_size = args[0].lower()
+    if len(args) == 3:
+        search_property = args[1].lower()
+        search_value = args[2]
+    else:
+        search_property = args[1]
+        search_value = None
 
     # Validate graph size
     if graph_size not in ["small", "medium", "large"]:
@@ -315,23 +403,56 @@ def main():
         print("Valid options: small, medium, large")
         sys.exit(1)
 
-    # Determine filename
-    filename = f"graph_{graph_size}.json"
+    # Validate the search criteria before loading the graph
+    try:
+        compile_criteria(search_property, search_value)
+    except ValueError as error:
+        print(f"Error: {error}")
+        sys.exit(1)
+
+    instrumentation.start()
 
-    # Load graph
-    print(f"Loading graph from {filename}...")
-    graph = load_graph(filename)
-    print(f"Loaded graph with {graph['metadata']['num_nodes']} nodes " +
-          f"and {graph['metadata']['num_edges']} edges")
+    # Load graph (memory-mapped .gbin if present, else streamed from JSON or graphs.zip)
+    with instrumentation.phase("load"):
+        graph = open_named_graph(graph_size)
+        csr = as_csr_graph(graph)
+    metadata = get_metadata(graph)
+    print(f"Loaded graph with {metadata['num_nodes']} nodes " +
+          f"and {metadata['num_edges']} edges")
 
-    # Perform BFS search across all components
-    print(f"\nSearching for nodes where {search_property} = {search_value}...")
-    found_nodes, nodes_explored, time_taken = bfs_search_all_components(
-        graph, search_property, search_value
-    )
+    # Perform BFS search across all components (or an index lookup)
+    if search_value is None:
+        print(f"\nSearching for nodes where {search_property}...")
+    else:
+        print(f"\nSearching for nodes where {search_property} = {search_value}...")
+    stats = {}
+    if indexed:
+        print("Using the attribute index (no traversal)...")
+        with instrumentation.phase("lookup"):
+            found_nodes, nodes_explored, time_taken = indexed_search(
+                graph, search_property, search_value, limit=limit
+            )
+        instrumentation.counters["nodes_explored"] = nodes_explored
+    else:
+        with instrumentation.phase("traverse"):
+            found_nodes, nodes_explored, time_taken = bfs_search_all_components(
+                graph, search_property, search_value, limit=limit, stats=stats
+            )
+        instrumentation.record_search(stats, csr.num_nodes)
 
     # Display results
-    display_results(found_nodes, nodes_explored, time_taken, graph, search_property, search_value)
+    with instrumentation.phase("display"):
+        display_results(found_nodes, nodes_explored, time_taken, graph, search_property, search_value)
+
+    if instrumentation.enabled:
+        instrumentation.stop()
+        report = instrumentation.report(
+            script="bfs_search.py", algorithm="indexed" if indexed else "bfs",
+            graph=graph_size, nodes=csr.num_nodes, edges=csr.num_edges,
+            criteria=compile_criteria(search_property, search_value).describe(),
+            limit=limit, found=len(found_nodes)
+        )
+        write_report(report, instrument_output)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,500 @@
+"""
+Compressed Sparse Row (CSR) Graph Representation
+================================================
+This module provides a compact, integer-indexed representation of the
+weighted directed graphs produced by graph_generator.py.
+
+Instead of a dictionary of Python lists keyed by node ID strings
+({"node_17": ["node_18", ...]}), the CSR layout stores the whole edge list
+in three contiguous arrays:
+
+    offsets[i] .. offsets[i + 1]   slice of targets/weights for node i
+    targets[k]                     integer index of the k-th edge's target
+    weights[k]                     weight of the k-th edge
+
+Node ID strings are only used at the boundary; a node_ids list and an index
+dictionary map between "node_17" and its integer position. Searches work on
+the integer indices directly, which removes per-edge string hashing and
+per-node list objects.
+
+A GraphHandle owns the CSR form of a loaded graph dictionary and builds it
+lazily, so every search against the same graph reuses one structure.
+
+Usage:
+    from csr_graph import CSRGraph, GraphHandle
+    csr = CSRGraph.from_graph(graph)
+    for neighbor in csr.neighbors(csr.index_of("node_0")):
+        print(csr.node_id(neighbor))
+
+    handle = GraphHandle(graph)      # searches accept the handle directly
+    handle.invalidate()              # after modifying graph
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+from array import array
+from collections import OrderedDict
+
+from node_columns import build_node_columns
+
+
+class CSRGraph:
+    """
+    Integer-indexed weighted directed graph in CSR form.
+
+    Nodes are numbered 0..num_nodes-1 in the insertion order of the
+    original graph["nodes"] dictionary, and the edges of each node keep the
+    order in which they appear in graph["edges"], so traversals visit nodes
+    in exactly the same order as with the dictionary adjacency list.
+
+    Attributes:
+        node_ids (list): Node ID string for each integer index
+        offsets (array): Edge slice start per node, length num_nodes + 1
+        targets (array): Target node index per edge
+        weights (array): Weight per edge
+        nodes (sequence): Node property dictionaries by integer index
+            (a ColumnNodes view when the graph has attribute columns)
+        metadata (dict): Graph metadata (num_nodes, num_edges, graph_type, ...)
+        columns (dict or None): Attribute columns (see node_columns.py), or
+            None when the nodes do not fit them
+        categories (dict or None): Category names for coded columns
+        source_file (str or None): File the graph was loaded from, if any
+        mapping (mmap or None): Memory-mapped file the arrays live in, if any
+            (see graph_binary.py and close())
+        derived (dict): Structures computed from this graph (indexes, ...),
+            see derived_structure()
+    """
+
+    def __init__(self, node_ids, offsets, targets, weights, nodes, metadata,
+                 columns=None, categories=None):
+        self.node_ids = node_ids
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.nodes = nodes
+        self.metadata = metadata
+        self.columns = columns
+        self.categories = categories
+        self.source_file = None
+        self.mapping = None
+        self.derived = {}
+        self._index = None
+        self._id_rank = None
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Build a CSR graph from the dictionary structure used in the JSON files.
+
+        Node attributes are copied into columns (see node_columns.py); nodes
+        with missing, extra or out-of-range attributes keep their
+        dictionaries instead.
+
+        Args:
+            graph (dict): Graph structure with metadata, nodes and edges
+
+        Returns:
+            CSRGraph: Compact representation of the same graph
+        """
+        node_ids = list(graph["nodes"].keys())
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        num_nodes = len(node_ids)
+        edges = graph["edges"]
+
+        # Map edge endpoints to integers once
+        sources = array('i', [index[edge["source"]] for edge in edges])
+        edge_targets = array('i', [index[edge["target"]] for edge in edges])
+        edge_weights = array('d', [edge.get("weight", 1) for edge in edges])
+
+        offsets, targets, weights = build_csr_arrays(num_nodes, sources,
+                                                     edge_targets, edge_weights)
+
+        try:
+            columns, categories, nodes = build_node_columns(graph["nodes"].values(), node_ids)
+        except (KeyError, TypeError, OverflowError, ValueError):
+            columns = categories = None
+            nodes = list(graph["nodes"].values())
+        metadata = dict(graph.get("metadata", {}))
+        metadata.setdefault("num_nodes", num_nodes)
+        metadata.setdefault("num_edges", len(edges))
+
+        return cls(node_ids, offsets, targets, weights, nodes, metadata,
+                   columns=columns, categories=categories)
+
+    @property
+    def index(self):
+        """dict: Integer index for each node ID string (built on first use)."""
+        if self._index is None:
+            self._index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        return self._index
+
+    @property
+    def num_nodes(self):
+        """int: Number of nodes in the graph."""
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self):
+        """int: Number of directed edges in the graph."""
+        return len(self.targets)
+
+    def index_of(self, node_id):
+        """
+        Return the integer index of a node ID.
+
+        Args:
+            node_id (str): Node ID such as "node_17"
+
+        Returns:
+            int: Integer index of the node
+        """
+        return self.index[node_id]
+
+    def node_id(self, index):
+        """
+        Return the node ID string for an integer index.
+
+        Args:
+            index (int): Integer node index
+
+        Returns:
+            str: Node ID such as "node_17"
+        """
+        return self.node_ids[index]
+
+    def node(self, index):
+        """
+        Return the property dictionary of a node.
+
+        Args:
+            index (int): Integer node index
+
+        Returns:
+            dict: Node data (id, name, type, region, capacity, ...)
+        """
+        return self.nodes[index]
+
+    def neighbors(self, index):
+        """
+        Return the target indices of a node's outgoing edges.
+
+        Args:
+            index (int): Integer node index
+
+        Returns:
+            array: Neighbor indices in edge order
+        """
+        return self.targets[self.offsets[index]:self.offsets[index + 1]]
+
+    def edges(self, index):
+        """
+        Return a node's outgoing edges as (target, weight) pairs.
+
+        Args:
+            index (int): Integer node index
+
+        Returns:
+            zip: Iterator of (target index, weight) pairs
+        """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def close(self):
+        """
+        Unmap the file behind a memory-mapped graph.
+
+        The graph's arrays cannot be used afterwards. If slices of them are
+        still referenced elsewhere, the file is unmapped once those are
+        freed instead. Graphs that are not memory-mapped are unchanged.
+        """
+        if self.mapping is None:
+            return
+        for column in self.columns.values():
+            column.release()
+        try:
+            self.mapping.close()
+        except BufferError:
+            pass
+        self.mapping = None
+
+    def derived_structure(self, name, build):
+        """
+        Return a structure derived from this graph, building it on first use.
+
+        Derived structures live as long as this CSR form, so invalidating a
+        GraphHandle (which replaces the CSR form) discards them as well.
+
+        Args:
+            name (str): Name of the structure, e.g. "attribute_index"
+            build (callable): Called with this graph to build the structure
+
+        Returns:
+            object: The cached or newly built structure
+        """
+        structure = self.derived.get(name)
+        if structure is None:
+            structure = self.derived[name] = build(self)
+        return structure
+
+    def reverse(self):
+        """
+        Return the reverse graph, with every edge pointing the other way.
+
+        The reverse graph shares node IDs, node data and metadata with this
+        graph; neighbors(i) of the reverse graph are the nodes with an edge
+        into i, in the order those edges appear here. It is built once per
+        graph (see derived_structure()).
+
+        Returns:
+            CSRGraph: Graph with the same nodes and reversed edges
+        """
+        return self.derived_structure("reverse", _build_reverse)
+
+    def id_rank(self):
+        """
+        Return each node's position in sorted node-ID order.
+
+        Priority queues that used to break ties on the node ID string can use
+        this rank instead to keep exactly the same exploration order.
+
+        Returns:
+            list: Rank of each node index when node IDs are sorted as strings
+        """
+        if self._id_rank is None:
+            rank = [0] * self.num_nodes
+            for position, i in enumerate(sorted(range(self.num_nodes),
+                                                key=self.node_ids.__getitem__)):
+                rank[i] = position
+            self._id_rank = rank
+        return self._id_rank
+
+
+def build_csr_arrays(num_nodes, sources, targets, weights):
+    """
+    Group an edge list by source node into CSR offsets/targets/weights.
+
+    A counting sort by source keeps each node's edges in their original
+    order.
+
+    Args:
+        num_nodes (int): Number of nodes
+        sources (array): Source node index per edge
+        targets (array): Target node index per edge
+        weights (array): Weight per edge
+
+    Returns:
+        tuple: (offsets, targets, weights) arrays in CSR order
+    """
+    num_edges = len(sources)
+    offsets = array('q', bytes(8 * (num_nodes + 1)))
+    for source in sources:
+        offsets[source + 1] += 1
+    for i in range(num_nodes):
+        offsets[i + 1] += offsets[i]
+
+    position = array('q', offsets[:num_nodes])
+    csr_targets = array('i', bytes(4 * num_edges))
+    csr_weights = array('d', bytes(8 * num_edges))
+    for k, source in enumerate(sources):
+        slot = position[source]
+        csr_targets[slot] = targets[k]
+        csr_weights[slot] = weights[k]
+        position[source] = slot + 1
+
+    return offsets, csr_targets, csr_weights
+
+
+def _build_reverse(csr):
+    """
+    Build the reverse of a CSR graph.
+
+    Args:
+        csr (CSRGraph): Graph
+
+    Returns:
+        CSRGraph: Graph with the same nodes and reversed edges
+    """
+    offsets = csr.offsets
+    sources = array('i')
+    for i in range(csr.num_nodes):
+        sources.extend(array('i', [i]) * (offsets[i + 1] - offsets[i]))
+
+    reverse_offsets, reverse_targets, reverse_weights = build_csr_arrays(
+        csr.num_nodes, csr.targets, sources, csr.weights)
+
+    reverse = CSRGraph(csr.node_ids, reverse_offsets, reverse_targets, reverse_weights,
+                       csr.nodes, csr.metadata, csr.columns, csr.categories)
+    reverse._index = csr._index
+    return reverse
+
+
+class GraphHandle:
+    """
+    A loaded graph that owns its CSR adjacency structure and node index.
+
+    The CSR form is built lazily the first time a search needs it and then
+    shared by every search entry point, so a batch of queries against one
+    loaded graph pays for the conversion only once. Call invalidate() after
+    changing the graph so the next search rebuilds it.
+
+    Attributes:
+        graph (dict or CSRGraph): The graph this handle was created for
+        version (int): Incremented on every invalidate()
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.version = 0
+        self._csr = graph if isinstance(graph, CSRGraph) else None
+
+    @property
+    def csr(self):
+        """CSRGraph: Integer-indexed form of the graph (built on first use)."""
+        if self._csr is None or self._is_stale():
+            self._csr = CSRGraph.from_graph(self.graph)
+        return self._csr
+
+    def _is_stale(self):
+        """
+        Cheaply detect nodes or edges added/removed since the CSR was built.
+
+        Returns:
+            bool: True if the CSR form no longer matches the graph dictionary
+        """
+        if isinstance(self.graph, CSRGraph):
+            return False
+        return (self._csr.num_nodes != len(self.graph["nodes"]) or
+                self._csr.num_edges != len(self.graph["edges"]))
+
+    def invalidate(self):
+        """
+        Discard the CSR form so the next search rebuilds it.
+
+        Structures derived from the old CSR form (such as heuristic contexts
+        cached by greedy_search.py) are keyed on it and are not reused.
+        """
+        if not isinstance(self.graph, CSRGraph):
+            self._csr = None
+        self.version += 1
+
+
+# Maximum number of graph dictionaries whose CSR form is kept between calls
+GRAPH_HANDLE_CACHE_SIZE = 8
+
+_graph_handles = OrderedDict()
+
+
+def get_graph_handle(graph):
+    """
+    Return the shared handle for a graph, creating it on first use.
+
+    Dictionary graphs passed straight to the search functions get a handle
+    from a small LRU registry, so repeated searches on the same loaded
+    dictionary reuse one CSR form instead of rebuilding it per call.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+
+    Returns:
+        GraphHandle: Handle owning the graph's CSR form
+    """
+    if isinstance(graph, GraphHandle):
+        return graph
+
+    key = id(graph)
+    handle = _graph_handles.get(key)
+
+    # The handle holds a reference to its graph, so an id() can only be
+    # reused by a different graph after the old handle has been evicted
+    if handle is not None and handle.graph is graph:
+        _graph_handles.move_to_end(key)
+        return handle
+
+    handle = GraphHandle(graph)
+    _graph_handles[key] = handle
+    while len(_graph_handles) > GRAPH_HANDLE_CACHE_SIZE:
+        _graph_handles.popitem(last=False)
+
+    return handle
+
+
+def invalidate_graph(graph):
+    """
+    Discard the cached CSR form of a graph after it has been modified.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+    """
+    if isinstance(graph, GraphHandle):
+        graph.invalidate()
+        return
+
+    handle = _graph_handles.get(id(graph))
+    if handle is not None and handle.graph is graph:
+        handle.invalidate()
+
+
+def as_csr_graph(graph):
+    """
+    Return a CSR view of a graph, reusing the cached form when possible.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+
+    Returns:
+        CSRGraph: Integer-indexed graph
+    """
+    if isinstance(graph, CSRGraph):
+        return graph
+    return get_graph_handle(graph).csr
+
+
+def graph_nodes(graph):
+    """
+    Return the node property dictionaries of a graph in index order.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+
+    Returns:
+        list: Node data dictionaries, one per node
+    """
+    if isinstance(graph, dict):
+        return list(graph["nodes"].values())
+    return as_csr_graph(graph).nodes
+
+
+def get_metadata(graph):
+    """
+    Return the metadata dictionary of a graph.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+
+    Returns:
+        dict: Graph metadata (num_nodes, num_edges, graph_type, ...)
+    """
+    if isinstance(graph, GraphHandle):
+        graph = graph.graph
+    if isinstance(graph, CSRGraph):
+        return graph.metadata
+    return graph["metadata"]
+
+
+def get_node(graph, node_id):
+    """
+    Return the property dictionary of a node by its ID.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        node_id (str): Node ID such as "node_17"
+
+    Returns:
+        dict: Node data (id, name, type, region, capacity, ...)
+    """
+    if isinstance(graph, GraphHandle):
+        graph = graph.graph
+    if isinstance(graph, CSRGraph):
+        return graph.nodes[graph.index_of(node_id)]
+    return graph["nodes"][node_id]
@@ -0,0 +1,334 @@
+"""
+Direction-Optimizing Breadth-First Search
+=========================================
+This module implements a level-synchronous BFS that switches between
+top-down and bottom-up steps, for searching nodes by their properties.
+
+The random long-distance edges added by graph_generator.py give the graphs
+a small diameter, so after a few levels the frontier holds a large part of
+the graph. A top-down step (the deque BFS in bfs_search.py) then checks
+every outgoing edge of every frontier node, although most targets were
+visited long ago. A bottom-up step turns this around: every node not
+visited yet looks through its incoming edges (the reverse CSR, see
+CSRGraph.reverse()) for a parent in the frontier and stops at the first
+one it finds. When the frontier is large most unvisited nodes find a
+parent after one or two checks.
+
+Each level is one step in one direction. The frontier is kept as a list
+for top-down steps and as a bitmap (one byte per node) for bottom-up steps.
+The switch follows the usual edge-count heuristic:
+- top-down -> bottom-up when the frontier's outgoing edges exceed the
+  edges still unexplored divided by TOP_DOWN_ALPHA
+- bottom-up -> top-down when the frontier shrinks below the number of
+  nodes divided by BOTTOM_UP_BETA
+
+Every node is reached at the same level as with the deque BFS, so the
+same nodes match. Within a level, bottom-up steps discover nodes in index
+order rather than in queue order.
+
+Usage:
+    python direction_bfs.py <graph_size> <search_property> <search_value> [--start NODE_ID]
+    python direction_bfs.py <graph_size> "<criteria>" [--start NODE_ID]
+
+    graph_size: small, medium, or large
+    search_property: type, region, capacity_min, capacity_max, priority
+    search_value: value to search for
+    criteria: property=value terms combined with "and"/"or"
+    --start NODE_ID: search from one node instead of all components
+
+Examples:
+    python direction_bfs.py large type warehouse
+    python direction_bfs.py large "type=hub and priority=5" --start node_0
+
+The report lists the direction, frontier size and edges checked for each
+level and compares the total with the deque BFS.
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import sys
+import time
+from itertools import islice
+
+from bfs_search import display_results, iter_bfs_matches
+from csr_graph import as_csr_graph, get_metadata
+from graph_stream import open_named_graph
+from search_criteria import check_limit, compile_criteria, match_mask
+
+
+# Switch to bottom-up once frontier edges > unexplored edges / TOP_DOWN_ALPHA
+TOP_DOWN_ALPHA = 14
+
+# Switch back to top-down once frontier nodes < all nodes / BOTTOM_UP_BETA
+BOTTOM_UP_BETA = 24
+
+
+def iter_direction_optimizing_matches(graph, search_property, search_value=None,
+                                      start_node_id=None, stats=None):
+    """
+    Run a direction-optimizing BFS and yield matching node IDs level by level.
+
+    Algorithm:
+    1. Start a level-synchronous BFS from a start node (or from every node
+       not reached yet, to cover all components)
+    2. Expand each level top-down (frontier -> outgoing edges) or bottom-up
+       (unvisited nodes -> incoming edges, stopping at the first parent in
+       the frontier), whichever checks fewer edges
+    3. Yield the matches of each new level before expanding it
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        search_property (str): Property to search by, a criteria expression
+            such as "type=hub and priority=5", or compiled criteria
+            (see search_criteria.py)
+        search_value (str): Value to match (None for expressions)
+        start_node_id (str): Starting node ID, or None for all components
+        stats (dict): Optional dict; "nodes_explored" and "edges_checked"
+            are kept up to date whenever a match is yielded and when the
+            search ends, and "levels" gets one (direction, frontier size,
+            edges checked) tuple per expanded level
+
+    Yields:
+        str: Node IDs that match criteria
+    """
+    csr = as_csr_graph(graph)
+    reverse = csr.reverse()
+    offsets, targets, node_ids = csr.offsets, csr.targets, csr.node_ids
+    in_offsets, in_sources = reverse.offsets, reverse.targets
+    n = csr.num_nodes
+
+    # Criteria are validated and evaluated once: match[i] is 1 if node i matches
+    match = match_mask(csr, search_property, search_value)
+
+    if start_node_id is None:
+        starts = range(n)
+    else:
+        starts = (csr.index_of(start_node_id),)
+
+    visited = bytearray(n)
+    unexplored_edges = csr.num_edges  # Outgoing edges of nodes not visited yet
+    unvisited = None  # Candidates for bottom-up steps, built on first use
+    nodes_explored = 0
+    edges_checked = 0
+    levels = []
+    if stats is not None:
+        stats["levels"] = levels
+
+    def report():
+        if stats is not None:
+            stats["nodes_explored"] = nodes_explored
+            stats["edges_checked"] = edges_checked
+
+    for start in starts:
+        if visited[start]:
+            continue
+
+        visited[start] = 1
+        unexplored_edges -= offsets[start + 1] - offsets[start]
+        if match[start]:
+            report()
+            yield node_ids[start]
+
+        frontier = [start]
+        bottom_up = False
+        while frontier:
+            nodes_explored += len(frontier)
+            frontier_edges = sum(offsets[node + 1] - offsets[node] for node in frontier)
+            if bottom_up:
+                bottom_up = len(frontier) * BOTTOM_UP_BETA >= n
+            else:
+                bottom_up = frontier_edges * TOP_DOWN_ALPHA > unexplored_edges
+
+            next_frontier = []
+            checked = 0
+            if bottom_up:
+                # Bitmap frontier: each unvisited node looks for a parent in it
+                in_frontier = bytearray(n)
+                for node in frontier:
+                    in_frontier[node] = 1
+                if unvisited is None:
+                    unvisited = [node for node in range(n) if not visited[node]]
+                still_unvisited = []
+                for node in unvisited:
+                    if visited[node]:
+                        continue
+                    for k in range(in_offsets[node], in_offsets[node + 1]):
+                        checked += 1
+                        if in_frontier[in_sources[k]]:
+                            visited[node] = 1
+                            next_frontier.append(node)
+                            break
+                    else:
+                        still_unvisited.append(node)
+                unvisited = still_unvisited
+            else:
+                checked = frontier_edges
+                for node in frontier:
+                    for neighbor in targets[offsets[node]:offsets[node + 1]]:
+                        if not visited[neighbor]:
+                            visited[neighbor] = 1
+                            next_frontier.append(neighbor)
+
+            edges_checked += checked
+            levels.append(("bottom-up" if bottom_up else "top-down", len(frontier), checked))
+            unexplored_edges -= sum(offsets[node + 1] - offsets[node] for node in next_frontier)
+
+            for node in next_frontier:
+                if match[node]:
+                    report()
+                    yield node_ids[node]
+            frontier = next_frontier
+
+    report()
+
+
+def direction_optimizing_search(graph, search_property, search_value=None,
+                                start_node_id=None, limit=None):
+    """
+    Find nodes matching criteria with a direction-optimizing BFS.
+
+    See iter_direction_optimizing_matches() for the algorithm.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        search_property (str): Property to search by, or a criteria expression
+        search_value (str): Value to match (None for expressions)
+        start_node_id (str): Starting node ID, or None for all components
+        limit (int): Stop after this many matches (None for all)
+
+    Returns:
+        tuple: (found_nodes, nodes_explored, time_taken, stats)
+            found_nodes (list): List of node IDs that match criteria
+            nodes_explored (int): Total number of nodes explored
+            time_taken (float): Time in seconds
+            stats (dict): "edges_checked" and per-level "levels"
+
+    Raises:
+        ValueError: If limit is negative
+    """
+    check_limit(limit)
+
+    start_time = time.time()
+
+    stats = {}
+    matches = iter_direction_optimizing_matches(graph, search_property, search_value,
+                                                start_node_id=start_node_id, stats=stats)
+    found_nodes = list(islice(matches, limit))
+
+    end_time = time.time()
+    return found_nodes, stats.get("nodes_explored", 0), end_time - start_time, stats
+
+
+def display_levels(stats, baseline_edges):
+    """
+    Display the per-level statistics of a direction-optimizing BFS.
+
+    Args:
+        stats (dict): Statistics from direction_optimizing_search()
+        baseline_edges (int): Edges checked by the deque BFS
+    """
+    print("="*70)
+    print("LEVELS")
+    print("="*70)
+    print(f"{'Level':>5}  {'Direction':<10} {'Frontier':>10} {'Edges Checked':>14}")
+    for level, (direction, frontier, checked) in enumerate(stats["levels"]):
+        print(f"{level:>5}  {direction:<10} {frontier:>10} {checked:>14}")
+    print("-"*70)
+    edges_checked = stats["edges_checked"]
+    print(f"Edges checked: {edges_checked} (deque BFS: {baseline_edges})")
+    if edges_checked:
+        print(f"Reduction: {baseline_edges / edges_checked:.1f}x fewer edge checks")
+    print("="*70)
+    print()
+
+
+def main():
+    """
+    Main function to run a direction-optimizing BFS from command line.
+    """
+    args = sys.argv[1:]
+    start_node_id = None
+    if "--start" in args:
+        position = args.index("--start")
+        try:
+            start_node_id = args[position + 1]
+        except IndexError:
+            print("Error: --start requires a node ID")
+            sys.exit(1)
+        del args[position:position + 2]
+
+    if len(args) not in (2, 3):
+        print("Usage: python direction_bfs.py <graph_size> <search_property> <search_value> [--start NODE_ID]")
+        print("       python direction_bfs.py <graph_size> \"<criteria>\" [--start NODE_ID]")
+        print()
+        print("Arguments:")
+        print("  graph_size: small, medium, or large")
+        print("  search_property: type, region, capacity_min, capacity_max, or priority")
+        print("  search_value: value to search for")
+        print("  criteria: property=value terms combined with \"and\"/\"or\"")
+        print("  --start NODE_ID: search from one node instead of all components")
+        print()
+        print("Examples:")
+        print("  python direction_bfs.py large type warehouse")
+        print("  python direction_bfs.py large \"type=hub and priority=5\" --start node_0")
+        sys.exit(1)
+
+    # Parse arguments
+    graph_size = args[0].lower()
+    if len(args) == 3:
+        search_property = args[1].lower()
+        search_value = args[2]
+    else:
+        search_property = args[1]
+        search_value = None
+
+    # Validate graph size
+    if graph_size not in ["small", "medium", "large"]:
+        print(f"Error: Invalid graph size '{graph_size}'")
+        print("Valid options: small, medium, large")
+        sys.exit(1)
+
+    # Validate the search criteria before loading the graph
+    try:
+        criteria = compile_criteria(search_property, search_value)
+    except ValueError as error:
+        print(f"Error: {error}")
+        sys.exit(1)
+
+    # Load graph (memory-mapped .gbin if present, else streamed from JSON or graphs.zip)
+    graph = open_named_graph(graph_size)
+    metadata = get_metadata(graph)
+    print(f"Loaded graph with {metadata['num_nodes']} nodes " +
+          f"and {metadata['num_edges']} edges")
+
+    csr = as_csr_graph(graph)
+    if start_node_id is not None and start_node_id not in csr.index:
+        print(f"Error: Node '{start_node_id}' not found in the graph")
+        sys.exit(1)
+
+    # The reverse graph is built once, outside the timed search
+    csr.reverse()
+
+    if search_value is None:
+        print(f"\nSearching for nodes where {search_property}...")
+    else:
+        print(f"\nSearching for nodes where {search_property} = {search_value}...")
+    found_nodes, nodes_explored, time_taken, stats = direction_optimizing_search(
+        graph, criteria, start_node_id=start_node_id
+    )
+    display_results(found_nodes, nodes_explored, time_taken, graph, search_property, search_value)
+
+    # The deque BFS checks every outgoing edge of every node it explores
+    baseline = {}
+    baseline_start = time.time()
+    baseline_found = sum(1 for _ in iter_bfs_matches(graph, criteria, start_node_id=start_node_id,
+                                                     stats=baseline))
+    baseline_time = time.time() - baseline_start
+    display_levels(stats, baseline["edges_checked"])
+    print(f"Deque BFS: {baseline_found} nodes found in {baseline_time:.6f} seconds")
+    print()
+
+
+if __name__ == "__main__":
+    main()
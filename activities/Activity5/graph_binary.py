@@ -0,0 +1,367 @@
+"""
+Binary Graph File Format
+========================
+This module reads and writes graphs in a compact, versioned binary format
+(.gbin) that can be memory-mapped instead of parsed.
+
+Parsing graph_large.json builds tens of thousands of Python dictionaries
+before a search can start. A .gbin file stores the same graph as columns:
+the CSR arrays (offsets, targets, weights), node coordinates, capacity,
+priority, categorical codes for type and region, and the node ID and name
+strings (see node_columns.py). The name column is left out when every
+name is the generated "{type}_{region}_{index}". Loading maps the file
+into memory and wraps each column in a memoryview, so no data is copied
+or parsed up front.
+
+File layout:
+    8 bytes   magic b"CSRGRAPH"
+    4 bytes   format version (little-endian uint32)
+    4 bytes   header length in bytes (little-endian uint32)
+    N bytes   JSON header: byte order, metadata, categories and column table
+    ...       column data in the recorded byte order, each aligned to 8 bytes
+
+Usage:
+    python graph_binary.py <input.json> [output.gbin]
+
+Examples:
+    python graph_binary.py graph_large.json
+    python graph_binary.py graph_small.json small.gbin
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from csr_graph import CSRGraph
+from node_columns import CATEGORICAL_ATTRIBUTES, ColumnNodes, StringColumn
+
+
+MAGIC = b"CSRGRAPH"
+FORMAT_VERSION = 1
+BINARY_EXTENSION = ".gbin"
+
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGNMENT = 8
+
+
+# Buffer formats that can be copied byte-for-byte into each array typecode
+_COMPATIBLE_FORMATS = {
+    'q': ('q', 'l'),
+    'i': ('i',),
+    'd': ('d',),
+    'B': ('B',)
+}
+
+
+def _to_array(typecode, values):
+    """
+    Convert a column to an array, copying raw bytes when the layout matches.
+
+    Columns produced by the vectorised generator or loaded from a .gbin file
+    are buffers (NumPy arrays or memoryviews); copying their bytes avoids
+    iterating over millions of elements in Python.
+
+    Args:
+        typecode (str): Target array typecode
+        values: List, array, memoryview or NumPy array
+
+    Returns:
+        array: Column as a stdlib array
+    """
+    result = array(typecode)
+    try:
+        view = memoryview(values)
+    except TypeError:
+        result.extend(values)
+        return result
+
+    if view.format in _COMPATIBLE_FORMATS[typecode] and view.itemsize == result.itemsize:
+        result.frombytes(view.tobytes())
+    else:
+        result.extend(view.tolist())
+    return result
+
+
+def _encode_strings(strings):
+    """
+    Encode strings as a UTF-8 blob and an offsets array.
+
+    Args:
+        strings (iterable): Strings to encode
+
+    Returns:
+        tuple: (data, offsets) as array('B') and array('q')
+    """
+    data = bytearray()
+    offsets = array('q', [0])
+    for value in strings:
+        data += value.encode("utf-8")
+        offsets.append(len(data))
+    return array('B', data), offsets
+
+
+def _encode_categories(values):
+    """
+    Replace string values by small integer codes.
+
+    Args:
+        values (list): Category value per node
+
+    Returns:
+        tuple: (categories, codes) with the sorted category list and array('B')
+    """
+    categories = sorted(set(values))
+    if len(categories) > 255:
+        raise ValueError("at most 255 distinct categories can be stored")
+    lookup = {value: code for code, value in enumerate(categories)}
+    return categories, array('B', [lookup[value] for value in values])
+
+
+def save_graph_to_binary(graph, filename):
+    """
+    Save a graph in the binary .gbin format.
+
+    Args:
+        graph (dict or CSRGraph): Graph structure
+        filename (str): Output filename
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+    nodes = csr.nodes
+
+    columns = {
+        "offsets": _to_array('q', csr.offsets),
+        "targets": _to_array('i', csr.targets),
+        "weights": _to_array('d', csr.weights)
+    }
+
+    if csr.columns is not None:
+        # Attributes are already columnar, copy them without building dicts
+        for name, typecode in (("x", 'd'), ("y", 'd'), ("capacity", 'i'),
+                               ("priority", 'i'), ("type", 'B'), ("region", 'B')):
+            columns[name] = _to_array(typecode, csr.columns[name])
+        categories = {attribute: list(csr.categories[attribute])
+                      for attribute in CATEGORICAL_ATTRIBUTES}
+        # Generated names are not stored (see node_columns.py)
+        names = nodes.names
+    else:
+        columns["x"] = array('d', [node["coordinates"]["x"] for node in nodes])
+        columns["y"] = array('d', [node["coordinates"]["y"] for node in nodes])
+        columns["capacity"] = array('i', [node["capacity"] for node in nodes])
+        columns["priority"] = array('i', [node["priority"] for node in nodes])
+
+        categories = {}
+        for attribute in CATEGORICAL_ATTRIBUTES:
+            categories[attribute], columns[attribute] = _encode_categories(
+                [node[attribute] for node in nodes]
+            )
+        names = (node["name"] for node in nodes)
+
+    columns["id_data"], columns["id_offsets"] = _encode_strings(csr.node_ids)
+    if names is not None:
+        columns["name_data"], columns["name_offsets"] = _encode_strings(names)
+
+    # Lay out the column table relative to the start of the data section
+    table = {}
+    position = 0
+    for name, column in columns.items():
+        table[name] = {
+            "typecode": column.typecode,
+            "offset": position,
+            "count": len(column)
+        }
+        position += len(column) * column.itemsize
+        position += -position % _ALIGNMENT
+
+    header = json.dumps({
+        "byteorder": sys.byteorder,
+        "num_nodes": csr.num_nodes,
+        "num_edges": csr.num_edges,
+        "metadata": csr.metadata,
+        "categories": categories,
+        "columns": table
+    }).encode("utf-8")
+    header += b" " * (-(_PREAMBLE.size + len(header)) % _ALIGNMENT)
+
+    with open(filename, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for name, column in columns.items():
+            f.write(column.tobytes())
+            f.write(b"\0" * (-len(column) * column.itemsize % _ALIGNMENT))
+
+    print(f"Graph saved to {filename}")
+
+
+# Columns every .gbin file has (name_* is optional)
+_REQUIRED_COLUMNS = ["offsets", "targets", "weights", "x", "y", "capacity", "priority",
+                     "type", "region", "id_data", "id_offsets"]
+
+
+def _read_header(mapped, filename):
+    """
+    Check a mapped .gbin file and locate its columns.
+
+    Nothing is wrapped in a memoryview yet, so the mapping can still be
+    closed if the file turns out to be invalid.
+
+    Args:
+        mapped (mmap): Mapped file
+        filename (str): File name for error messages
+
+    Returns:
+        tuple: (metadata, categories, spans) from the JSON header, with the
+            (start, end, typecode) byte span of each column
+
+    Raises:
+        ValueError: If the file is not a supported, complete .gbin file
+    """
+    if len(mapped) < _PREAMBLE.size:
+        raise ValueError(f"'{filename}' is not a binary graph file")
+    magic, version, header_length = _PREAMBLE.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError(f"'{filename}' is not a binary graph file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"'{filename}' uses format version {version}, "
+                         f"expected {FORMAT_VERSION}")
+
+    data_start = _PREAMBLE.size + header_length
+    try:
+        header = json.loads(bytes(mapped[_PREAMBLE.size:data_start]))
+        byteorder = header["byteorder"]
+        spans = {}
+        for name, info in header["columns"].items():
+            start = data_start + info["offset"]
+            spans[name] = (start, start + info["count"] * struct.calcsize(info["typecode"]),
+                           info["typecode"])
+        missing = [name for name in _REQUIRED_COLUMNS if name not in spans]
+        num_nodes, num_edges = header["num_nodes"], header["num_edges"]
+        metadata, categories = header["metadata"], header["categories"]
+    except (KeyError, TypeError, AttributeError, struct.error) as error:
+        raise ValueError(f"'{filename}' has a damaged header ({error!r})") from None
+
+    if byteorder != sys.byteorder:
+        raise ValueError(f"'{filename}' was written on a {byteorder}-endian machine")
+    if missing:
+        raise ValueError(f"'{filename}' is missing the {', '.join(missing)} column(s)")
+    if any(end > len(mapped) for _, end, _ in spans.values()):
+        raise ValueError(f"'{filename}' is truncated")
+    offsets_start, offsets_end, _ = spans["offsets"]
+    targets_start, targets_end, _ = spans["targets"]
+    if (offsets_end - offsets_start != 8 * (num_nodes + 1) or
+            targets_end - targets_start != 4 * num_edges):
+        raise ValueError(f"'{filename}' does not hold {num_nodes} nodes and {num_edges} edges")
+    return metadata, categories, spans
+
+
+def load_graph_binary(filename):
+    """
+    Memory-map a .gbin graph file.
+
+    The returned CSRGraph reads its arrays straight from the mapped file;
+    node dictionaries and ID strings are only built when accessed. The file
+    stays mapped until the graph is garbage collected or closed with
+    CSRGraph.close().
+
+    Args:
+        filename (str): Path to .gbin graph file
+
+    Returns:
+        CSRGraph: Graph backed by the memory-mapped file
+
+    Raises:
+        ValueError: If the file is not a supported .gbin file, or is
+            truncated or damaged
+    """
+    with open(filename, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        metadata, categories, spans = _read_header(mapped, filename)
+    except ValueError:
+        mapped.close()
+        raise
+
+    buffer = memoryview(mapped)
+    columns = {name: buffer[start:end].cast(typecode)
+               for name, (start, end, typecode) in spans.items()}
+    buffer.release()
+
+    node_ids = StringColumn(columns["id_data"], columns["id_offsets"])
+    names = None
+    if "name_data" in columns:
+        names = StringColumn(columns["name_data"], columns["name_offsets"])
+    nodes = ColumnNodes(columns, categories, node_ids, names)
+
+    csr = CSRGraph(node_ids, columns["offsets"], columns["targets"],
+                   columns["weights"], nodes, metadata,
+                   columns=columns, categories=categories)
+    csr.source_file = filename
+    csr.mapping = mapped
+    return csr
+
+
+def binary_filename_for(filename):
+    """
+    Return the .gbin filename that corresponds to a JSON graph filename.
+
+    Args:
+        filename (str): Path such as "graph_large.json"
+
+    Returns:
+        str: Path such as "graph_large.gbin"
+    """
+    return os.path.splitext(filename)[0] + BINARY_EXTENSION
+
+
+def convert_json_to_binary(json_filename, binary_filename=None):
+    """
+    Convert an existing JSON graph file to the binary format.
+
+    Args:
+        json_filename (str): Input JSON graph file
+        binary_filename (str): Output file (defaults to the .gbin sibling)
+
+    Returns:
+        str: Path of the written binary file
+    """
+    if binary_filename is None:
+        binary_filename = binary_filename_for(json_filename)
+    with open(json_filename, 'r') as f:
+        graph = json.load(f)
+    save_graph_to_binary(graph, binary_filename)
+    return binary_filename
+
+
+def main():
+    """
+    Convert a JSON graph file to the binary format from the command line.
+    """
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python graph_binary.py <input.json> [output.gbin]")
+        print()
+        print("Examples:")
+        print("  python graph_binary.py graph_large.json")
+        print("  python graph_binary.py graph_small.json small.gbin")
+        sys.exit(1)
+
+    json_filename = sys.argv[1]
+    binary_filename = sys.argv[2] if len(sys.argv) == 3 else None
+
+    try:
+        convert_json_to_binary(json_filename, binary_filename)
+    except FileNotFoundError:
+        print(f"Error: File '{json_filename}' not found!")
+        sys.exit(1)
+    except json.JSONDecodeError:
+        print(f"Error: File '{json_filename}' is not valid JSON!")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
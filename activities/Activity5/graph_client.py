@@ -0,0 +1,248 @@
+"""
+Graph Query Client
+==================
+This module sends a query to a running graph_server.py and prints the
+answer in the same layout as the search scripts.
+
+It only imports the standard library modules it needs to talk to the
+server, so a query costs a connection and a few milliseconds of search
+instead of loading and preparing the graph again.
+
+Usage:
+    python graph_client.py bfs <graph_size> <search_property> <search_value> [--start NODE_ID] [--limit K]
+    python graph_client.py greedy <graph_size> "<criteria>" [--start NODE_ID] [--limit K]
+    python graph_client.py indexed <graph_size> <search_property> <search_value> [--limit K]
+    python graph_client.py route <graph_size> <source_node_id> <target_node_id> [--algorithm NAME]
+    python graph_client.py nearest <graph_size> <source_node_id> <search_property> <search_value> [--k K] [--astar]
+    python graph_client.py graphs
+    python graph_client.py cache
+    python graph_client.py ping
+
+    Every command also takes --socket PATH or --port N to reach the server.
+
+Examples:
+    python graph_server.py --preload large &
+    python graph_client.py bfs large type warehouse --limit 20
+    python graph_client.py greedy large "type=hub and priority=5"
+    python graph_client.py route large node_12 node_9876 --algorithm alt
+    python graph_client.py nearest large node_0 type warehouse --k 3
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import json
+import socket
+import sys
+import time
+
+
+DEFAULT_SOCKET = "graph_server.sock"
+
+# Longest path printed in full
+PATH_DISPLAY_LIMIT = 12
+
+TITLES = {"bfs": "BFS SEARCH RESULTS", "greedy": "GREEDY BEST-FIRST SEARCH RESULTS",
+          "indexed": "INDEXED SEARCH RESULTS", "route": "ROUTE",
+          "nearest": "NEAREST MATCHES"}
+
+
+def send_request(request, socket_path=DEFAULT_SOCKET, port=None):
+    """
+    Send one request to the server and wait for its response.
+
+    Args:
+        request (dict): Request (see graph_server.py for the operations)
+        socket_path (str): Unix socket of the server
+        port (int): Localhost TCP port of the server instead
+
+    Returns:
+        dict: Decoded response with "ok" and "result" or "error"
+
+    Raises:
+        OSError: If the server cannot be reached
+    """
+    if port is not None:
+        connection = socket.create_connection(("127.0.0.1", port))
+    else:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(socket_path)
+    with connection, connection.makefile("rwb") as stream:
+        stream.write(json.dumps(request).encode("utf-8") + b"\n")
+        stream.flush()
+        return json.loads(stream.readline())
+
+
+def _criteria_fields(terms):
+    """
+    Turn "<property> <value>" or "<criteria>" arguments into request fields.
+
+    Args:
+        terms (list): One or two command-line arguments
+
+    Returns:
+        dict: {"property": ..., "value": ...} or {"criteria": ...}
+    """
+    if len(terms) == 2:
+        return {"property": terms[0].lower(), "value": terms[1]}
+    return {"criteria": terms[0]}
+
+
+def display_search(op, request, result, round_trip):
+    """
+    Display the result of a bfs, greedy or indexed query.
+
+    Args:
+        op (str): Operation
+        request (dict): Request sent
+        result (dict): Result received
+        round_trip (float): Seconds from sending the request to the answer
+    """
+    found = result["found"]
+    print("\n" + "="*70)
+    print(TITLES[op])
+    print("="*70)
+    print(f"Graph: {request['graph']}")
+    if "criteria" in request:
+        print(f"Search Criteria: {request['criteria']}")
+    else:
+        print(f"Search Property: {request['property']}")
+        print(f"Search Value: {request['value']}")
+    print(f"Nodes Explored: {result['nodes_explored']}")
+    print(f"Nodes Found: {len(found)}")
+    print(f"Time Taken: {result['time_taken']:.6f} seconds (round trip {round_trip:.6f})")
+    print("="*70)
+
+    if found:
+        print(f"\nFound {len(found)} matching nodes:")
+        for i, node in enumerate(result["nodes"]):
+            print(f"  {i+1}. {node['name']} (ID: {node['id']})")
+            print(f"      Type: {node['type']}, Region: {node['region']}, " +
+                  f"Capacity: {node['capacity']}, Priority: {node['priority']}")
+        if len(found) > len(result["nodes"]):
+            print(f"  ... and {len(found) - len(result['nodes'])} more")
+    else:
+        print("\nNo nodes found matching the search criteria.")
+    print()
+
+
+def display_route(request, result, round_trip):
+    """
+    Display the result of a route or nearest query.
+
+    Args:
+        request (dict): Request sent
+        result (dict): Result received
+        round_trip (float): Seconds from sending the request to the answer
+    """
+    print("\n" + "="*70)
+    print(TITLES[request["op"]])
+    print("="*70)
+    print(f"Graph: {request['graph']}")
+    print(f"Nodes Settled: {result['nodes_settled']}")
+    print(f"Time Taken: {result['time_taken']:.6f} seconds (round trip {round_trip:.6f})")
+    print("="*70)
+
+    if request["op"] == "route":
+        routes = [(request["target"], result["cost"], result["path"])] if result["path"] else []
+    else:
+        routes = result["results"]
+    if not routes:
+        print("\nNo route found.")
+    for node_id, cost, path in routes:
+        print(f"\n{node_id}: cost {cost:g}, {len(path) - 1} hops")
+        if len(path) > PATH_DISPLAY_LIMIT:
+            path = path[:PATH_DISPLAY_LIMIT // 2] + ["..."] + path[-PATH_DISPLAY_LIMIT // 2:]
+        print(f"  {' -> '.join(path)}")
+    print()
+
+
+def main():
+    """
+    Main function to send a query to the graph server from command line.
+    """
+    args = sys.argv[1:]
+    options = {"--socket": DEFAULT_SOCKET, "--port": None, "--start": None,
+               "--limit": None, "--algorithm": None, "--k": None}
+    for option in list(options):
+        if option in args:
+            position = args.index(option)
+            if position + 1 >= len(args):
+                print(f"Error: {option} requires a value")
+                sys.exit(1)
+            options[option] = args[position + 1]
+            del args[position:position + 2]
+    astar = "--astar" in args
+    if astar:
+        args.remove("--astar")
+
+    for option in ("--port", "--limit", "--k"):
+        if options[option] is not None:
+            try:
+                options[option] = int(options[option])
+            except ValueError:
+                print(f"Error: {option} requires an integer value")
+                sys.exit(1)
+
+    op = args[0] if args else None
+    request = None
+    if op in ("ping", "graphs", "cache") and len(args) == 1:
+        request = {"op": op}
+    elif op in ("bfs", "greedy", "indexed") and len(args) in (3, 4):
+        request = {"op": op, "graph": args[1].lower(), **_criteria_fields(args[2:])}
+        if options["--start"] is not None:
+            request["start"] = options["--start"]
+        if options["--limit"] is not None:
+            request["limit"] = options["--limit"]
+    elif op == "route" and len(args) == 4:
+        request = {"op": op, "graph": args[1].lower(), "source": args[2], "target": args[3]}
+        if options["--algorithm"] is not None:
+            request["algorithm"] = options["--algorithm"]
+    elif op == "nearest" and len(args) in (4, 5):
+        request = {"op": op, "graph": args[1].lower(), "source": args[2],
+                   "algorithm": "astar" if astar else "dijkstra", **_criteria_fields(args[3:])}
+        if options["--k"] is not None:
+            request["k"] = options["--k"]
+
+    if request is None:
+        print("Usage: python graph_client.py bfs|greedy|indexed <graph_size> <search_property> <search_value> [--start NODE_ID] [--limit K]")
+        print("       python graph_client.py bfs|greedy|indexed <graph_size> \"<criteria>\" [--start NODE_ID] [--limit K]")
+        print("       python graph_client.py route <graph_size> <source_node_id> <target_node_id> [--algorithm NAME]")
+        print("       python graph_client.py nearest <graph_size> <source_node_id> <search_property> <search_value> [--k K] [--astar]")
+        print("       python graph_client.py graphs | cache | ping")
+        print()
+        print("Options:")
+        print("  --socket PATH / --port N: where graph_server.py listens")
+        print("  --algorithm NAME: bidirectional (default), dijkstra, bfs or alt")
+        print()
+        print("Examples:")
+        print("  python graph_client.py bfs large type warehouse --limit 20")
+        print("  python graph_client.py greedy large \"type=hub and priority=5\"")
+        print("  python graph_client.py route large node_12 node_9876 --algorithm alt")
+        print("  python graph_client.py nearest large node_0 type warehouse --k 3")
+        sys.exit(1)
+
+    start_time = time.time()
+    try:
+        response = send_request(request, options["--socket"], options["--port"])
+    except OSError as error:
+        print(f"Error: Cannot reach the graph server ({error})")
+        print("Start it with: python graph_server.py")
+        sys.exit(1)
+    round_trip = time.time() - start_time
+
+    if not response["ok"]:
+        print(f"Error: {response['error']}")
+        sys.exit(1)
+
+    result = response["result"]
+    if op in ("bfs", "greedy", "indexed"):
+        display_search(op, request, result, round_trip)
+    elif op in ("route", "nearest"):
+        display_route(request, result, round_trip)
+    else:
+        print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
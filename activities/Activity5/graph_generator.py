@@ -13,36 +13,53 @@ Author: AI Course Materials
 Date: February 2026
 """
 
+import argparse
 import json
 import random
 import math
+import os
+import sys
+from array import array
 
-def generate_structured_graph(num_nodes, graph_type="small"):
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the vectorised generator
+    np = None
+
+from csr_graph import CSRGraph
+from graph_binary import binary_filename_for, save_graph_to_binary
+from graph_stream import LAYOUTS, GraphWriter, write_graph_streaming
+from node_columns import ColumnNodes
+
+
+# Define node types and regions for structured generation
+NODE_TYPES = ["warehouse", "distribution_center", "retail_store", "hub", "depot"]
+REGIONS = ["north", "south", "east", "west", "central"]
+
+
+def iter_structured_graph(num_nodes, seed=None):
     """
-    Generate a structured weighted directed graph.
+    Generate a structured weighted directed graph one record at a time.
+
+    Yields every node first and then every edge, keeping only the node
+    coordinates in memory, so graphs can be streamed straight to disk.
 
     Args:
         num_nodes (int): Number of nodes in the graph
-        graph_type (str): Size category for naming
+        seed (int): Optional random seed for reproducible graphs
 
-    Returns:
-        dict: Graph structure with nodes and edges
+    Yields:
+        tuple: ("node", node_dict) or ("edge", edge_dict)
     """
+    if seed is not None:
+        random.seed(seed)
 
-    # Define node types and regions for structured generation
-    node_types = ["warehouse", "distribution_center", "retail_store", "hub", "depot"]
-    regions = ["north", "south", "east", "west", "central"]
+    node_types = NODE_TYPES
+    regions = REGIONS
 
-    # Initialize graph structure
-    graph = {
-        "metadata": {
-            "num_nodes": num_nodes,
-            "graph_type": graph_type,
-            "description": "Structured transportation/logistics network"
-        },
-        "nodes": {},
-        "edges": []
-    }
+    # Coordinates are all the edge generation needs to remember about nodes
+    xs = array('d')
+    ys = array('d')
 
     # Generate nodes with properties
     print(f"Generating {num_nodes} nodes...")
@@ -59,31 +76,30 @@ def generate_structured_graph(num_nodes, graph_type="small"):
         # Distribute nodes in a 2D space
         angle = 2 * math.pi * i / num_nodes
         radius = math.sqrt(i) * 10  # Spiral distribution
-        x = radius * math.cos(angle)
-        y = radius * math.sin(angle)
+        x = round(radius * math.cos(angle), 2)
+        y = round(radius * math.sin(angle), 2)
+        xs.append(x)
+        ys.append(y)
 
-        graph["nodes"][node_id] = {
+        yield "node", {
             "id": node_id,
             "name": f"{node_type}_{region}_{i}",
             "type": node_type,
             "region": region,
             "capacity": capacity,
             "priority": priority,
-            "coordinates": {"x": round(x, 2), "y": round(y, 2)}
+            "coordinates": {"x": x, "y": y}
         }
 
     # Generate edges with structured connectivity
     # Create a mix of local and long-distance connections
     print(f"Generating edges...")
 
-    node_ids = list(graph["nodes"].keys())
-    num_edges = 0
-
     # Strategy: Each node connects to several nearby nodes and a few distant ones
     edges_per_node_avg = max(3, min(10, num_nodes // 100))  # Scale with graph size
 
-    for i, source_id in enumerate(node_ids):
-        source_node = graph["nodes"][source_id]
+    for i in range(num_nodes):
+        source_id = f"node_{i}"
 
         # Calculate number of edges for this node (with some randomness)
         num_connections = random.randint(
@@ -107,26 +123,52 @@ def generate_structured_graph(num_nodes, graph_type="small"):
 
         # Create edges
         for target_idx in all_target_indices:
-            target_id = node_ids[target_idx]
-            target_node = graph["nodes"][target_id]
-
             # Calculate weight based on Euclidean distance
-            dx = source_node["coordinates"]["x"] - target_node["coordinates"]["x"]
-            dy = source_node["coordinates"]["y"] - target_node["coordinates"]["y"]
+            dx = xs[i] - xs[target_idx]
+            dy = ys[i] - ys[target_idx]
             distance = math.sqrt(dx**2 + dy**2)
 
             # Add some randomness to weight (±20%)
             weight = max(1, int(distance * random.uniform(0.8, 1.2)))
 
-            # Add edge
-            graph["edges"].append({
+            yield "edge", {
                 "source": source_id,
-                "target": target_id,
+                "target": f"node_{target_idx}",
                 "weight": weight
-            })
+            }
 
-            num_edges += 1
 
+def generate_structured_graph(num_nodes, graph_type="small", seed=None):
+    """
+    Generate a structured weighted directed graph.
+
+    Args:
+        num_nodes (int): Number of nodes in the graph
+        graph_type (str): Size category for naming
+        seed (int): Optional random seed for reproducible graphs
+
+    Returns:
+        dict: Graph structure with nodes and edges
+    """
+
+    # Initialize graph structure
+    graph = {
+        "metadata": {
+            "num_nodes": num_nodes,
+            "graph_type": graph_type,
+            "description": "Structured transportation/logistics network"
+        },
+        "nodes": {},
+        "edges": []
+    }
+
+    for kind, record in iter_structured_graph(num_nodes, seed):
+        if kind == "node":
+            graph["nodes"][record["id"]] = record
+        else:
+            graph["edges"].append(record)
+
+    num_edges = len(graph["edges"])
     graph["metadata"]["num_edges"] = num_edges
 
     print(f"Generated {num_nodes} nodes and {num_edges} edges")
@@ -134,6 +176,171 @@ def generate_structured_graph(num_nodes, graph_type="small"):
     return graph
 
 
+def generate_structured_graph_streaming(num_nodes, filename, graph_type="custom",
+                                        seed=None, layout="compact", compress=None):
+    """
+    Generate a structured graph and stream it straight to disk.
+
+    Nodes and edges are written in chunks as they are produced, so peak
+    memory does not grow with the number of edges.
+
+    Args:
+        num_nodes (int): Number of nodes in the graph
+        filename (str): Output filename (".gz" enables compression)
+        graph_type (str): Size category for naming
+        seed (int): Optional random seed for reproducible graphs
+        layout (str): "compact" JSON or "ndjson" (see graph_stream.py)
+        compress (bool): Gzip the output (default: by ".gz" extension)
+    """
+    with GraphWriter(filename, layout, compress) as writer:
+        writer.metadata = {
+            "num_nodes": num_nodes,
+            "graph_type": graph_type,
+            "description": "Structured transportation/logistics network"
+        }
+        for kind, record in iter_structured_graph(num_nodes, seed):
+            if kind == "node":
+                writer.write_node(record)
+            else:
+                writer.write_edge(record["source"], record["target"], record["weight"])
+
+    print(f"Generated {num_nodes} nodes and {writer.num_edges} edges")
+    print(f"Graph saved to {filename}")
+
+
+class GeneratedNodeIds:
+    """
+    Read-only sequence of node IDs "node_0", "node_1", ... built on access.
+
+    Generated graphs number their nodes consecutively, so storing a million
+    ID strings up front is unnecessary.
+    """
+
+    def __init__(self, num_nodes):
+        self.num_nodes = num_nodes
+
+    def __len__(self):
+        return self.num_nodes
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.num_nodes
+        if not 0 <= index < self.num_nodes:
+            raise IndexError("node index out of range")
+        return f"node_{index}"
+
+    def __iter__(self):
+        for i in range(self.num_nodes):
+            yield f"node_{i}"
+
+
+def generate_structured_graph_vectorized(num_nodes, graph_type="custom", seed=None):
+    """
+    Generate a structured weighted directed graph using NumPy array operations.
+
+    Produces the same structure as generate_structured_graph() - spiral
+    coordinates, nearby-plus-random connectivity and distance-based weights
+    with ±20% noise - without a Python loop per node or per edge, so graphs
+    with millions of nodes and edges can be created in seconds. The result
+    is a CSRGraph backed by attribute columns rather than a dictionary.
+
+    Random long-distance targets are drawn with replacement and duplicate
+    edges are merged, so a node can occasionally end up with one fewer
+    random connection than in the loop-based generator.
+
+    Args:
+        num_nodes (int): Number of nodes in the graph
+        graph_type (str): Size category for naming
+        seed (int): Optional random seed for reproducible graphs
+
+    Returns:
+        CSRGraph: Generated graph with columns for all node attributes
+
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+    if np is None:
+        raise ImportError("The vectorised generator requires NumPy (pip install numpy)")
+
+    rng = np.random.default_rng(seed)
+    n = num_nodes
+    indices = np.arange(n, dtype=np.int64)
+
+    # Node properties
+    print(f"Generating {n} nodes...")
+    node_types = rng.integers(0, len(NODE_TYPES), size=n, dtype=np.uint8)
+    regions = rng.integers(0, len(REGIONS), size=n, dtype=np.uint8)
+    capacity = rng.integers(100, 5001, size=n, dtype=np.int32)
+    priority = rng.integers(1, 6, size=n, dtype=np.int32)
+
+    # Spiral distribution of coordinates (for heuristic)
+    angle = 2 * np.pi * indices / n
+    radius = np.sqrt(indices) * 10
+    x = np.round(radius * np.cos(angle), 2)
+    y = np.round(radius * np.sin(angle), 2)
+
+    # Each node connects to several nearby nodes and a few distant ones
+    print("Generating edges...")
+    edges_per_node_avg = max(3, min(10, n // 100))
+    num_connections = rng.integers(max(2, edges_per_node_avg - 2),
+                                   edges_per_node_avg + 4, size=n)
+
+    # Nearby nodes (by index): offsets 1 .. num_connections - 1
+    nearby_counts = num_connections - 1
+    nearby_sources = np.repeat(indices, nearby_counts)
+    group_starts = np.repeat(np.cumsum(nearby_counts) - nearby_counts, nearby_counts)
+    nearby_offsets = np.arange(len(nearby_sources), dtype=np.int64) - group_starts + 1
+    nearby_targets = (nearby_sources + nearby_offsets) % n
+
+    # Random long-distance connections
+    random_counts = np.maximum(1, num_connections // 3)
+    random_sources = np.repeat(indices, random_counts)
+    random_targets = rng.integers(0, n, size=len(random_sources), dtype=np.int64)
+
+    sources = np.concatenate([nearby_sources, random_sources])
+    targets = np.concatenate([nearby_targets, random_targets])
+
+    # Drop self-loops and duplicate edges; sorting by (source, target) also
+    # puts the edges in CSR order
+    keep = sources != targets
+    keys = np.sort(sources[keep] * n + targets[keep])
+    keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    sources = keys // n
+    targets = keys % n
+
+    # Weight based on Euclidean distance with ±20% noise
+    distance = np.hypot(x[sources] - x[targets], y[sources] - y[targets])
+    weights = np.maximum(1, np.floor(distance * rng.uniform(0.8, 1.2, size=len(keys))))
+
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+
+    num_edges = len(keys)
+    print(f"Generated {n} nodes and {num_edges} edges")
+
+    columns = {
+        "x": memoryview(x),
+        "y": memoryview(y),
+        "capacity": memoryview(capacity),
+        "priority": memoryview(priority),
+        "type": memoryview(node_types),
+        "region": memoryview(regions)
+    }
+    categories = {"type": NODE_TYPES, "region": REGIONS}
+    metadata = {
+        "num_nodes": n,
+        "graph_type": graph_type,
+        "description": "Structured transportation/logistics network",
+        "num_edges": num_edges
+    }
+
+    # memoryviews iterate as plain Python ints/floats in the search loops
+    node_ids = GeneratedNodeIds(n)
+    return CSRGraph(node_ids, memoryview(offsets), memoryview(targets.astype(np.int32)),
+                    memoryview(weights), ColumnNodes(columns, categories, node_ids),
+                    metadata, columns=columns, categories=categories)
+
+
 def save_graph_to_json(graph, filename):
     """
     Save graph to JSON file.
@@ -147,9 +354,33 @@ def save_graph_to_json(graph, filename):
     print(f"Graph saved to {filename}")
 
 
-def generate_all_graphs():
+def save_graph(graph, filename, binary=False):
+    """
+    Save graph to JSON and, optionally, to the binary .gbin format.
+
+    Without binary, an existing .gbin file next to the JSON file is removed,
+    since it holds the previous graph.
+
+    Args:
+        graph (dict): Graph structure
+        filename (str): Output JSON filename
+        binary (bool): Also write a memory-mappable .gbin file next to it
+    """
+    save_graph_to_json(graph, filename)
+    binary_filename = binary_filename_for(filename)
+    if binary:
+        save_graph_to_binary(graph, binary_filename)
+    elif os.path.exists(binary_filename):
+        os.remove(binary_filename)
+        print(f"Removed outdated {binary_filename}")
+
+
+def generate_all_graphs(binary=False):
     """
     Generate all three graph sizes for the assignment.
+
+    Args:
+        binary (bool): Also write .gbin files for memory-mapped loading
     """
     print("="*60)
     print("GRAPH GENERATION FOR BFS AND HEURISTIC SEARCH ASSIGNMENTS")
@@ -159,19 +390,19 @@ def generate_all_graphs():
     # Small graph: 500 nodes
     print("Generating SMALL graph (500 nodes)...")
     small_graph = generate_structured_graph(500, "small")
-    save_graph_to_json(small_graph, "graph_small.json")
+    save_graph(small_graph, "graph_small.json", binary)
     print()
 
     # Medium graph: 3000 nodes
     print("Generating MEDIUM graph (3000 nodes)...")
     medium_graph = generate_structured_graph(3000, "medium")
-    save_graph_to_json(medium_graph, "graph_medium.json")
+    save_graph(medium_graph, "graph_medium.json", binary)
     print()
 
     # Large graph: 10000 nodes
     print("Generating LARGE graph (10000 nodes)...")
     large_graph = generate_structured_graph(10000, "large")
-    save_graph_to_json(large_graph, "graph_large.json")
+    save_graph(large_graph, "graph_large.json", binary)
     print()
 
     print("="*60)
@@ -181,11 +412,71 @@ def generate_all_graphs():
     print("  - graph_small.json (500 nodes)")
     print("  - graph_medium.json (3000 nodes)")
     print("  - graph_large.json (10000 nodes)")
+    if binary:
+        print("  - graph_small.gbin, graph_medium.gbin, graph_large.gbin (binary)")
     print("\nGraph Properties:")
     print("  - Node properties: id, name, type, region, capacity, priority, coordinates")
     print("  - Edge properties: source, target, weight")
     print("  - Graph type: Structured weighted directed graph")
 
 
+def main():
+    """
+    Generate the assignment graphs, or a single custom-size graph.
+
+    Usage:
+        python graph_generator.py [--binary]
+        python graph_generator.py --nodes N [--seed S] [--output FILE] [--binary]
+        python graph_generator.py --nodes N --stream [--layout L] [--compress]
+        python graph_generator.py --nodes N --vectorized [--stream ...]
+    """
+    parser = argparse.ArgumentParser(description="Generate structured logistics graphs.")
+    parser.add_argument("--binary", action="store_true",
+                        help="also write memory-mappable .gbin files")
+    parser.add_argument("--nodes", type=int,
+                        help="generate one graph with this many nodes")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="use the NumPy generator (writes .gbin unless --stream)")
+    parser.add_argument("--stream", action="store_true",
+                        help="stream nodes and edges to disk instead of building a dict")
+    parser.add_argument("--layout", choices=LAYOUTS, default="compact",
+                        help="streamed file layout (default: compact)")
+    parser.add_argument("--compress", action="store_true",
+                        help="gzip the streamed file")
+    parser.add_argument("--seed", type=int, help="random seed for reproducibility")
+    parser.add_argument("--output", help="output filename for --nodes")
+    args = parser.parse_args()
+
+    if args.nodes is None:
+        if args.seed is not None:
+            random.seed(args.seed)
+        generate_all_graphs(binary=args.binary)
+        return
+
+    graph_type = f"custom_{args.nodes}"
+    stream_filename = args.output or (
+        f"graph_{graph_type}" + (".ndjson" if args.layout == "ndjson" else ".json") +
+        (".gz" if args.compress else "")
+    )
+    compress = True if args.compress else None
+
+    if args.vectorized:
+        try:
+            graph = generate_structured_graph_vectorized(args.nodes, graph_type, args.seed)
+        except ImportError as error:
+            print(f"Error: {error}")
+            sys.exit(1)
+        if args.stream:
+            write_graph_streaming(graph, stream_filename, args.layout, compress)
+        else:
+            save_graph_to_binary(graph, args.output or f"graph_{graph_type}.gbin")
+    elif args.stream:
+        generate_structured_graph_streaming(args.nodes, stream_filename, graph_type,
+                                            args.seed, args.layout, compress)
+    else:
+        graph = generate_structured_graph(args.nodes, graph_type, args.seed)
+        save_graph(graph, args.output or f"graph_{graph_type}.json", args.binary)
+
+
 if __name__ == "__main__":
-    generate_all_graphs()
+    main()
@@ -0,0 +1,409 @@
+"""
+Graph Query Server
+==================
+This module keeps graphs loaded in a long-running process and answers
+search queries sent by graph_client.py.
+
+Every run of bfs_search.py or greedy_search.py imports the modules, loads
+graph_<size> and builds its CSR form, reverse graph and indexes before
+doing a few milliseconds of search. The server does that once per named
+graph: a graph is loaded on its first query (or at start-up with
+--preload) together with its reverse graph, attribute index and ALT
+landmarks, and every later query reuses them. Results of bfs, greedy and indexed searches are
+kept in a result cache (see result_cache.py), optionally backed by a
+directory with --cache-dir so they survive restarts.
+
+The server uses asyncio and listens on a Unix socket (or on a localhost
+TCP port with --port). Each request and response is one line of JSON:
+
+    {"op": "bfs", "graph": "large", "criteria": "type=hub and priority=5", "limit": 10}
+    {"ok": true, "result": {"found": [...], "nodes_explored": 812, ...}}
+
+Operations (with their extra fields):
+    bfs, greedy    criteria, or property + value; optional start, limit
+    indexed        criteria, or property + value; optional limit
+    route          source, target; optional algorithm (bidirectional,
+                   dijkstra, bfs or alt)
+    nearest        source, criteria or property + value; optional k,
+                   algorithm (dijkstra or astar)
+    graphs         lists the loaded graphs
+    cache          returns the result cache counters
+    ping           checks that the server is up
+
+Many clients can be connected at once. Graphs load on their own threads,
+so a slow first load does not hold up queries on graphs already loaded;
+the searches themselves run one at a time on a query thread, since they
+are pure Python and would only compete for the interpreter lock.
+
+Usage:
+    python graph_server.py [--socket PATH | --port N] [--preload small,medium,large] [--cache-dir DIR]
+
+Examples:
+    python graph_server.py --preload large
+    python graph_server.py --port 8765 --cache-dir .search_cache
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from attribute_index import get_attribute_index
+from csr_graph import get_node
+from graph_stream import load_named_graph
+from landmarks import alt_route, get_landmark_index
+from route_search import bidirectional_bfs, bidirectional_dijkstra
+from result_cache import ResultCache, cached_search, graph_version
+from search_criteria import compile_criteria
+from shortest_path import ALGORITHMS, dijkstra_route, nearest_matches
+
+
+DEFAULT_SOCKET = "graph_server.sock"
+GRAPH_SIZES = ["small", "medium", "large"]
+
+# Node details sent along with search results (as display_results() shows)
+DISPLAY_LIMIT = 10
+
+ROUTE_ALGORITHMS = {
+    "bidirectional": bidirectional_dijkstra,
+    "dijkstra": dijkstra_route,
+    "bfs": bidirectional_bfs,
+    "alt": alt_route
+}
+
+
+class QueryError(Exception):
+    """A request the server cannot answer; the message is sent to the client."""
+
+
+def _criteria(request):
+    """
+    Compile the criteria of a request.
+
+    Args:
+        request (dict): Request with "criteria" or "property" and "value"
+
+    Returns:
+        Criterion or CompoundCriteria: Validated criteria
+
+    Raises:
+        QueryError: If the criteria are missing or invalid
+    """
+    try:
+        if "criteria" in request:
+            if not isinstance(request["criteria"], str):
+                raise QueryError("'criteria' must be a string")
+            return compile_criteria(request["criteria"])
+        if "property" in request and "value" in request:
+            return compile_criteria(str(request["property"]).lower(), str(request["value"]))
+    except ValueError as error:
+        raise QueryError(str(error)) from None
+    raise QueryError("Request needs 'criteria' or 'property' and 'value'")
+
+
+def _node_details(graph, node_ids):
+    """
+    Return the fields display_results() prints for the first matches.
+
+    Args:
+        graph (CSRGraph): Graph
+        node_ids (list): Node IDs
+
+    Returns:
+        list: Dictionaries with id, name, type, region, capacity, priority
+    """
+    details = []
+    for node_id in node_ids[:DISPLAY_LIMIT]:
+        node = get_node(graph, node_id)
+        details.append({field: node[field] for field in
+                        ("id", "name", "type", "region", "capacity", "priority")})
+    return details
+
+
+def _check_node(graph, node_id):
+    """
+    Raise QueryError unless a node exists.
+
+    Args:
+        graph (CSRGraph): Graph
+        node_id (str): Node ID from the request
+    """
+    if not isinstance(node_id, str) or node_id not in graph.index:
+        raise QueryError(f"Node '{node_id}' not found in the graph")
+
+
+def run_query(graph, request, cache=None):
+    """
+    Answer one query against a loaded graph.
+
+    Args:
+        graph (CSRGraph): Graph named in the request
+        request (dict): Decoded request
+        cache (ResultCache): Cache for bfs, greedy and indexed results
+
+    Returns:
+        dict: Result sent back to the client
+
+    Raises:
+        QueryError: If the request is invalid
+    """
+    op = request["op"]
+    limit = request.get("limit")
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or
+                              limit < 0):
+        raise QueryError("'limit' must be a non-negative integer")
+
+    if op in ("bfs", "greedy", "indexed"):
+        criteria = _criteria(request)
+        start = request.get("start")
+        if start is not None and op != "indexed":
+            _check_node(graph, start)
+        found, explored, time_taken = cached_search(graph, op, criteria, start_node_id=start,
+                                                    limit=limit, cache=cache)
+        return {"found": found, "nodes_explored": explored, "time_taken": time_taken,
+                "nodes": _node_details(graph, found)}
+
+    if op == "route":
+        algorithm = request.get("algorithm", "bidirectional")
+        if algorithm not in ROUTE_ALGORITHMS:
+            raise QueryError(f"Unknown route algorithm '{algorithm}'")
+        for node_id in (request.get("source"), request.get("target")):
+            _check_node(graph, node_id)
+        path, cost, settled, time_taken = ROUTE_ALGORITHMS[algorithm](
+            graph, request["source"], request["target"])
+        return {"path": path, "cost": cost, "nodes_settled": settled, "time_taken": time_taken}
+
+    if op == "nearest":
+        criteria = _criteria(request)
+        algorithm = request.get("algorithm", "dijkstra")
+        if algorithm not in ALGORITHMS:
+            raise QueryError(f"Unknown algorithm '{algorithm}'")
+        k = request.get("k", 1)
+        if not isinstance(k, int) or isinstance(k, bool) or k < 1:
+            raise QueryError("'k' must be a positive integer")
+        _check_node(graph, request.get("source"))
+        results, settled, time_taken = nearest_matches(
+            graph, request["source"], criteria, k=k, algorithm=algorithm)
+        return {"results": [list(result) for result in results],
+                "nodes_settled": settled, "time_taken": time_taken,
+                "nodes": _node_details(graph, [node_id for node_id, _, _ in results])}
+
+    raise QueryError(f"Unknown operation '{op}'")
+
+
+class GraphServer:
+    """
+    Named graphs kept in memory and the asyncio connection handler.
+
+    Attributes:
+        graphs (dict): graph size -> loaded CSRGraph
+        cache (ResultCache): Cache of search results
+    """
+
+    def __init__(self, cache=None):
+        self.graphs = {}
+        self.cache = cache if cache is not None else ResultCache()
+        self._loading = {}
+        self._load_executor = ThreadPoolExecutor(thread_name_prefix="load")
+        self._query_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query")
+
+    @staticmethod
+    def _load(graph_size):
+        """
+        Load a named graph and prepare what the queries reuse.
+
+        Args:
+            graph_size (str): small, medium or large
+
+        Returns:
+            CSRGraph: Loaded graph with its reverse graph, attribute index,
+                landmarks (for alt routes) and content hash (for the result
+                cache) prepared
+        """
+        graph = load_named_graph(graph_size)
+        graph.reverse()
+        get_attribute_index(graph)
+        # Built here rather than on the query thread, where it would hold up every client
+        get_landmark_index(graph, save=True)
+        graph_version(graph)
+        print(f"Graph '{graph_size}' ready ({graph.num_nodes} nodes, {graph.num_edges} edges)")
+        return graph
+
+    async def get_graph(self, graph_size):
+        """
+        Return a named graph, loading it once even if several queries wait for it.
+
+        Args:
+            graph_size (str): small, medium or large
+
+        Returns:
+            CSRGraph: Loaded graph
+
+        Raises:
+            QueryError: If the name is unknown or the graph cannot be loaded
+        """
+        if not isinstance(graph_size, str) or graph_size not in GRAPH_SIZES:
+            raise QueryError(f"Invalid graph size '{graph_size}'")
+        if graph_size in self.graphs:
+            return self.graphs[graph_size]
+
+        loading = self._loading.get(graph_size)
+        if loading is None:
+            loop = asyncio.get_running_loop()
+            loading = loop.run_in_executor(self._load_executor, self._load, graph_size)
+            self._loading[graph_size] = loading
+        try:
+            graph = await loading
+        except (FileNotFoundError, ValueError) as error:
+            raise QueryError(f"Cannot load graph '{graph_size}': {error}") from None
+        finally:
+            self._loading.pop(graph_size, None)
+        self.graphs[graph_size] = graph
+        return graph
+
+    async def answer(self, request):
+        """
+        Answer one decoded request.
+
+        Args:
+            request (dict): Decoded request
+
+        Returns:
+            dict: Result sent back to the client
+
+        Raises:
+            QueryError: If the request is invalid
+        """
+        if not isinstance(request, dict) or "op" not in request:
+            raise QueryError("Request must be a JSON object with an 'op' field")
+        if request["op"] == "ping":
+            return {"pong": True}
+        if request["op"] == "graphs":
+            return {name: {"num_nodes": graph.num_nodes, "num_edges": graph.num_edges}
+                    for name, graph in self.graphs.items()}
+        if request["op"] == "cache":
+            return self.cache.stats()
+
+        graph = await self.get_graph(request.get("graph"))
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._query_executor, run_query, graph, request,
+                                          self.cache)
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serve the requests of one client connection, one JSON line each.
+
+        Args:
+            reader (asyncio.StreamReader): Incoming requests
+            writer (asyncio.StreamWriter): Outgoing responses
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    result = await self.answer(json.loads(line))
+                    response = {"ok": True, "result": result}
+                except json.JSONDecodeError:
+                    response = {"ok": False, "error": "Request is not valid JSON"}
+                except QueryError as error:
+                    response = {"ok": False, "error": str(error)}
+                except Exception as error:
+                    # A bug in one query must not drop the connection
+                    response = {"ok": False, "error": f"Internal error: {error!r}"}
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path=None, port=None, preload=()):
+        """
+        Start listening and serve clients until cancelled.
+
+        Args:
+            socket_path (str): Unix socket to listen on (when port is None)
+            port (int): Localhost TCP port to listen on instead
+            preload (list): Graph sizes to load before accepting clients
+        """
+        for graph_size in preload:
+            await self.get_graph(graph_size)
+
+        if port is not None:
+            server = await asyncio.start_server(self.handle_connection, "127.0.0.1", port)
+            print(f"Listening on 127.0.0.1:{port}")
+        else:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(self.handle_connection, socket_path)
+            print(f"Listening on {socket_path}")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if port is None and os.path.exists(socket_path):
+                os.remove(socket_path)
+
+
+def main():
+    """
+    Main function to run the graph query server from command line.
+    """
+    args = sys.argv[1:]
+    options = {"--socket": DEFAULT_SOCKET, "--port": None, "--preload": "",
+               "--cache-dir": None}
+    for option in list(options):
+        if option in args:
+            position = args.index(option)
+            if position + 1 >= len(args):
+                print(f"Error: {option} requires a value")
+                sys.exit(1)
+            options[option] = args[position + 1]
+            del args[position:position + 2]
+
+    if args:
+        print("Usage: python graph_server.py [--socket PATH | --port N] [--preload small,medium,large] [--cache-dir DIR]")
+        print()
+        print("Examples:")
+        print("  python graph_server.py --preload large")
+        print("  python graph_server.py --port 8765 --cache-dir .search_cache")
+        sys.exit(1)
+
+    port = options["--port"]
+    if port is not None:
+        try:
+            port = int(port)
+        except ValueError:
+            print("Error: --port requires an integer value")
+            sys.exit(1)
+    elif not hasattr(socket, "AF_UNIX"):
+        print("Error: Unix sockets are not available here, use --port")
+        sys.exit(1)
+
+    preload = [name.strip().lower() for name in options["--preload"].split(",") if name.strip()]
+    for graph_size in preload:
+        if graph_size not in GRAPH_SIZES:
+            print(f"Error: Invalid graph size '{graph_size}'")
+            print("Valid options: small, medium, large")
+            sys.exit(1)
+
+    server = GraphServer(ResultCache(directory=options["--cache-dir"]))
+    try:
+        asyncio.run(server.serve(options["--socket"], port, preload))
+    except QueryError as error:
+        print(f"Error: {error}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\nServer stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,675 @@
+"""
+Streaming Graph Reader and Writer
+=================================
+This module writes graphs to disk incrementally, one node or edge at a
+time, instead of building the whole graph dictionary and calling
+json.dump() on it, and reads graph files back incrementally without
+json.load().
+
+Two layouts are supported:
+
+    compact   The usual graph JSON schema ({"nodes": {...}, "edges": [...],
+              "metadata": {...}}) without indentation, one record per line.
+              json.load() and load_graph() read it like any other graph file.
+    ndjson    Newline-delimited JSON, one record per line:
+                  {"node": {...}}
+                  {"edge": {"source": ..., "target": ..., "weight": ...}}
+                  {"metadata": {...}}
+
+Output is gzip-compressed when compress=True or the filename ends in ".gz".
+Records are buffered and written in chunks, so memory use stays flat no
+matter how many edges are written.
+
+load_graph_streaming() reads the pretty-printed files from
+graph_generator.py as well as both layouts above, one record at a time,
+straight into CSR arrays and attribute columns. The "edges" list of
+dictionaries is never built. It can also read members of graphs.zip
+without extracting them.
+
+Usage:
+    with GraphWriter("graph_huge.json.gz", layout="compact") as writer:
+        writer.write_node(node)
+        writer.write_edge("node_0", "node_1", 12)
+        writer.metadata = {"num_nodes": 2, "graph_type": "custom"}
+
+    csr = load_graph_streaming("graphs.zip", member="graph_large.json")
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import gzip
+import io
+import json
+import os
+import re
+import sys
+import zipfile
+import zlib
+from array import array
+
+from csr_graph import CSRGraph, build_csr_arrays
+from graph_binary import BINARY_EXTENSION, binary_filename_for, load_graph_binary
+from node_columns import ColumnNodes, NodeColumnBuilder
+
+
+LAYOUTS = ["compact", "ndjson"]
+
+# Number of records buffered before they are written to disk
+DEFAULT_CHUNK_SIZE = 10000
+
+# Characters read from the input per refill of the streaming parser
+READ_SIZE = 1 << 20
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Archive searched by open_named_graph() when a graph file is not extracted
+GRAPH_ARCHIVE = "graphs.zip"
+
+_SEPARATORS = (",", ":")
+
+
+def open_text(filename, mode, compress=None):
+    """
+    Open a text file, transparently handling gzip compression.
+
+    Args:
+        filename (str): Path to the file
+        mode (str): "r" or "w"
+        compress (bool): Force compression on or off; by default it is
+            enabled for filenames ending in ".gz"
+
+    Returns:
+        file: Text-mode file object
+    """
+    if compress is None:
+        compress = filename.endswith(".gz")
+    if compress:
+        return gzip.open(filename, mode + "t", encoding="utf-8")
+    return open(filename, mode, encoding="utf-8")
+
+
+class GraphWriter:
+    """
+    Write a graph node by node and edge by edge.
+
+    All nodes must be written before the first edge. Metadata is written
+    last, so num_edges can be filled in once it is known; if the metadata
+    attribute has no num_nodes/num_edges they are added from the counts.
+
+    Attributes:
+        filename (str): Output filename
+        layout (str): "compact" or "ndjson"
+        metadata (dict): Metadata written when the writer is closed
+        num_nodes (int): Nodes written so far
+        num_edges (int): Edges written so far
+    """
+
+    def __init__(self, filename, layout="compact", compress=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout '{layout}', expected one of {LAYOUTS}")
+
+        self.filename = filename
+        self.layout = layout
+        self.metadata = {}
+        self.num_nodes = 0
+        self.num_edges = 0
+        self.chunk_size = chunk_size
+        self._file = open_text(filename, "w", compress)
+        self._buffer = []
+        self._section = None
+
+    def _emit(self, text):
+        """
+        Buffer one line of output, flushing full chunks to disk.
+
+        Args:
+            text (str): Line to write (without trailing newline)
+        """
+        self._buffer.append(text)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def _start_section(self, section):
+        """
+        Open the "nodes" or "edges" part of the compact JSON layout.
+
+        Args:
+            section (str): "nodes" or "edges"
+        """
+        if self._section == section:
+            return
+        if self._section == "edges":
+            raise ValueError("all nodes must be written before the first edge")
+
+        if self.layout == "compact":
+            if self._section is None:
+                self._emit('{"nodes":{')
+            if section == "edges":
+                self._emit('},"edges":[')
+        self._section = section
+
+    def write_node(self, node):
+        """
+        Write one node.
+
+        Args:
+            node (dict): Node data including its "id"
+        """
+        self._start_section("nodes")
+        record = json.dumps(node, separators=_SEPARATORS)
+        if self.layout == "ndjson":
+            self._emit('{"node":' + record + '}')
+        else:
+            prefix = "," if self.num_nodes else ""
+            self._emit(prefix + json.dumps(node["id"]) + ":" + record)
+        self.num_nodes += 1
+
+    def write_edge(self, source, target, weight):
+        """
+        Write one directed edge.
+
+        Args:
+            source (str): Source node ID
+            target (str): Target node ID
+            weight (int or float): Edge weight
+        """
+        self._start_section("edges")
+        record = json.dumps({"source": source, "target": target, "weight": weight},
+                            separators=_SEPARATORS)
+        if self.layout == "ndjson":
+            self._emit('{"edge":' + record + '}')
+        else:
+            prefix = "," if self.num_edges else ""
+            self._emit(prefix + record)
+        self.num_edges += 1
+
+    def flush(self):
+        """
+        Write buffered records to disk.
+        """
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer = []
+
+    def close(self):
+        """
+        Write the metadata, flush remaining records and close the file.
+        """
+        if self._file is None:
+            return
+
+        metadata = dict(self.metadata)
+        metadata.setdefault("num_nodes", self.num_nodes)
+        metadata.setdefault("num_edges", self.num_edges)
+        record = json.dumps(metadata, separators=_SEPARATORS)
+
+        if self.layout == "ndjson":
+            self._emit('{"metadata":' + record + '}')
+        else:
+            self._start_section("edges")
+            self._emit('],"metadata":' + record + '}')
+
+        self.flush()
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def write_graph_streaming(graph, filename, layout="compact", compress=None):
+    """
+    Stream an existing graph (dictionary or CSRGraph) to disk.
+
+    CSRGraph inputs, such as those produced by the vectorised generator,
+    are written without ever building the full graph dictionary.
+
+    Args:
+        graph (dict or CSRGraph): Graph structure
+        filename (str): Output filename
+        layout (str): "compact" or "ndjson"
+        compress (bool): Gzip the output (default: by ".gz" extension)
+    """
+    with GraphWriter(filename, layout, compress) as writer:
+        if isinstance(graph, dict):
+            writer.metadata = graph.get("metadata", {})
+            for node in graph["nodes"].values():
+                writer.write_node(node)
+            for edge in graph["edges"]:
+                writer.write_edge(edge["source"], edge["target"], edge["weight"])
+        else:
+            writer.metadata = graph.metadata
+            node_ids, nodes = graph.node_ids, graph.nodes
+            for i in range(graph.num_nodes):
+                writer.write_node(nodes[i])
+            offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+            for i in range(graph.num_nodes):
+                source = node_ids[i]
+                for k in range(offsets[i], offsets[i + 1]):
+                    weight = weights[k]
+                    if weight == int(weight):
+                        weight = int(weight)
+                    writer.write_edge(source, node_ids[targets[k]], weight)
+
+    print(f"Graph saved to {filename}")
+
+
+class _ColumnBuilder:
+    """
+    Accumulate nodes and edges into compact arrays while a file is read.
+    """
+
+    def __init__(self):
+        self.node_ids = []
+        self.index = {}
+        self.node_columns = NodeColumnBuilder()
+        self.sources = array('i')
+        self.targets = array('i')
+        self.weights = array('d')
+        self.metadata = {}
+
+    def add_node(self, node_id, node):
+        """
+        Append one node's attributes to the columns.
+
+        Args:
+            node_id (str): Node ID
+            node (dict): Node data
+
+        Raises:
+            ValueError: If the node lacks an attribute or one has the wrong type
+        """
+        if not isinstance(node, dict):
+            raise ValueError(f"node '{node_id}' is not a JSON object")
+        try:
+            self.node_columns.add_node(node)
+        except ValueError as error:
+            raise ValueError(f"node '{node_id}': {error}") from None
+
+        self.index[node_id] = len(self.node_ids)
+        self.node_ids.append(node_id)
+
+    def add_edge(self, edge):
+        """
+        Append one edge to the edge arrays.
+
+        Args:
+            edge (dict): Edge data with source, target and weight
+
+        Raises:
+            ValueError: If the edge is not an object with known source and
+                target nodes and a numeric weight
+        """
+        try:
+            source = self.index[edge["source"]]
+            target = self.index[edge["target"]]
+            self.weights.append(edge.get("weight", 1))
+        except KeyError as error:
+            if isinstance(edge, dict) and "source" in edge and "target" in edge:
+                raise ValueError(f"edge refers to unknown node {error}; "
+                                 "nodes must appear before edges") from None
+            raise ValueError(f"edge {edge!r} has no 'source' and 'target'") from None
+        except (TypeError, AttributeError):
+            raise ValueError(f"invalid edge {edge!r}") from None
+        self.sources.append(source)
+        self.targets.append(target)
+
+    def build(self):
+        """
+        Convert the accumulated arrays into a CSRGraph.
+
+        Returns:
+            CSRGraph: Column-backed graph
+        """
+        num_nodes = len(self.node_ids)
+        offsets, targets, weights = build_csr_arrays(num_nodes, self.sources,
+                                                     self.targets, self.weights)
+        # The edge-order arrays are no longer needed
+        self.sources = self.targets = self.weights = None
+
+        metadata = dict(self.metadata)
+        metadata.setdefault("num_nodes", num_nodes)
+        metadata.setdefault("num_edges", len(targets))
+
+        columns, categories, names = self.node_columns.build()
+        nodes = ColumnNodes(columns, categories, self.node_ids, names)
+        return CSRGraph(self.node_ids, offsets, targets, weights, nodes, metadata,
+                        columns=columns, categories=categories)
+
+
+class _JSONStream:
+    """
+    Minimal incremental reader for one large JSON document.
+
+    Whole values are decoded with json.JSONDecoder.raw_decode() from a
+    buffer that is refilled from the file as needed, so only one record is
+    held as Python objects at a time.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        """
+        Read more text into the buffer, dropping what was consumed.
+
+        Returns:
+            bool: False once the end of the file has been reached
+        """
+        if self.eof:
+            return False
+        chunk = self.file.read(READ_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+        Skip whitespace and return the next character without consuming it.
+
+        Returns:
+            str: Next character, or "" at the end of the file
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, characters):
+        """
+        Consume the next non-whitespace character, which must be in characters.
+
+        Args:
+            characters (str): Allowed characters
+
+        Returns:
+            str: The character consumed
+        """
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError(f"expected one of {characters!r} in graph file, "
+                             f"found {character!r}")
+        self.pos += 1
+        return character
+
+    def value(self):
+        """
+        Decode the next complete JSON value.
+
+        Returns:
+            object: Decoded value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and not isinstance(value, (dict, list, str)):
+                if self._fill():
+                    continue
+            self.pos = end
+            return value
+
+    def members(self, close):
+        """
+        Iterate over the items of an object or array being read.
+
+        Args:
+            close (str): "}" for objects or "]" for arrays
+
+        Yields:
+            str or object: The key of each object member (its value is read by
+            the caller), or each decoded array element
+        """
+        if self.peek() == close:
+            self.pos += 1
+            return
+        while True:
+            if close == "}":
+                key = self.value()
+                self.expect(":")
+                yield key
+            else:
+                yield self.value()
+            if self.expect("," + close) == close:
+                return
+
+    def elements(self):
+        """
+        Iterate over the elements of an array whose "[" has been consumed.
+
+        This is the hot path for the "edges" list, so whitespace skipping,
+        decoding and the separator check are done inline.
+
+        Yields:
+            object: Each decoded array element
+        """
+        if self.peek() == "]":
+            self.pos += 1
+            return
+
+        scan = self.decoder.raw_decode
+        skip = _WHITESPACE.match
+        while True:
+            buffer = self.buffer
+            try:
+                value, end = scan(buffer, skip(buffer, self.pos).end())
+                pos = skip(buffer, end).end()
+                separator = buffer[pos]
+            except (json.JSONDecodeError, IndexError):
+                # The element (or its separator) runs past the buffer
+                if self._fill():
+                    continue
+                raise ValueError("unexpected end of graph file") from None
+            self.pos = pos + 1
+            yield value
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"expected ',' or ']' in graph file, found {separator!r}")
+
+
+def _read_json_layout(file, builder):
+    """
+    Stream a graph in the JSON schema (pretty-printed or compact).
+
+    Args:
+        file: Text file object positioned at the start of the document
+        builder (_ColumnBuilder): Receives nodes, edges and metadata
+    """
+    stream = _JSONStream(file)
+    stream.expect("{")
+    for key in stream.members("}"):
+        if key == "nodes":
+            stream.expect("{")
+            for node_id in stream.members("}"):
+                builder.add_node(node_id, stream.value())
+        elif key == "edges":
+            stream.expect("[")
+            add_edge = builder.add_edge
+            for edge in stream.elements():
+                add_edge(edge)
+        elif key == "metadata":
+            builder.metadata = stream.value()
+        else:
+            stream.value()
+
+
+def _read_ndjson_layout(file, builder):
+    """
+    Stream a graph in the NDJSON layout written by GraphWriter.
+
+    Args:
+        file: Text file object
+        builder (_ColumnBuilder): Receives nodes, edges and metadata
+    """
+    for line in file:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError(f"record {record!r} is not a JSON object")
+        if "edge" in record:
+            builder.add_edge(record["edge"])
+        elif "node" in record:
+            node = record["node"]
+            if not isinstance(node, dict) or "id" not in node:
+                raise ValueError("node record without an 'id'")
+            builder.add_node(node["id"], node)
+        elif "metadata" in record:
+            builder.metadata = record["metadata"]
+
+
+def load_graph_streaming(filename, member=None):
+    """
+    Read a graph file incrementally into a column-backed CSRGraph.
+
+    Handles the pretty-printed JSON from graph_generator.py, the compact
+    and NDJSON layouts written by GraphWriter, gzip-compressed files and
+    members of a zip archive such as graphs.zip.
+
+    Args:
+        filename (str): Path to a graph file or zip archive
+        member (str): File inside the zip archive to read
+
+    Returns:
+        CSRGraph: Graph with CSR arrays and attribute columns
+
+    Raises:
+        FileNotFoundError: If the file (or archive member) does not exist
+        ValueError: If the file is not a valid graph file, or a compressed
+            file or archive is corrupt
+    """
+    name = member if member is not None else filename
+    if name.endswith(".gz"):
+        name = name[:-3]
+    read = _read_ndjson_layout if name.endswith(".ndjson") else _read_json_layout
+
+    builder = _ColumnBuilder()
+    try:
+        if member is not None:
+            with zipfile.ZipFile(filename) as archive:
+                try:
+                    raw = archive.open(member)
+                except KeyError:
+                    raise FileNotFoundError(f"'{member}' not found in '{filename}'") from None
+                with io.TextIOWrapper(raw, encoding="utf-8") as file:
+                    read(file, builder)
+        else:
+            with open_text(filename, "r") as file:
+                read(file, builder)
+    except (gzip.BadGzipFile, zipfile.BadZipFile, EOFError, zlib.error) as error:
+        raise ValueError(f"corrupt compressed data: {error}") from None
+
+    csr = builder.build()
+    # Derived files (such as indexes) live next to the graph file itself
+    csr.source_file = member if member is not None else filename
+    return csr
+
+
+def load_named_graph(graph_size):
+    """
+    Load graph_<size> from the fastest available source.
+
+    Prefers graph_<size>.gbin (memory-mapped), then graph_<size>.json, and
+    finally the graph_<size>.json member of graphs.zip, so the archive
+    does not need to be extracted. A .gbin file older than the JSON file
+    next to it was converted from an earlier graph and is not used.
+
+    Args:
+        graph_size (str): small, medium or large
+
+    Returns:
+        CSRGraph: Loaded graph
+
+    Raises:
+        FileNotFoundError: If no source for the graph exists
+        ValueError: If the graph file is not valid
+    """
+    filename = f"graph_{graph_size}.json"
+    binary_filename = binary_filename_for(filename)
+
+    if os.path.exists(binary_filename):
+        if (not os.path.exists(filename) or
+                os.path.getmtime(binary_filename) >= os.path.getmtime(filename)):
+            print(f"Loading graph from {binary_filename}...")
+            return load_graph_binary(binary_filename)
+        print(f"Ignoring {binary_filename}: it is older than {filename}")
+    if os.path.exists(filename) or not os.path.exists(GRAPH_ARCHIVE):
+        print(f"Loading graph from {filename}...")
+        return load_graph_streaming(filename)
+    print(f"Loading graph from {GRAPH_ARCHIVE} ({filename})...")
+    return load_graph_streaming(GRAPH_ARCHIVE, member=filename)
+
+
+def open_named_graph(graph_size):
+    """
+    Load graph_<size> for the search CLIs (see load_named_graph()).
+
+    Prints an error and exits if the graph cannot be read.
+
+    Args:
+        graph_size (str): small, medium or large
+
+    Returns:
+        CSRGraph: Loaded graph
+    """
+    filename = f"graph_{graph_size}.json"
+
+    try:
+        return load_named_graph(graph_size)
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found!")
+        print("Please run graph_generator.py first to create graph files.")
+        sys.exit(1)
+    except ValueError as error:
+        print(f"Error: File '{filename}' is not a valid graph file ({error})!")
+        sys.exit(1)
+
+
+def open_graph(graph):
+    """
+    Load a graph named on the command line by size or by file.
+
+    "small", "medium" and "large" are opened with open_named_graph();
+    anything else is read as a graph file (.gbin memory-mapped, otherwise
+    streamed). Prints an error and exits if the graph cannot be read.
+
+    Args:
+        graph (str): small, medium, large, or a graph file
+
+    Returns:
+        CSRGraph: Loaded graph
+    """
+    if graph.lower() in ("small", "medium", "large"):
+        return open_named_graph(graph.lower())
+
+    try:
+        if graph.endswith(BINARY_EXTENSION):
+            return load_graph_binary(graph)
+        return load_graph_streaming(graph)
+    except FileNotFoundError:
+        print(f"Error: File '{graph}' not found!")
+        sys.exit(1)
+    except ValueError as error:
+        print(f"Error: File '{graph}' is not a valid graph file ({error})!")
+        sys.exit(1)
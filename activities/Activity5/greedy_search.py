@@ -8,16 +8,25 @@ Greedy Best-First Search uses a heuristic function to prioritize which nodes
 to explore next, always choosing the node that appears closest to the goal.
 
 Usage:
-    python greedy_search.py <graph_size> <search_property> <search_value>
+    python greedy_search.py <graph_size> <search_property> <search_value> [--limit K]
+    python greedy_search.py <graph_size> "<criteria>" [--limit K]
+    python greedy_search.py ... --instrument FILE [--profile] [--trace-memory]
 
     graph_size: small, medium, or large
     search_property: type, region, capacity_min, priority
     search_value: value to search for
+    criteria: property=value terms combined with "and"/"or"
+    --limit K: stop after the first K matches
+    --instrument FILE: write phase timings and work counters as JSON
+        (see instrumentation.py)
 
 Examples:
     python greedy_search.py small type warehouse
     python greedy_search.py medium region north
     python greedy_search.py large capacity_min 3000
+    python greedy_search.py medium "region=north or region=south"
+    python greedy_search.py large priority 5 --limit 10
+    python greedy_search.py large priority 5 --instrument - --trace-memory
 
 Author: AI Course Materials
 Date: February 2026
@@ -28,6 +37,24 @@ import sys
 import time
 import heapq
 import math
+from collections import OrderedDict
+from itertools import islice
+
+from csr_graph import as_csr_graph, get_metadata, get_node
+from graph_stream import open_named_graph
+from instrumentation import instrumentation_from_args, write_report
+from node_columns import numeric_column
+from search_criteria import (INTEGER_PROPERTIES, Criterion, check_limit, compile_criteria,
+                             compile_or_report)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; heuristics fall back to pure Python
+    np = None
+
+
+# Maximum number of heuristic contexts kept alive between queries
+HEURISTIC_CACHE_SIZE = 16
 
 
 def load_graph(filename):
@@ -53,145 +80,198 @@ def load_graph(filename):
         sys.exit(1)
 
 
-def build_adjacency_list(graph):
+def calculate_heuristic(node, search_property, search_value, graph):
     """
-    Build adjacency list representation from graph data.
+    Calculate heuristic value for Greedy Best-First Search.
+
+    The heuristic estimates how "close" a node is to matching our search criteria.
+    Lower values indicate nodes that are more likely to lead to matching nodes.
+
+    Heuristic Design:
+    - For type/region: use spatial distance to center of matching nodes
+    - For capacity: use absolute difference from target capacity
+    - For priority: use absolute difference from target priority
+
+    The values for all nodes are computed once per query and cached (see
+    HeuristicContext); this looks up a single node.
 
     Args:
-        graph (dict): Graph structure
+        node (dict): Current node
+        search_property (str): Property being searched
+        search_value (str): Target value
+        graph (dict or CSRGraph): Full graph structure
 
     Returns:
-        dict: Adjacency list {node_id: [list of neighbor node_ids]}
+        float: Heuristic value (lower is better)
+
+    Raises:
+        ValueError: If the criteria are invalid
+    """
+    context = get_heuristic_context(graph, search_property, search_value)
+    return context.heuristic(as_csr_graph(graph).index_of(node["id"]))
+
+
+class HeuristicContext:
     """
-    adjacency_list = {node_id: [] for node_id in graph["nodes"].keys()}
+    Precomputed heuristic values for one (graph, criteria) query.
+
+    Rebuilding the centre of mass of all matching nodes every time a single
+    node is scored is quadratic. This class computes the centroid and
+    the parsed numeric target once, then scores every node in a single pass
+    (vectorised with NumPy when it is installed). Lookups during the search
+    are then a plain list access by integer node index.
+
+    Compound criteria (see search_criteria.py) use the spatial heuristic,
+    with the centroid of all nodes matching the combined criteria.
+
+    Attributes:
+        graph (dict or CSRGraph): Graph the values were computed for
+        search_property (str): Property being searched, or an expression
+        search_value (str): Target value (None for expressions)
+        criteria (Criterion or CompoundCriteria): Compiled criteria
+        target (int or None): Parsed numeric target for capacity/priority
+        centroid (tuple or None): (x, y) centre of mass of matching nodes
+        values (list): Heuristic value per node, by integer node index
+    """
+
+    def __init__(self, graph, search_property, search_value=None):
+        self.graph = graph
+        self.search_property = search_property
+        self.search_value = search_value
+        # Raises ValueError for invalid criteria
+        self.criteria = compile_criteria(search_property, search_value)
+        self.target = None
+        self.centroid = None
+
+        csr = as_csr_graph(graph)
+        criteria = self.criteria
+
+        if isinstance(criteria, Criterion) and criteria.search_property in INTEGER_PROPERTIES:
+            self.target = criteria.search_value
+            if criteria.search_property == "priority":
+                attribute, scale = "priority", 1000
+            else:
+                attribute, scale = "capacity", 1
+
+            column = numeric_column(csr, attribute)
+            if np is not None:
+                column = np.asarray(column, dtype=np.int64)
+                scores = (np.abs(column - self.target) * scale).tolist()
+            else:
+                scores = [abs(value - self.target) * scale for value in column]
+
+        else:
+            xs, ys = numeric_column(csr, "x"), numeric_column(csr, "y")
+            matching = criteria.mask(csr)
+
+            count = matching.count(1)
+            if count:
+                avg_x = sum(x for x, m in zip(xs, matching) if m) / count
+                avg_y = sum(y for y, m in zip(ys, matching) if m) / count
+                self.centroid = (avg_x, avg_y)
+            else:
+                # No matching nodes, use distance from origin
+                avg_x, avg_y = 0.0, 0.0
 
-    for edge in graph["edges"]:
-        source = edge["source"]
-        target = edge["target"]
-        adjacency_list[source].append(target)
+            if np is not None:
+                dx = np.asarray(xs, dtype=float) - avg_x
+                dy = np.asarray(ys, dtype=float) - avg_y
+                scores = np.sqrt(dx**2 + dy**2).tolist()
+            else:
+                scores = [math.sqrt((x - avg_x)**2 + (y - avg_y)**2)
+                          for x, y in zip(xs, ys)]
 
-    return adjacency_list
+        self.values = scores
 
+    def heuristic(self, index):
+        """
+        Return the precomputed heuristic value of a node.
 
-def matches_search_criteria(node, search_property, search_value):
+        Args:
+            index (int): Integer node index (see csr_graph.py)
+
+        Returns:
+            float: Heuristic value (lower is better)
+        """
+        return self.values[index]
+
+
+_heuristic_cache = OrderedDict()
+
+
+def get_heuristic_context(graph, search_property, search_value=None):
     """
-    Check if a node matches the search criteria.
+    Return the heuristic context for a query, building it on first use.
+
+    Contexts are cached per (graph, criteria) so repeated queries
+    against the same loaded graph reuse the precomputed values. They are
+    keyed on the graph's shared CSR form, so invalidating a graph (see
+    csr_graph.invalidate_graph) also retires its contexts. The cache keeps
+    at most HEURISTIC_CACHE_SIZE contexts, evicting the least recently
+    used one.
 
     Args:
-        node (dict): Node data
-        search_property (str): Property to search by
-        search_value (str): Value to match
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        search_property: Property being searched, expression or compiled criteria
+        search_value (str): Target value (None for expressions)
 
     Returns:
-        bool: True if node matches criteria
+        HeuristicContext: Precomputed heuristic values for the query
+
+    Raises:
+        ValueError: If the criteria are invalid
     """
-    if search_property == "type":
-        return node["type"] == search_value
+    csr = as_csr_graph(graph)
+    criteria = compile_criteria(search_property, search_value)
+    key = (id(csr), criteria.describe())
+    context = _heuristic_cache.get(key)
 
-    elif search_property == "region":
-        return node["region"] == search_value
+    # The context holds a reference to its graph, so an id() can only be
+    # reused by a different graph after the old context has been evicted
+    if context is not None and context.graph is csr:
+        _heuristic_cache.move_to_end(key)
+        return context
 
-    elif search_property == "capacity_min":
-        try:
-            min_capacity = int(search_value)
-            return node["capacity"] >= min_capacity
-        except ValueError:
-            print(f"Error: capacity_min requires an integer value")
-            return False
+    context = HeuristicContext(csr, criteria)
+    _heuristic_cache[key] = context
+    while len(_heuristic_cache) > HEURISTIC_CACHE_SIZE:
+        _heuristic_cache.popitem(last=False)
 
-    elif search_property == "capacity_max":
-        try:
-            max_capacity = int(search_value)
-            return node["capacity"] <= max_capacity
-        except ValueError:
-            print(f"Error: capacity_max requires an integer value")
-            return False
+    return context
 
-    elif search_property == "priority":
-        try:
-            priority = int(search_value)
-            return node["priority"] == priority
-        except ValueError:
-            print(f"Error: priority requires an integer value")
-            return False
 
-    else:
-        print(f"Error: Unknown search property '{search_property}'")
-        return False
+def clear_heuristic_cache():
+    """
+    Drop all cached heuristic contexts (e.g. after modifying a graph in place).
+    """
+    _heuristic_cache.clear()
 
 
-def calculate_heuristic(node, search_property, search_value, graph):
+def _query_arrays(csr, search_property, search_value):
     """
-    Calculate heuristic value for Greedy Best-First Search.
+    Compile the criteria and return the heuristic values and match mask.
 
-    The heuristic estimates how "close" a node is to matching our search criteria.
-    Lower values indicate nodes that are more likely to lead to matching nodes.
-
-    Heuristic Design:
-    - For type/region: use spatial distance to center of matching nodes
-    - For capacity: use absolute difference from target capacity
-    - For priority: use absolute difference from target priority
+    Invalid criteria are reported once and give a zero heuristic and no
+    matches, so the search still runs (and explores every node) as before.
 
     Args:
-        node (dict): Current node
-        search_property (str): Property being searched
-        search_value (str): Target value
-        graph (dict): Full graph structure
+        csr (CSRGraph): Graph
+        search_property: Property, expression or compiled criteria
+        search_value (str): Value to match (None for expressions)
 
     Returns:
-        float: Heuristic value (lower is better)
+        tuple: (heuristic, match) indexed by integer node index
     """
-
-    # If we're searching for categorical properties (type, region),
-    # use spatial proximity to guide search
-    if search_property in ["type", "region"]:
-        # Calculate center of mass for all matching nodes
-        matching_nodes = [
-            n for n in graph["nodes"].values()
-            if matches_search_criteria(n, search_property, search_value)
-        ]
-
-        if matching_nodes:
-            # Calculate average coordinates of matching nodes
-            avg_x = sum(n["coordinates"]["x"] for n in matching_nodes) / len(matching_nodes)
-            avg_y = sum(n["coordinates"]["y"] for n in matching_nodes) / len(matching_nodes)
-
-            # Calculate Euclidean distance from current node to this center
-            dx = node["coordinates"]["x"] - avg_x
-            dy = node["coordinates"]["y"] - avg_y
-            distance = math.sqrt(dx**2 + dy**2)
-
-            return distance
-        else:
-            # No matching nodes found yet, use distance from origin
-            return math.sqrt(
-                node["coordinates"]["x"]**2 +
-                node["coordinates"]["y"]**2
-            )
-
-    # For numerical properties (capacity, priority), use value difference
-    elif search_property == "capacity_min":
-        target_capacity = int(search_value)
-        # Lower heuristic for nodes closer to target capacity
-        return abs(node["capacity"] - target_capacity)
-
-    elif search_property == "capacity_max":
-        target_capacity = int(search_value)
-        return abs(node["capacity"] - target_capacity)
-
-    elif search_property == "priority":
-        target_priority = int(search_value)
-        # Multiply by 1000 to make priority differences more significant
-        return abs(node["priority"] - target_priority) * 1000
-
-    else:
-        # Default: no heuristic guidance
-        return 0
+    criteria = compile_or_report(search_property, search_value)
+    if criteria is None:
+        return [0] * csr.num_nodes, bytearray(csr.num_nodes)
+    return get_heuristic_context(csr, criteria).values, criteria.mask(csr)
 
 
-def greedy_search(graph, start_node_id, search_property, search_value):
+def iter_greedy_matches(graph, search_property, search_value=None, start_node_id=None,
+                        stats=None):
     """
-    Perform Greedy Best-First Search to find all nodes matching criteria.
+    Run Greedy Best-First Search and yield matching node IDs as they are found.
 
     Greedy Best-First Search Algorithm:
     1. Start from a given node
@@ -202,141 +282,178 @@ def greedy_search(graph, start_node_id, search_property, search_value):
     Unlike BFS which explores level-by-level, Greedy Best-First Search
     "greedily" pursues the most promising direction based on the heuristic.
 
-    Args:
-        graph (dict): Graph structure
-        start_node_id (str): Starting node ID
-        search_property (str): Property to search by
-        search_value (str): Value to match
+    Without a start node every node not reached yet starts a new search, so
+    all connected components are searched. Each node is discovered exactly
+    once (the visited bitmap is the deduplication), so matches are yielded
+    in discovery order without ever checking earlier results. The caller
+    can stop early, e.g. with itertools.islice(iter_greedy_matches(...), k).
 
-    Returns:
-        tuple: (found_nodes, nodes_explored, time_taken)
-            found_nodes (list): List of node IDs that match criteria
-            nodes_explored (int): Total number of nodes explored
-            time_taken (float): Time in seconds
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        search_property (str): Property to search by, a criteria expression
+            such as "type=hub and priority=5", or compiled criteria
+            (see search_criteria.py)
+        search_value (str): Value to match (None for expressions)
+        start_node_id (str): Starting node ID, or None for all components
+        stats (dict): Optional dict; "nodes_explored" and "edges_checked"
+            are kept up to date whenever a match is yielded and when the
+            search ends, together with "queued" (nodes still waiting in
+            the priority queue); "prepare_time" is set to the seconds spent on
+            graph conversion and criteria evaluation before traversing
+
+    Yields:
+        str: Node IDs that match criteria, in discovery order
     """
+    prepare_start = time.perf_counter()
 
-    start_time = time.time()
-
-    # Build adjacency list for efficient neighbor lookup
-    adjacency_list = build_adjacency_list(graph)
+    # Compact integer-indexed adjacency for efficient neighbor lookup
+    csr = as_csr_graph(graph)
+    offsets, targets, node_ids = csr.offsets, csr.targets, csr.node_ids
 
-    # Initialize Greedy Best-First Search data structures
-    # Priority queue: stores (heuristic_value, node_id)
-    # Python's heapq implements a min-heap (lowest value has highest priority)
-    start_node = graph["nodes"][start_node_id]
-    start_heuristic = calculate_heuristic(start_node, search_property, search_value, graph)
+    # Criteria are validated once; heuristic values and matches (match[i] is
+    # 1 if node i matches) are computed once per query, not once per node
+    heuristic, match = _query_arrays(csr, search_property, search_value)
 
-    priority_queue = [(start_heuristic, start_node_id)]
-    visited = set([start_node_id])  # Track visited nodes
-    found_nodes = []  # Nodes that match search criteria
-    nodes_explored = 0  # Counter for performance analysis
+    # Ties are broken by node ID order, as when node ID strings were queued
+    rank = csr.id_rank()
 
-    # Check if start node matches criteria
-    if matches_search_criteria(start_node, search_property, search_value):
-        found_nodes.append(start_node_id)
+    if stats is not None:
+        stats["prepare_time"] = time.perf_counter() - prepare_start
 
-    # Greedy Best-First Search main loop
-    while priority_queue:
-        # Get node with lowest heuristic value (most promising)
-        _, current_node_id = heapq.heappop(priority_queue)
-        nodes_explored += 1
-
-        # Get all neighbors of current node
-        neighbors = adjacency_list.get(current_node_id, [])
-
-        # Explore each neighbor
-        for neighbor_id in neighbors:
-            # Only visit if not already visited (prevents cycles)
-            if neighbor_id not in visited:
-                visited.add(neighbor_id)
-
-                # Calculate heuristic for this neighbor
-                neighbor_node = graph["nodes"][neighbor_id]
-                heuristic = calculate_heuristic(
-                    neighbor_node, search_property, search_value, graph
-                )
-
-                # Add to priority queue with its heuristic value
-                heapq.heappush(priority_queue, (heuristic, neighbor_id))
+    if start_node_id is None:
+        starts = range(csr.num_nodes)
+    else:
+        starts = (csr.index_of(start_node_id),)
 
-                # Check if neighbor matches search criteria
-                if matches_search_criteria(neighbor_node, search_property, search_value):
-                    found_nodes.append(neighbor_id)
+    visited = bytearray(csr.num_nodes)  # Track visited nodes (one byte per node)
+    nodes_explored = 0  # Counters for performance analysis
+    edges_checked = 0
 
-    end_time = time.time()
-    time_taken = end_time - start_time
+    for start in starts:
+        if visited[start]:
+            continue
 
-    return found_nodes, nodes_explored, time_taken
+        # Priority queue: stores (heuristic_value, tie_break, node_index)
+        # Python's heapq implements a min-heap (lowest value has highest priority)
+        priority_queue = [(heuristic[start], rank[start], start)]
+        visited[start] = 1
 
+        # Check if start node matches criteria
+        if match[start]:
+            if stats is not None:
+                stats["nodes_explored"] = nodes_explored
+                stats["edges_checked"] = edges_checked
+                stats["queued"] = len(priority_queue)
+            yield node_ids[start]
 
-def greedy_search_all_components(graph, search_property, search_value):
+        # Greedy Best-First Search main loop
+        while priority_queue:
+            # Get node with lowest heuristic value (most promising)
+            _, _, current = heapq.heappop(priority_queue)
+            nodes_explored += 1
+            first_edge, end_edge = offsets[current], offsets[current + 1]
+            edges_checked += end_edge - first_edge
+
+            # Explore each neighbor
+            for neighbor in targets[first_edge:end_edge]:
+                # Only visit if not already visited (prevents cycles)
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+
+                    # Add to priority queue with its heuristic value
+                    heapq.heappush(priority_queue,
+                                   (heuristic[neighbor], rank[neighbor], neighbor))
+
+                    # Check if neighbor matches search criteria
+                    if match[neighbor]:
+                        if stats is not None:
+                            stats["nodes_explored"] = nodes_explored
+                            stats["edges_checked"] = edges_checked
+                            stats["queued"] = len(priority_queue)
+                        yield node_ids[neighbor]
+
+    if stats is not None:
+        stats["nodes_explored"] = nodes_explored
+        stats["edges_checked"] = edges_checked
+        stats["queued"] = 0
+
+
+def greedy_search(graph, start_node_id, search_property, search_value, limit=None):
     """
-    Perform Greedy Best-First Search across all connected components.
+    Perform Greedy Best-First Search to find all nodes matching criteria.
 
-    This ensures we search the entire graph even if it's not fully connected.
+    The traversal runs on the integer-indexed CSR form of the graph (see
+    csr_graph.py); dictionary graphs are converted once and the CSR form
+    is reused by later searches on the same graph. See iter_greedy_matches()
+    for the algorithm and for streaming the matches one at a time.
 
     Args:
-        graph (dict): Graph structure
-        search_property (str): Property to search by
-        search_value (str): Value to match
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        start_node_id (str): Starting node ID
+        search_property (str): Property to search by, a criteria expression
+            such as "type=hub and priority=5", or compiled criteria
+            (see search_criteria.py)
+        search_value (str): Value to match (None for expressions)
+        limit (int): Stop after this many matches (None for all)
 
     Returns:
         tuple: (found_nodes, nodes_explored, time_taken)
+            found_nodes (list): List of node IDs that match criteria
+            nodes_explored (int): Total number of nodes explored
+            time_taken (float): Time in seconds
+
+    Raises:
+        ValueError: If limit is negative
     """
-    start_time = time.time()
+    check_limit(limit)
 
-    adjacency_list = build_adjacency_list(graph)
-    all_node_ids = list(graph["nodes"].keys())
+    start_time = time.time()
 
-    visited_global = set()
-    found_nodes = []
-    total_nodes_explored = 0
+    stats = {}
+    matches = iter_greedy_matches(graph, search_property, search_value,
+                                  start_node_id=start_node_id, stats=stats)
+    found_nodes = list(islice(matches, limit))
 
-    # Iterate through all nodes to handle disconnected components
-    for start_node_id in all_node_ids:
-        if start_node_id in visited_global:
-            continue
+    end_time = time.time()
+    time_taken = end_time - start_time
 
-        # Greedy Best-First Search from this starting node
-        start_node = graph["nodes"][start_node_id]
-        start_heuristic = calculate_heuristic(
-            start_node, search_property, search_value, graph
-        )
+    return found_nodes, stats.get("nodes_explored", 0), time_taken
 
-        priority_queue = [(start_heuristic, start_node_id)]
-        visited_global.add(start_node_id)
 
-        # Check start node
-        if matches_search_criteria(start_node, search_property, search_value):
-            if start_node_id not in found_nodes:
-                found_nodes.append(start_node_id)
+def greedy_search_all_components(graph, search_property, search_value, limit=None,
+                                 stats=None):
+    """
+    Perform Greedy Best-First Search across all connected components.
 
-        # Greedy search loop
-        while priority_queue:
-            _, current_node_id = heapq.heappop(priority_queue)
-            total_nodes_explored += 1
+    This ensures we search the entire graph even if it's not fully connected.
 
-            neighbors = adjacency_list.get(current_node_id, [])
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        search_property (str): Property to search by, or a criteria expression
+        search_value (str): Value to match (None for expressions)
+        limit (int): Stop after this many matches (None for all)
+        stats (dict): Optional dict to receive the search statistics
+            (see iter_greedy_matches())
 
-            for neighbor_id in neighbors:
-                if neighbor_id not in visited_global:
-                    visited_global.add(neighbor_id)
+    Returns:
+        tuple: (found_nodes, nodes_explored, time_taken)
 
-                    neighbor_node = graph["nodes"][neighbor_id]
-                    heuristic = calculate_heuristic(
-                        neighbor_node, search_property, search_value, graph
-                    )
+    Raises:
+        ValueError: If limit is negative
+    """
+    check_limit(limit)
 
-                    heapq.heappush(priority_queue, (heuristic, neighbor_id))
+    start_time = time.time()
 
-                    if matches_search_criteria(neighbor_node, search_property, search_value):
-                        if neighbor_id not in found_nodes:
-                            found_nodes.append(neighbor_id)
+    if stats is None:
+        stats = {}
+    matches = iter_greedy_matches(graph, search_property, search_value, stats=stats)
+    found_nodes = list(islice(matches, limit))
 
     end_time = time.time()
     time_taken = end_time - start_time
 
-    return found_nodes, total_nodes_explored, time_taken
+    return found_nodes, stats.get("nodes_explored", 0), time_taken
 
 
 def display_results(found_nodes, nodes_explored, time_taken, graph, search_property, search_value):
@@ -347,16 +464,20 @@ def display_results(found_nodes, nodes_explored, time_taken, graph, search_prope
         found_nodes (list): Node IDs that match criteria
         nodes_explored (int): Total nodes explored
         time_taken (float): Time in seconds
-        graph (dict): Graph structure
-        search_property (str): Property searched
-        search_value (str): Value searched for
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        search_property (str): Property searched, or a criteria expression
+        search_value (str): Value searched for (None for expressions)
     """
     print("\n" + "="*70)
     print("GREEDY BEST-FIRST SEARCH RESULTS")
     print("="*70)
-    print(f"Graph: {graph['metadata']['graph_type']} ({graph['metadata']['num_nodes']} nodes)")
-    print(f"Search Property: {search_property}")
-    print(f"Search Value: {search_value}")
+    metadata = get_metadata(graph)
+    print(f"Graph: {metadata['graph_type']} ({metadata['num_nodes']} nodes)")
+    if search_value is None:
+        print(f"Search Criteria: {search_property}")
+    else:
+        print(f"Search Property: {search_property}")
+        print(f"Search Value: {search_value}")
     print(f"Nodes Explored: {nodes_explored}")
     print(f"Nodes Found: {len(found_nodes)}")
     print(f"Time Taken: {time_taken:.6f} seconds")
@@ -367,7 +488,7 @@ def display_results(found_nodes, nodes_explored, time_taken, graph, search_prope
         # Display first 10 matches
         display_limit = min(10, len(found_nodes))
         for i, node_id in enumerate(found_nodes[:display_limit]):
-            node = graph["nodes"][node_id]
+            node = get_node(graph, node_id)
             print(f"  {i+1}. {node['name']} (ID: {node_id})")
             print(f"      Type: {node['type']}, Region: {node['region']}, " +
                   f"Capacity: {node['capacity']}, Priority: {node['priority']}")
@@ -385,25 +506,50 @@ def main():
     Main function to run Greedy Best-First Search from command line.
     """
     # Check command line arguments
-    if len(sys.argv) != 4:
-        print("Usage: python greedy_search.py <graph_size> <search_property> <search_value>")
+    args = sys.argv[1:]
+    instrumentation, instrument_output = instrumentation_from_args(args)
+    limit = None
+    if "--limit" in args:
+        position = args.index("--limit")
+        try:
+            limit = int(args[position + 1])
+        except (IndexError, ValueError):
+            limit = -1
+        if limit < 0:
+            print("Error: --limit requires a non-negative integer value")
+            sys.exit(1)
+        del args[position:position + 2]
+
+    if len(args) not in (2, 3):
+        print("Usage: python greedy_search.py <graph_size> <search_property> <search_value> [--limit K]")
+        print("       python greedy_search.py <graph_size> \"<criteria>\" [--limit K]")
         print()
         print("Arguments:")
         print("  graph_size: small, medium, or large")
         print("  search_property: type, region, capacity_min, capacity_max, or priority")
         print("  search_value: value to search for")
+        print("  criteria: property=value terms combined with \"and\"/\"or\"")
+        print("  --limit K: stop after the first K matches")
+        print("  --instrument FILE: write phase timings and work counters as JSON (- for stdout)")
+        print("  --profile / --trace-memory: add cProfile / tracemalloc data to the JSON")
         print()
         print("Examples:")
         print("  python greedy_search.py small type warehouse")
         print("  python greedy_search.py medium region north")
         print("  python greedy_search.py large capacity_min 3000")
         print("  python greedy_search.py small priority 5")
+        print("  python greedy_search.py medium \"region=north or region=south\"")
+        print("  python greedy_search.py large priority 5 --limit 10")
         sys.exit(1)
 
     # Parse arguments
-    graph_size = sys.argv[1].lower()
-    search_property = sys.argv[2].lower()
-    search_value = sys.argv[3]
+    graph_size = args[0].lower()
+    if len(args) == 3:
+        search_property = args[1].lower()
+        search_value = args[2]
+    else:
+        search_property = args[1]
+        search_value = None
 
     # Validate graph size
     if graph_size not in ["small", "medium", "large"]:
@@ -411,24 +557,49 @@ def main():
         print("Valid options: small, medium, large")
         sys.exit(1)
 
-    # Determine filename
-    filename = f"graph_{graph_size}.json"
+    # Validate the search criteria before loading the graph
+    try:
+        compile_criteria(search_property, search_value)
+    except ValueError as error:
+        print(f"Error: {error}")
+        sys.exit(1)
+
+    instrumentation.start()
 
-    # Load graph
-    print(f"Loading graph from {filename}...")
-    graph = load_graph(filename)
-    print(f"Loaded graph with {graph['metadata']['num_nodes']} nodes " +
-          f"and {graph['metadata']['num_edges']} edges")
+    # Load graph (memory-mapped .gbin if present, else streamed from JSON or graphs.zip)
+    with instrumentation.phase("load"):
+        graph = open_named_graph(graph_size)
+        csr = as_csr_graph(graph)
+    metadata = get_metadata(graph)
+    print(f"Loaded graph with {metadata['num_nodes']} nodes " +
+          f"and {metadata['num_edges']} edges")
 
     # Perform Greedy Best-First Search across all components
-    print(f"\nSearching for nodes where {search_property} = {search_value}...")
+    if search_value is None:
+        print(f"\nSearching for nodes where {search_property}...")
+    else:
+        print(f"\nSearching for nodes where {search_property} = {search_value}...")
     print("Using Greedy Best-First Search with heuristic guidance...")
-    found_nodes, nodes_explored, time_taken = greedy_search_all_components(
-        graph, search_property, search_value
-    )
+    stats = {}
+    with instrumentation.phase("traverse"):
+        found_nodes, nodes_explored, time_taken = greedy_search_all_components(
+            graph, search_property, search_value, limit=limit, stats=stats
+        )
+    instrumentation.record_search(stats, csr.num_nodes, heuristic=True)
 
     # Display results
-    display_results(found_nodes, nodes_explored, time_taken, graph, search_property, search_value)
+    with instrumentation.phase("display"):
+        display_results(found_nodes, nodes_explored, time_taken, graph, search_property, search_value)
+
+    if instrumentation.enabled:
+        instrumentation.stop()
+        report = instrumentation.report(
+            script="greedy_search.py", algorithm="greedy",
+            graph=graph_size, nodes=csr.num_nodes, edges=csr.num_edges,
+            criteria=compile_criteria(search_property, search_value).describe(),
+            limit=limit, found=len(found_nodes)
+        )
+        write_report(report, instrument_output)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,299 @@
+"""
+Search Instrumentation
+======================
+This module measures where bfs_search.py and greedy_search.py spend their
+time and how much work their loops do, and writes the measurements as JSON.
+
+Instrumentation is opt-in (--instrument on the command line). When it is
+off, the scripts only pass through no-op phase blocks; the search loops
+carry no counters either way. The iterators already record the nodes
+explored and edges checked whenever they hand out a match, together with
+the number of nodes still queued and the time spent preparing the query,
+and every other count follows from those because each node is queued at
+most once:
+
+    queue pushes           nodes explored + nodes still queued
+    queue pops             nodes explored
+    match checks           one mask lookup per queued node
+    heuristic lookups      one per priority-queue push (greedy only)
+    predicate evaluations  one per node, when the match mask is built
+    heuristic evaluations  one per node, when the heuristic context is built
+
+Phases are timed with time.perf_counter_ns(): load (open the graph in its
+CSR form), prepare (criteria mask and heuristic values), traverse and
+display. --profile adds the functions with the highest cumulative
+time from cProfile, and --trace-memory adds the peak traced memory per
+phase and the largest allocation sites from tracemalloc. Both slow the
+run down, so their timings are only comparable with other profiled runs.
+
+Usage:
+    python bfs_search.py <graph_size> <criteria ...> --instrument FILE [--profile] [--trace-memory]
+    python greedy_search.py <graph_size> <criteria ...> --instrument FILE [--profile] [--trace-memory]
+
+    FILE: JSON output file, or - to print the JSON after the results
+
+Examples:
+    python bfs_search.py large type warehouse --instrument bfs.json
+    python greedy_search.py large priority 5 --instrument - --profile --trace-memory
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+REPORT_VERSION = 1
+
+# Entries kept from the profile and from the allocation sites
+PROFILE_TOP = 25
+MEMORY_TOP = 10
+
+
+class Instrumentation:
+    """
+    Phase timers, counters and optional profiling for one script run.
+
+    A disabled instance accepts the same calls and records nothing, so the
+    scripts use one code path whether instrumentation is on or off.
+
+    Attributes:
+        enabled (bool): Whether anything is recorded
+        phases (dict): Seconds per phase, in the order the phases ran
+        counters (dict): Work counters (see search_counters())
+        profiler (cProfile.Profile or None): Profiler while --profile is on
+        trace_memory (bool): Whether tracemalloc is used
+    """
+
+    def __init__(self, enabled=True, profile=False, trace_memory=False):
+        self.enabled = enabled
+        self.phases = {}
+        self.phase_memory = {}
+        self.counters = {}
+        self.profiler = cProfile.Profile() if enabled and profile else None
+        self.trace_memory = enabled and trace_memory
+        self._peak_memory = 0
+        self._snapshot = None
+
+    def start(self):
+        """
+        Start the profiler and memory tracing, if requested.
+        """
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    def stop(self):
+        """
+        Stop the profiler and memory tracing, keeping what they captured.
+        """
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.trace_memory and tracemalloc.is_tracing():
+            self._peak_memory = tracemalloc.get_traced_memory()[1]
+            self._snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a block of code as one phase.
+
+        Args:
+            name (str): Phase name; repeated phases are added up
+        """
+        if not self.enabled:
+            yield
+            return
+
+        if self.trace_memory:
+            self._peak_memory = max(self._peak_memory, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter_ns() - start) / 1e9
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                self.phase_memory[name] = max(self.phase_memory.get(name, 0), peak)
+
+    def record_search(self, stats, num_nodes, heuristic=False):
+        """
+        Split the timed "traverse" phase into prepare and traverse, and add its counters.
+
+        The search functions evaluate the criteria (and heuristic) before
+        their loop starts; stats["prepare_time"] moves that part of the
+        phase into "prepare".
+
+        Args:
+            stats (dict): Statistics filled in by iter_bfs_matches() or
+                iter_greedy_matches()
+            num_nodes (int): Nodes in the graph
+            heuristic (bool): Whether the search used heuristic values
+        """
+        if not self.enabled:
+            return
+        search_time = self.phases.pop("traverse", 0.0)
+        prepare_time = min(stats.get("prepare_time", 0.0), search_time)
+        self.phases["prepare"] = prepare_time
+        self.phases["traverse"] = search_time - prepare_time
+        if "traverse" in self.phase_memory:
+            # Tracing cannot tell the two apart; both report the peak of the search
+            peak = self.phase_memory.pop("traverse")
+            self.phase_memory["prepare"] = self.phase_memory["traverse"] = peak
+        self.counters.update(search_counters(stats, num_nodes, heuristic))
+
+    def report(self, **context):
+        """
+        Return everything recorded as a JSON-serialisable dictionary.
+
+        Args:
+            **context: Fields describing the run (script, graph, query, ...)
+
+        Returns:
+            dict: Report with phases, counters and any profile or memory data
+        """
+        report = {"version": REPORT_VERSION}
+        report.update(context)
+        report["phases"] = dict(self.phases)
+        report["total_time"] = sum(self.phases.values())
+        report["counters"] = dict(self.counters)
+        if self._snapshot is not None:
+            report["memory"] = {
+                "peak_bytes": max([self._peak_memory, *self.phase_memory.values()]),
+                "phase_peak_bytes": dict(self.phase_memory),
+                "top_allocations": _allocation_sites(self._snapshot)
+            }
+        if self.profiler is not None:
+            report["profile"] = _profile_rows(self.profiler)
+        return report
+
+
+def search_counters(stats, num_nodes, heuristic=False):
+    """
+    Derive the work counters of a search from its statistics.
+
+    Args:
+        stats (dict): Statistics filled in by iter_bfs_matches() or
+            iter_greedy_matches()
+        num_nodes (int): Nodes in the graph
+        heuristic (bool): Whether the search used heuristic values
+
+    Returns:
+        dict: Counter name -> count
+    """
+    explored = stats.get("nodes_explored", 0)
+    pushes = explored + stats.get("queued", 0)
+    counters = {
+        "nodes_explored": explored,
+        "edges_scanned": stats.get("edges_checked", 0),
+        "queue_pushes": pushes,
+        "queue_pops": explored,
+        "match_checks": pushes,
+        "predicate_evaluations": num_nodes
+    }
+    if heuristic:
+        counters["heuristic_lookups"] = pushes
+        counters["heuristic_evaluations"] = num_nodes
+    return counters
+
+
+def _profile_rows(profiler):
+    """
+    Return the functions with the highest cumulative time in a profile.
+
+    Args:
+        profiler (cProfile.Profile): Stopped profiler
+
+    Returns:
+        list: Dictionaries with function, calls and times, most expensive first
+    """
+    entries = pstats.Stats(profiler).stats
+    ranked = sorted(entries.items(), key=lambda item: item[1][3], reverse=True)
+    rows = []
+    for (filename, line, function), (primitive, calls, total, cumulative, _) in ranked[:PROFILE_TOP]:
+        location = f"{os.path.basename(filename)}:{line}" if line else "built-in"
+        rows.append({"function": function, "location": location, "calls": calls,
+                     "primitive_calls": primitive, "total_time": total,
+                     "cumulative_time": cumulative})
+    return rows
+
+
+def _allocation_sites(snapshot):
+    """
+    Return the source lines holding the most traced memory.
+
+    Args:
+        snapshot (tracemalloc.Snapshot): Snapshot taken at the end of the run
+
+    Returns:
+        list: Dictionaries with location, size and allocation count
+    """
+    rows = []
+    for statistic in snapshot.statistics("lineno")[:MEMORY_TOP]:
+        frame = statistic.traceback[0]
+        rows.append({"location": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                     "size_bytes": statistic.size, "count": statistic.count})
+    return rows
+
+
+def instrumentation_from_args(args):
+    """
+    Remove the instrumentation options from a command line.
+
+    Exits with an error message if they are used incorrectly.
+
+    Args:
+        args (list): Command-line arguments, modified in place
+
+    Returns:
+        tuple: (Instrumentation, output filename or None when disabled)
+    """
+    output = None
+    if "--instrument" in args:
+        position = args.index("--instrument")
+        if position + 1 >= len(args):
+            print("Error: --instrument requires an output file (or - for standard output)")
+            sys.exit(1)
+        output = args[position + 1]
+        del args[position:position + 2]
+
+    flags = {}
+    for flag in ("--profile", "--trace-memory"):
+        flags[flag] = flag in args
+        if flags[flag]:
+            args.remove(flag)
+            if output is None:
+                print(f"Error: {flag} requires --instrument FILE")
+                sys.exit(1)
+
+    instrumentation = Instrumentation(enabled=output is not None,
+                                      profile=flags["--profile"],
+                                      trace_memory=flags["--trace-memory"])
+    return instrumentation, output
+
+
+def write_report(report, filename):
+    """
+    Write an instrumentation report as JSON.
+
+    Args:
+        report (dict): Output of Instrumentation.report()
+        filename (str): Output file, or - for standard output
+    """
+    if filename == "-":
+        print(json.dumps(report, indent=2))
+        return
+    with open(filename, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Instrumentation written to {filename}")
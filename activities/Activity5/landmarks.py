@@ -0,0 +1,417 @@
+"""
+Landmark (ALT) Preprocessing for Route Queries
+==============================================
+This module speeds up repeated point-to-point route queries on a graph that
+rarely changes, using A* with landmarks and the triangle inequality (ALT).
+
+The Euclidean A* bound (see shortest_path.py) is weak on the generated
+graphs because edge weights are noisy and rounded. ALT instead picks a few
+landmark nodes L and precomputes, for every node v, the exact route costs
+d(L, v) and d(v, L). For any target t the triangle inequality gives
+
+    d(v, t) >= d(L, t) - d(L, v)
+    d(v, t) >= d(v, L) - d(t, L)
+
+and the largest of these over all landmarks is an admissible, consistent
+A* heuristic. Landmarks are chosen far apart (farthest-point selection),
+so that every route has some landmark roughly "behind" it.
+
+The distance arrays are persisted next to the graph file (graph_large.alt)
+and memory-mapped when loaded again.
+
+Usage:
+    python landmarks.py <graph_file> [--landmarks K]
+
+Examples:
+    python landmarks.py graph_large.json
+    python landmarks.py graph_large.gbin --landmarks 8
+
+Route queries with the landmarks:
+    python route_search.py large node_12 node_9876 --alt --compare
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import heapq
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+
+from csr_graph import as_csr_graph
+from graph_binary import BINARY_EXTENSION, load_graph_binary
+from graph_stream import load_graph_streaming
+from shortest_path import dijkstra_costs
+
+
+MAGIC = b"ALTLMKS\0"
+FORMAT_VERSION = 1
+LANDMARK_EXTENSION = ".alt"
+DEFAULT_LANDMARKS = 16
+
+_PREAMBLE = struct.Struct("<8sII")
+
+
+def csr_fingerprint(csr):
+    """
+    Summarise a graph's edges to detect stale landmark files.
+
+    Args:
+        csr (CSRGraph): Graph
+
+    Returns:
+        dict: num_nodes, num_edges and a CRC32 of the CSR arrays
+    """
+    checksum = 0
+    for column in (csr.offsets, csr.targets, csr.weights):
+        checksum = zlib.crc32(column, checksum)
+    return {"num_nodes": csr.num_nodes, "num_edges": csr.num_edges, "checksum": checksum}
+
+
+def select_landmarks(csr, count):
+    """
+    Choose landmarks by farthest-point selection and compute their distances.
+
+    Distances are round trips, d(L, v) + d(v, L), since the graph is
+    directed. The first landmark is the node farthest from node 0; each
+    further one is the node farthest from all landmarks chosen so far (or a
+    node without a round trip to any of them, if there is one).
+
+    Args:
+        csr (CSRGraph): Graph
+        count (int): Number of landmarks
+
+    Returns:
+        tuple: (landmarks, forward, backward)
+            landmarks (list): Landmark node indices
+            forward (list): Per landmark, cost from the landmark to each node
+            backward (list): Per landmark, cost from each node to the landmark
+    """
+    reverse = csr.reverse()
+    landmarks, forward, backward = [], [], []
+    chosen = bytearray(csr.num_nodes)
+    sources = [0] if csr.num_nodes else []
+
+    while len(landmarks) < min(count, csr.num_nodes):
+        # Round-trip cost from the nearest landmark (node 0 at first)
+        costs = map(sum, zip(dijkstra_costs(csr, sources), dijkstra_costs(reverse, sources)))
+        candidate, farthest = None, -1.0
+        for i, cost in enumerate(costs):
+            if chosen[i]:
+                continue
+            if cost == math.inf:
+                candidate = i
+                break
+            if cost > farthest:
+                candidate, farthest = i, cost
+
+        chosen[candidate] = 1
+        landmarks.append(candidate)
+        forward.append(dijkstra_costs(csr, [candidate]))
+        backward.append(dijkstra_costs(reverse, [candidate]))
+        sources = landmarks
+
+    return landmarks, forward, backward
+
+
+class LandmarkIndex:
+    """
+    Landmark distance arrays for ALT lower bounds.
+
+    Attributes:
+        landmarks (list): Landmark node indices
+        forward (list): Per landmark, 'd' array of d(landmark, v)
+        backward (list): Per landmark, 'd' array of d(v, landmark)
+        fingerprint (dict): Fingerprint of the graph the index was built for
+    """
+
+    def __init__(self, landmarks, forward, backward, fingerprint):
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, graph, count=DEFAULT_LANDMARKS):
+        """
+        Select landmarks and compute their distance arrays.
+
+        Costs four Dijkstra runs per landmark: two to pick it, two for its
+        distance arrays.
+
+        Args:
+            graph (dict, CSRGraph or GraphHandle): Graph structure
+            count (int): Number of landmarks
+
+        Returns:
+            LandmarkIndex: Index for the graph
+        """
+        csr = as_csr_graph(graph)
+        landmarks, forward, backward = select_landmarks(csr, count)
+        return cls(landmarks, forward, backward, csr_fingerprint(csr))
+
+    def lower_bound_to(self, target):
+        """
+        Return an ALT heuristic towards one target node.
+
+        Args:
+            target (int): Integer index of the target node
+
+        Returns:
+            callable: h(v) -> lower bound on the cost from v to the target;
+                inf when the landmarks prove v cannot reach the target
+        """
+        terms = [(forward, backward, forward[target], backward[target])
+                 for forward, backward in zip(self.forward, self.backward)]
+
+        def lower_bound(index):
+            best = 0.0
+            for forward, backward, to_target, from_target in terms:
+                # d(L,t) - d(L,v) and d(v,L) - d(t,L); inf - inf is nan and
+                # never compares greater, so unknown terms are skipped
+                bound = to_target - forward[index]
+                if bound > best:
+                    best = bound
+                bound = backward[index] - from_target
+                if bound > best:
+                    best = bound
+            return best
+
+        return lower_bound
+
+    def save(self, filename):
+        """
+        Write the landmarks and distance arrays to a memory-mappable file.
+
+        Args:
+            filename (str): Output filename (usually *.alt)
+        """
+        header = json.dumps({
+            "byteorder": sys.byteorder,
+            "fingerprint": self.fingerprint,
+            "landmarks": self.landmarks
+        }).encode("utf-8")
+        header += b" " * (-(_PREAMBLE.size + len(header)) % 8)
+
+        with open(filename, 'wb') as f:
+            f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+            f.write(header)
+            for costs in self.forward + self.backward:
+                f.write(costs.tobytes())
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Memory-map a landmark file written by save().
+
+        Args:
+            filename (str): Landmark filename
+
+        Returns:
+            LandmarkIndex: Index backed by the mapped file
+
+        Raises:
+            ValueError: If the file is not a supported landmark file
+        """
+        with open(filename, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_length = _PREAMBLE.unpack_from(mapped, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"'{filename}' is not a supported landmark file")
+        header = json.loads(bytes(mapped[_PREAMBLE.size:_PREAMBLE.size + header_length]))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"'{filename}' was written on a {header['byteorder']}-endian machine")
+
+        data = memoryview(mapped)[_PREAMBLE.size + header_length:].cast('d')
+        n, count = header["fingerprint"]["num_nodes"], len(header["landmarks"])
+        arrays = [data[i * n:(i + 1) * n] for i in range(2 * count)]
+        return cls(header["landmarks"], arrays[:count], arrays[count:], header["fingerprint"])
+
+
+def landmark_filename_for(filename):
+    """
+    Return the landmark filename that belongs next to a graph file.
+
+    Args:
+        filename (str): Graph file such as "graph_large.json"
+
+    Returns:
+        str: Landmark file such as "graph_large.alt"
+    """
+    return os.path.splitext(filename)[0] + LANDMARK_EXTENSION
+
+
+def _load_or_build(csr, save=False):
+    """
+    Load the persisted landmarks for a graph if they are current, else build them.
+
+    Args:
+        csr (CSRGraph): Graph
+        save (bool): Write newly built landmarks next to the graph's source file
+
+    Returns:
+        LandmarkIndex: Landmarks for the graph
+    """
+    if csr.source_file is None:
+        return LandmarkIndex.build(csr)
+
+    landmark_file = landmark_filename_for(csr.source_file)
+    if os.path.exists(landmark_file):
+        try:
+            index = LandmarkIndex.load(landmark_file)
+        except ValueError:
+            index = None
+        if index is not None and index.fingerprint == csr_fingerprint(csr):
+            return index
+
+    index = LandmarkIndex.build(csr)
+    if save:
+        try:
+            index.save(landmark_file)
+            print(f"Landmarks saved to {landmark_file}")
+        except OSError as error:
+            print(f"Warning: could not save landmarks to {landmark_file} ({error})")
+    return index
+
+
+def get_landmark_index(graph, save=False):
+    """
+    Return the landmarks of a graph, loading or building them once.
+
+    The index is kept with the graph's shared CSR form (see csr_graph.py),
+    so later queries reuse it until the graph is invalidated. A persisted
+    .alt file next to the graph's source file is used when its fingerprint
+    still matches; with save=True, landmarks that had to be built are
+    written to that file so the next run loads them.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        save (bool): Persist newly built landmarks to the .alt file
+
+    Returns:
+        LandmarkIndex: Landmarks for the graph
+    """
+    return as_csr_graph(graph).derived_structure(
+        "landmark_index", lambda csr: _load_or_build(csr, save))
+
+
+def alt_route(graph, source_node_id, target_node_id):
+    """
+    Find the lowest-cost route with A* guided by landmark lower bounds.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        source_node_id (str): Node to route from
+        target_node_id (str): Node to route to
+
+    Returns:
+        tuple: (path, cost, nodes_settled, time_taken)
+            path (list): Node IDs from source to target (empty if unreachable)
+            cost (float or None): Total edge weight of the path
+            nodes_settled (int): Nodes settled by the search
+            time_taken (float): Time in seconds
+    """
+    start_time = time.time()
+
+    csr = as_csr_graph(graph)
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    source, target = csr.index_of(source_node_id), csr.index_of(target_node_id)
+    lower_bound = get_landmark_index(csr).lower_bound_to(target)
+
+    cost = {source: 0.0}
+    parent = {source: -1}
+    estimate = {source: lower_bound(source)}  # Lower bound per reached node
+    settled = set()
+    frontier = [(estimate[source], estimate[source], source)] if estimate[source] < math.inf else []
+
+    while frontier:
+        # Ties on cost + bound go to the node with the smaller bound
+        _, _, current = heapq.heappop(frontier)
+        if current in settled:
+            continue
+        settled.add(current)
+        if current == target:
+            break
+
+        current_cost = cost[current]
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[k]
+            new_cost = current_cost + weights[k]
+            if new_cost < cost.get(neighbor, math.inf):
+                bound = estimate.get(neighbor)
+                if bound is None:
+                    bound = estimate[neighbor] = lower_bound(neighbor)
+                # The landmarks prove the target is unreachable from here
+                if bound == math.inf:
+                    continue
+                cost[neighbor] = new_cost
+                parent[neighbor] = current
+                heapq.heappush(frontier, (new_cost + bound, bound, neighbor))
+
+    path = []
+    if target in settled:
+        index = target
+        while index != -1:
+            path.append(csr.node_ids[index])
+            index = parent[index]
+        path.reverse()
+
+    end_time = time.time()
+    return path, (cost[target] if path else None), len(settled), end_time - start_time
+
+
+def main():
+    """
+    Select landmarks for a graph file and save them next to the graph.
+    """
+    args = sys.argv[1:]
+    count = DEFAULT_LANDMARKS
+    if "--landmarks" in args:
+        position = args.index("--landmarks")
+        try:
+            count = int(args[position + 1])
+        except (IndexError, ValueError):
+            print("Error: --landmarks requires an integer value")
+            sys.exit(1)
+        del args[position:position + 2]
+
+    if len(args) != 1:
+        print("Usage: python landmarks.py <graph_file> [--landmarks K]")
+        print()
+        print("Examples:")
+        print("  python landmarks.py graph_large.json")
+        print("  python landmarks.py graph_large.gbin --landmarks 8")
+        sys.exit(1)
+
+    filename = args[0]
+    try:
+        if filename.endswith(BINARY_EXTENSION):
+            csr = load_graph_binary(filename)
+        else:
+            csr = load_graph_streaming(filename)
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found!")
+        sys.exit(1)
+    except ValueError as error:
+        print(f"Error: File '{filename}' is not a valid graph file ({error})!")
+        sys.exit(1)
+
+    start_time = time.time()
+    index = LandmarkIndex.build(csr, count)
+    build_time = time.time() - start_time
+
+    landmark_file = landmark_filename_for(filename)
+    index.save(landmark_file)
+    print(f"Selected {len(index.landmarks)} landmarks in {build_time:.2f} seconds")
+    print(f"Landmarks saved to {landmark_file} " +
+          f"({os.path.getsize(landmark_file) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,474 @@
+"""
+Nearest Facility Labels
+=======================
+This module labels every node of a graph with its nearest matching node
+("facility") and the distance to it, in one traversal.
+
+"For every store, which is the closest hub?" takes one search per store
+with bfs_search.py or shortest_path.py. A multi-source traversal answers
+it for all nodes at once: every node matching the criteria starts at
+distance 0 with itself as its label, and the waves from all of them grow
+together. Each node is reached first by the wave of its nearest facility,
+so it takes that facility's label.
+
+    hops       multi-source BFS, O(V + E), distance = number of edges
+    weighted   multi-source Dijkstra, O(E log V), distance = route cost
+
+Ties go to the facility with the lowest node index. By default distances
+are measured from each node *to* its facility (the traversal runs over the
+reverse graph, see CSRGraph.reverse()); with direction "from" they are
+measured from the facility to the node.
+
+The labels can be exported as a compact, memory-mappable array file:
+
+    8 bytes   magic b"NEARFAC\\0"
+    4 bytes   format version (little-endian uint32)
+    4 bytes   header length in bytes (little-endian uint32)
+    N bytes   JSON header: byte order, graph size, criteria, mode, direction
+    ...       distance per node ('d', inf if unreachable; 'i' hops, -1 if
+              unreachable), then facility node index per node ('i', -1)
+
+Usage:
+    python nearest_facility.py <graph> <search_property> <search_value> [options]
+    python nearest_facility.py <graph> "<criteria>" [options]
+
+    graph: small, medium, large, or a graph file (.json, .gbin, ...)
+
+Options:
+    --hops               count edges instead of summing weights
+    --from               distance from the facility to each node
+    --for "<criteria>"   list the labels of the nodes matching these criteria
+    --output FILE        where to write the labels (default graph_large.gnf)
+    --compare            check a sample of nodes with one search per node
+
+Examples:
+    python nearest_facility.py graph_large.json type hub --for "type=retail_store"
+    python nearest_facility.py graph_large.gbin "type=warehouse and capacity_min=3000" --hops
+    python nearest_facility.py large type hub
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import heapq
+import json
+import math
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from collections import deque
+
+from csr_graph import as_csr_graph, get_node
+from graph_stream import open_graph
+from search_criteria import compile_criteria
+from shortest_path import dijkstra_costs
+
+
+MAGIC = b"NEARFAC\0"
+FORMAT_VERSION = 1
+FACILITY_EXTENSION = ".gnf"
+
+DIRECTIONS = ["to", "from"]
+
+# Nodes checked with one search each by --compare
+COMPARE_SAMPLE = 20
+
+_PREAMBLE = struct.Struct("<8sII")
+
+
+def multi_source_bfs(csr, sources):
+    """
+    Label every node with its nearest source by hop count.
+
+    Args:
+        csr (CSRGraph): Graph to traverse
+        sources (list): Source node indices, ascending
+
+    Returns:
+        tuple: (hops, label) arrays; hops is -1 and label -1 where no
+            source reaches the node
+    """
+    offsets, targets = csr.offsets, csr.targets
+    hops = array('i', [-1]) * csr.num_nodes
+    label = array('i', [-1]) * csr.num_nodes
+    queue = deque()
+    for source in sources:
+        hops[source] = 0
+        label[source] = source
+        queue.append(source)
+
+    while queue:
+        current = queue.popleft()
+        next_hops = hops[current] + 1
+        current_label = label[current]
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            if hops[neighbor] < 0:
+                hops[neighbor] = next_hops
+                label[neighbor] = current_label
+                queue.append(neighbor)
+            elif hops[neighbor] == next_hops and current_label < label[neighbor]:
+                # Reached again in the same level: the lower facility index wins
+                label[neighbor] = current_label
+    return hops, label
+
+
+def multi_source_dijkstra(csr, sources):
+    """
+    Label every node with its nearest source by route cost.
+
+    The frontier is ordered by (cost, label), so among equally close
+    sources the one with the lowest index labels the node.
+
+    Args:
+        csr (CSRGraph): Graph to traverse
+        sources (list): Source node indices
+
+    Returns:
+        tuple: (cost, label) arrays; cost is inf and label -1 where no
+            source reaches the node
+    """
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    cost = array('d', [math.inf]) * csr.num_nodes
+    label = array('i', [-1]) * csr.num_nodes
+    settled = bytearray(csr.num_nodes)
+    frontier = []
+    for source in sources:
+        cost[source] = 0.0
+        label[source] = source
+        frontier.append((0.0, source, source))
+    heapq.heapify(frontier)
+
+    while frontier:
+        current_cost, current_label, current = heapq.heappop(frontier)
+        if settled[current]:
+            continue
+        settled[current] = 1
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[k]
+            new_cost = current_cost + weights[k]
+            if settled[neighbor]:
+                continue
+            if new_cost < cost[neighbor] or (new_cost == cost[neighbor] and
+                                             current_label < label[neighbor]):
+                cost[neighbor] = new_cost
+                label[neighbor] = current_label
+                heapq.heappush(frontier, (new_cost, current_label, neighbor))
+    return cost, label
+
+
+class FacilityLabels:
+    """
+    Nearest facility and distance to it for every node of a graph.
+
+    Attributes:
+        criteria (str): Criteria selecting the facilities
+        weighted (bool): Distances are route costs (else hop counts)
+        direction (str): "to" (node to facility) or "from"
+        distance (array): Distance per node ('d' with inf, or 'i' with -1
+            where unreachable)
+        facility (array): Facility node index per node (-1 where unreachable)
+        num_facilities (int): Number of matching nodes
+        fingerprint (dict): num_nodes and num_edges of the graph
+    """
+
+    def __init__(self, criteria, weighted, direction, distance, facility, num_facilities,
+                 fingerprint):
+        self.criteria = criteria
+        self.weighted = weighted
+        self.direction = direction
+        self.distance = distance
+        self.facility = facility
+        self.num_facilities = num_facilities
+        self.fingerprint = fingerprint
+
+    def reached(self, index):
+        """
+        Check whether a node has a facility.
+
+        Args:
+            index (int): Integer node index
+
+        Returns:
+            bool: True if some facility is reachable
+        """
+        return self.facility[index] >= 0
+
+    def save(self, filename):
+        """
+        Write the labels to a memory-mappable file.
+
+        Args:
+            filename (str): Output filename (usually *.gnf)
+        """
+        header = json.dumps({
+            "byteorder": sys.byteorder,
+            "fingerprint": self.fingerprint,
+            "criteria": self.criteria,
+            "weighted": self.weighted,
+            "direction": self.direction,
+            "num_facilities": self.num_facilities
+        }).encode("utf-8")
+        header += b" " * (-(_PREAMBLE.size + len(header)) % 8)
+
+        with open(filename, 'wb') as f:
+            f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+            f.write(header)
+            distance = self.distance.tobytes()
+            f.write(distance)
+            f.write(b"\0" * (-len(distance) % 8))
+            f.write(self.facility.tobytes())
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Memory-map a label file written by save().
+
+        Args:
+            filename (str): Label filename
+
+        Returns:
+            FacilityLabels: Labels backed by the mapped file
+
+        Raises:
+            ValueError: If the file is not a supported label file
+        """
+        with open(filename, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_length = _PREAMBLE.unpack_from(mapped, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"'{filename}' is not a supported facility label file")
+        header = json.loads(bytes(mapped[_PREAMBLE.size:_PREAMBLE.size + header_length]))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"'{filename}' was written on a {header['byteorder']}-endian machine")
+
+        n = header["fingerprint"]["num_nodes"]
+        typecode = 'd' if header["weighted"] else 'i'
+        start = _PREAMBLE.size + header_length
+        size = n * struct.calcsize(typecode)
+        data = memoryview(mapped)
+        distance = data[start:start + size].cast(typecode)
+        start += size + (-size % 8)
+        facility = data[start:start + 4 * n].cast('i')
+        return cls(header["criteria"], header["weighted"], header["direction"], distance,
+                   facility, header["num_facilities"], header["fingerprint"])
+
+
+def label_nearest_facilities(graph, search_property, search_value=None, weighted=True,
+                             direction="to"):
+    """
+    Label every node with its nearest facility in one multi-source traversal.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        search_property (str): Property selecting the facilities, a
+            criteria expression or compiled criteria (see search_criteria.py)
+        search_value (str): Value to match (None for expressions)
+        weighted (bool): Sum edge weights (Dijkstra) instead of counting
+            edges (BFS)
+        direction (str): "to" for distances from each node to its facility,
+            "from" for distances from the facility to each node
+
+    Returns:
+        tuple: (labels, time_taken)
+
+    Raises:
+        ValueError: If the criteria or the direction are invalid
+    """
+    start_time = time.time()
+    if direction not in DIRECTIONS:
+        raise ValueError(f"Unknown direction '{direction}'")
+    criteria = compile_criteria(search_property, search_value)
+
+    csr = as_csr_graph(graph)
+    mask = criteria.mask(csr)
+    sources = [i for i in range(csr.num_nodes) if mask[i]]
+    traversed = csr.reverse() if direction == "to" else csr
+    if weighted:
+        distance, facility = multi_source_dijkstra(traversed, sources)
+    else:
+        distance, facility = multi_source_bfs(traversed, sources)
+
+    labels = FacilityLabels(criteria.describe(), weighted, direction, distance, facility,
+                            len(sources), {"num_nodes": csr.num_nodes,
+                                           "num_edges": csr.num_edges})
+    return labels, time.time() - start_time
+
+
+def facility_filename_for(filename):
+    """
+    Return the label filename that belongs next to a graph file.
+
+    Args:
+        filename (str): Graph file such as "graph_large.json"
+
+    Returns:
+        str: Label file such as "graph_large.gnf"
+    """
+    return os.path.splitext(filename)[0] + FACILITY_EXTENSION
+
+
+def _single_source_distance(csr, labels, index):
+    """
+    Find a node's distance to its nearest facility with a search of its own.
+
+    Args:
+        csr (CSRGraph): Graph
+        labels (FacilityLabels): Labels whose settings to use
+        index (int): Integer node index
+
+    Returns:
+        float: Distance to the nearest facility (inf if none is reachable)
+    """
+    traversed = csr if labels.direction == "to" else csr.reverse()
+    mask = compile_criteria(labels.criteria).mask(csr)
+    if labels.weighted:
+        cost = dijkstra_costs(traversed, [index])
+        return min((cost[i] for i in range(csr.num_nodes) if mask[i]), default=math.inf)
+
+    hops, _ = multi_source_bfs(traversed, [index])
+    reached = [hops[i] for i in range(csr.num_nodes) if mask[i] and hops[i] >= 0]
+    return min(reached, default=math.inf)
+
+
+def display_results(labels, time_taken, csr, group=None):
+    """
+    Display a summary of the labels and, optionally, the labels of a group.
+
+    Args:
+        labels (FacilityLabels): Labels
+        time_taken (float): Time in seconds
+        csr (CSRGraph): Graph
+        group (Criterion or CompoundCriteria): Nodes whose labels to list
+    """
+    unit = "cost" if labels.weighted else "hops"
+    reached = [labels.distance[i] for i in range(csr.num_nodes) if labels.reached(i)]
+
+    print("\n" + "="*70)
+    print("NEAREST FACILITY LABELS")
+    print("="*70)
+    print(f"Facilities: {labels.criteria} ({labels.num_facilities} nodes)")
+    print(f"Distance: {unit}, measured {labels.direction} the facility")
+    print(f"Nodes Labelled: {len(reached)} of {csr.num_nodes}")
+    if reached:
+        print(f"Mean Distance: {sum(reached) / len(reached):.2f}, Max: {max(reached):g}")
+    print(f"Time Taken: {time_taken:.6f} seconds")
+    print("="*70)
+
+    if group is None:
+        print()
+        return
+
+    mask = group.mask(csr)
+    members = [i for i in range(csr.num_nodes) if mask[i]]
+    distances = [labels.distance[i] for i in members if labels.reached(i)]
+    print(f"\nNodes where {group.describe()}: {len(members)}")
+    if distances:
+        print(f"Mean Distance: {sum(distances) / len(distances):.2f}, " +
+              f"Without Facility: {len(members) - len(distances)}")
+    # Display first 10 members
+    for position, i in enumerate(members[:10]):
+        node = get_node(csr, csr.node_ids[i])
+        if labels.reached(i):
+            facility = csr.node_ids[labels.facility[i]]
+            print(f"  {position+1}. {node['name']} (ID: {csr.node_ids[i]}) -> " +
+                  f"{facility}, {unit} {labels.distance[i]:g}")
+        else:
+            print(f"  {position+1}. {node['name']} (ID: {csr.node_ids[i]}) -> no facility")
+    if len(members) > 10:
+        print(f"  ... and {len(members) - 10} more")
+    print()
+
+
+def main():
+    """
+    Main function to label a graph file with nearest facilities and export them.
+    """
+    args = sys.argv[1:]
+    options = {"--for": None, "--output": None}
+    for option in list(options):
+        if option in args:
+            position = args.index(option)
+            if position + 1 >= len(args):
+                print(f"Error: {option} requires a value")
+                sys.exit(1)
+            options[option] = args[position + 1]
+            del args[position:position + 2]
+    flags = {}
+    for flag in ("--hops", "--from", "--compare"):
+        flags[flag] = flag in args
+        if flags[flag]:
+            args.remove(flag)
+
+    if len(args) not in (2, 3):
+        print("Usage: python nearest_facility.py <graph> <search_property> <search_value> [options]")
+        print("       python nearest_facility.py <graph> \"<criteria>\" [options]")
+        print()
+        print("  graph: small, medium, large, or a graph file (.json, .gbin, ...)")
+        print()
+        print("Options:")
+        print("  --hops: count edges instead of summing weights")
+        print("  --from: distance from the facility to each node (default: to the facility)")
+        print("  --for \"<criteria>\": list the labels of the nodes matching these criteria")
+        print("  --output FILE: where to write the labels (default: next to the graph, .gnf)")
+        print("  --compare: check a sample of nodes with one search per node")
+        print()
+        print("Examples:")
+        print("  python nearest_facility.py graph_large.json type hub --for \"type=retail_store\"")
+        print("  python nearest_facility.py graph_large.gbin \"type=warehouse and capacity_min=3000\" --hops")
+        print("  python nearest_facility.py large type hub")
+        sys.exit(1)
+
+    filename = args[0]
+    if len(args) == 3:
+        search_property, search_value = args[1].lower(), args[2]
+    else:
+        search_property, search_value = args[1], None
+
+    # Validate the search criteria before loading the graph
+    try:
+        criteria = compile_criteria(search_property, search_value)
+        group = None if options["--for"] is None else compile_criteria(options["--for"])
+    except ValueError as error:
+        print(f"Error: {error}")
+        sys.exit(1)
+
+    csr = open_graph(filename)
+
+    print(f"Loaded graph with {csr.num_nodes} nodes and {csr.num_edges} edges")
+    direction = "from" if flags["--from"] else "to"
+    labels, time_taken = label_nearest_facilities(csr, criteria, weighted=not flags["--hops"],
+                                                  direction=direction)
+    if labels.num_facilities == 0:
+        print(f"Error: No nodes match {criteria.describe()}, so there is nothing to label")
+        sys.exit(1)
+    display_results(labels, time_taken, csr, group)
+
+    output = options["--output"] or facility_filename_for(csr.source_file or filename)
+    labels.save(output)
+    print(f"Labels saved to {output} ({os.path.getsize(output) / 1024:.0f} KB)")
+
+    if flags["--compare"]:
+        sample = random.Random(0).sample(range(csr.num_nodes), min(COMPARE_SAMPLE, csr.num_nodes))
+        start_time = time.time()
+        mismatches = 0
+        for index in sample:
+            expected = _single_source_distance(csr, labels, index)
+            actual = labels.distance[index] if labels.reached(index) else math.inf
+            mismatches += expected != actual
+        per_node = (time.time() - start_time) / max(1, len(sample))
+        print(f"\nOne search per node: {per_node:.6f} seconds per node, " +
+              f"about {per_node * csr.num_nodes:.1f} seconds for every node")
+        if mismatches:
+            print(f"Warning: {mismatches} of {len(sample)} sampled nodes have a different distance")
+        else:
+            print(f"All {len(sample)} sampled nodes have the same distance")
+    print()
+
+
+if __name__ == "__main__":
+    main()
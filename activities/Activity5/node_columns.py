@@ -0,0 +1,371 @@
+"""
+Columnar Node-Attribute Store
+=============================
+This module keeps node attributes as typed columns instead of one Python
+dictionary per node.
+
+A node dictionary from the JSON files ({"id": ..., "name": ...,
+"coordinates": {"x": ..., "y": ...}, ...}) costs several hundred bytes:
+two dictionaries, a name string and boxed integers and floats. The same
+attributes as columns cost 26 bytes per node:
+
+    x, y                 array('d')   coordinates
+    capacity, priority   array('i')
+    type, region         array('B')   codes into a shared category list
+
+Names are not stored at all when every node follows the graph_generator.py
+convention "{type}_{region}_{index}"; they are generated on access.
+ColumnNodes wraps the columns as a read-only sequence of node dictionaries,
+so code written against graph["nodes"] values keeps working, while searches
+read the columns directly (see search_criteria.py, attribute_index.py and
+greedy_search.py).
+
+Usage:
+    builder = NodeColumnBuilder()
+    for node in graph["nodes"].values():
+        builder.add_node(node)
+    columns, categories, names = builder.build()
+    nodes = ColumnNodes(columns, categories, node_ids, names)
+
+    python node_columns.py <graph_file>     # compare memory per node
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import json
+import sys
+import tracemalloc
+from array import array
+
+
+# Node attributes stored as categorical codes
+CATEGORICAL_ATTRIBUTES = ["type", "region"]
+
+# Column typecodes, in the order columns are stored
+COLUMN_TYPECODES = {"x": 'd', "y": 'd', "capacity": 'i', "priority": 'i',
+                    "type": 'B', "region": 'B'}
+
+# Most distinct values a categorical column can hold
+MAX_CATEGORIES = 255
+
+# Keys of a node dictionary in the JSON files, all of which ColumnNodes rebuilds
+NODE_KEYS = {"id", "name", "type", "region", "capacity", "priority", "coordinates"}
+
+
+class StringColumn:
+    """
+    Read-only sequence of strings stored as one UTF-8 blob plus offsets.
+
+    Strings are decoded only when accessed, so opening a file with a
+    million node IDs costs nothing until those IDs are needed.
+    """
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return bytes(self.data[start:end]).decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class ColumnNodes:
+    """
+    Read-only sequence of node dictionaries backed by attribute columns.
+
+    Each item is built on access with the same keys as a node in the JSON
+    files, so code written against graph["nodes"] values keeps working.
+    When no names column is given, names follow the graph_generator.py
+    convention "{type}_{region}_{index}".
+    """
+
+    def __init__(self, columns, categories, node_ids, names=None):
+        self.columns = columns
+        self.categories = categories
+        self.node_ids = node_ids
+        self.names = names
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def _position(self, index):
+        """
+        Turn a possibly negative index into a node index.
+
+        Args:
+            index (int): Index as passed to a sequence
+
+        Returns:
+            int: Node index between 0 and len(self) - 1
+
+        Raises:
+            IndexError: If the index is out of range
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("node index out of range")
+        return index
+
+    def name(self, index):
+        """
+        Return the name of a node without building its dictionary.
+
+        Args:
+            index (int): Integer node index (negative counts from the end)
+
+        Returns:
+            str: Node name
+        """
+        index = self._position(index)
+        if self.names is not None:
+            return self.names[index]
+        node_type = self.categories["type"][self.columns["type"][index]]
+        region = self.categories["region"][self.columns["region"][index]]
+        return f"{node_type}_{region}_{index}"
+
+    def __getitem__(self, index):
+        index = self._position(index)
+        columns = self.columns
+        return {
+            "id": self.node_ids[index],
+            "name": self.name(index),
+            "type": self.categories["type"][columns["type"][index]],
+            "region": self.categories["region"][columns["region"][index]],
+            "capacity": columns["capacity"][index],
+            "priority": columns["priority"][index],
+            "coordinates": {"x": columns["x"][index], "y": columns["y"][index]}
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class NodeColumnBuilder:
+    """
+    Append node dictionaries to attribute columns one at a time.
+
+    Category codes are assigned in order of first appearance. Names are
+    only stored once a node's name differs from the generated one; the
+    names seen before that point are filled in at the same time.
+    """
+
+    def __init__(self):
+        self.columns = {name: array(typecode) for name, typecode in COLUMN_TYPECODES.items()}
+        self.categories = {attribute: [] for attribute in CATEGORICAL_ATTRIBUTES}
+        self._category_codes = {attribute: {} for attribute in CATEGORICAL_ATTRIBUTES}
+        self._name_data = None  # bytearray once names have to be stored
+        self._name_offsets = None
+
+    def __len__(self):
+        return len(self.columns["x"])
+
+    def _generated_name(self, index):
+        """
+        Return the name a node would get from graph_generator.py.
+
+        Args:
+            index (int): Integer node index
+
+        Returns:
+            str: "{type}_{region}_{index}"
+        """
+        node_type = self.categories["type"][self.columns["type"][index]]
+        region = self.categories["region"][self.columns["region"][index]]
+        return f"{node_type}_{region}_{index}"
+
+    def _store_name(self, name):
+        """
+        Append a name to the stored names column.
+
+        Args:
+            name (str): Node name
+        """
+        self._name_data += name.encode("utf-8")
+        self._name_offsets.append(len(self._name_data))
+
+    def add_node(self, node):
+        """
+        Append one node's attributes to the columns.
+
+        Args:
+            node (dict): Node data with coordinates, capacity, priority,
+                type, region and name
+
+        Raises:
+            ValueError: If the node lacks one of these attributes, an
+                attribute has the wrong type or range for its column, or a
+                categorical attribute has too many values
+
+        After an error the builder holds a partial row and should be discarded.
+        """
+        index = len(self)
+        columns = self.columns
+        field = "coordinates"
+        try:
+            coordinates = node["coordinates"]
+            for field in ("x", "y"):
+                columns[field].append(coordinates[field])
+            for field in ("capacity", "priority"):
+                columns[field].append(node[field])
+            for field in CATEGORICAL_ATTRIBUTES:
+                value = node[field]
+                lookup = self._category_codes[field]
+                code = lookup.get(value)
+                if code is None:
+                    if len(lookup) == MAX_CATEGORIES:
+                        raise ValueError(f"at most {MAX_CATEGORIES} distinct '{field}' "
+                                         "values can be stored")
+                    code = lookup[value] = len(lookup)
+                    self.categories[field].append(value)
+                columns[field].append(code)
+            field = "name"
+            name = node["name"]
+            if not isinstance(name, str):
+                raise TypeError(f"must be a string, not {type(name).__name__}")
+        except KeyError:
+            raise ValueError(f"missing attribute '{field}'") from None
+        except (TypeError, OverflowError) as error:
+            raise ValueError(f"invalid attribute '{field}' ({error})") from None
+
+        if self._name_data is not None:
+            self._store_name(name)
+        elif name != self._generated_name(index):
+            self._name_data = bytearray()
+            self._name_offsets = array('q', [0])
+            for i in range(index):
+                self._store_name(self._generated_name(i))
+            self._store_name(name)
+
+    def build(self):
+        """
+        Return the accumulated columns.
+
+        Returns:
+            tuple: (columns, categories, names) where names is a
+                StringColumn, or None when every name is the generated one
+        """
+        names = None
+        if self._name_data is not None:
+            names = StringColumn(array('B', self._name_data), self._name_offsets)
+            self._name_data = None
+        return self.columns, self.categories, names
+
+
+def build_node_columns(nodes, node_ids):
+    """
+    Convert node dictionaries to a column-backed node sequence.
+
+    Only nodes that ColumnNodes can rebuild exactly are accepted: the
+    standard keys and nothing else, and an "id" equal to the node ID.
+
+    Args:
+        nodes (iterable): Node dictionaries in node index order
+        node_ids (list): Node ID per index
+
+    Returns:
+        tuple: (columns, categories, ColumnNodes)
+
+    Raises:
+        ValueError: If the nodes do not fit the columns (see
+            NodeColumnBuilder.add_node())
+    """
+    builder = NodeColumnBuilder()
+    for node_id, node in zip(node_ids, nodes):
+        if node.keys() != NODE_KEYS or node["coordinates"].keys() != {"x", "y"}:
+            raise ValueError(f"node '{node_id}' has attributes the columns do not store")
+        if node["id"] != node_id:
+            raise ValueError(f"node '{node_id}' has a different id '{node['id']}'")
+        builder.add_node(node)
+    columns, categories, names = builder.build()
+    return columns, categories, ColumnNodes(columns, categories, node_ids, names)
+
+
+def numeric_column(csr, attribute):
+    """
+    Return a numeric attribute of every node, in node index order.
+
+    Args:
+        csr (CSRGraph): Graph
+        attribute (str): x, y, capacity or priority
+
+    Returns:
+        sequence: The column itself when the graph has one, otherwise a list
+    """
+    if csr.columns is not None and attribute in csr.columns:
+        return csr.columns[attribute]
+    if attribute in ("x", "y"):
+        return [node["coordinates"][attribute] for node in csr.nodes]
+    return [node[attribute] for node in csr.nodes]
+
+
+def _traced_bytes(build):
+    """
+    Measure the memory still allocated by a structure after it is built.
+
+    Args:
+        build (callable): Builds and returns the structure
+
+    Returns:
+        tuple: (structure, bytes allocated)
+    """
+    tracemalloc.start()
+    structure = build()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return structure, allocated
+
+
+def main():
+    """
+    Compare the memory per node of node dictionaries and attribute columns.
+    """
+    args = sys.argv[1:]
+    if len(args) != 1:
+        print("Usage: python node_columns.py <graph_file>")
+        print()
+        print("Example:")
+        print("  python node_columns.py graph_large.json")
+        sys.exit(1)
+
+    filename = args[0]
+    try:
+        with open(filename, 'r') as f:
+            text = f.read()
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found!")
+        sys.exit(1)
+
+    def load_nodes():
+        return json.loads(text)["nodes"]
+
+    graph_nodes, dict_bytes = _traced_bytes(load_nodes)
+    node_ids = list(graph_nodes)
+    try:
+        (columns, categories, nodes), column_bytes = _traced_bytes(
+            lambda: build_node_columns(graph_nodes.values(), node_ids))
+    except (KeyError, TypeError, OverflowError, ValueError) as error:
+        print(f"Error: Nodes in '{filename}' cannot be stored as columns ({error})")
+        sys.exit(1)
+
+    n = max(1, len(node_ids))
+    print(f"Nodes: {len(node_ids)}")
+    print(f"Node dictionaries:  {dict_bytes / n:8.1f} bytes per node (node IDs included)")
+    print(f"Attribute columns:  {column_bytes / n:8.1f} bytes per node " +
+          f"(names {'stored' if nodes.names is not None else 'generated on access'})")
+    print(f"Reduction:          {dict_bytes / max(1, column_bytes):8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
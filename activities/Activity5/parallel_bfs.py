@@ -0,0 +1,375 @@
+"""
+Parallel Breadth-First Search
+=============================
+This module runs the property search of bfs_search.py on several CPU cores.
+
+The CSR arrays (see csr_graph.py) are copied once into shared memory
+blocks that a pool of worker processes attaches to, so the graph is never
+pickled. The BFS is level-synchronous:
+
+1. The current frontier is a slice of the shared BFS order array
+2. The frontier is cut into chunks; each worker expands its chunks and
+   returns the neighbors that were not visited at the start of the level
+3. The main process merges the chunk results in frontier order, keeping
+   the first occurrence of each node, marks them visited in the shared
+   bitmap and appends them to the order array as the next frontier
+
+Because chunks are merged in frontier order, nodes are discovered in
+exactly the order of the deque BFS in bfs_search.py, whatever the number
+of workers.
+
+Only the expansion runs in parallel. The merge and the match checks stay
+in the main process and cost about a quarter of a serial level: on a
+1M-node graph the deque BFS takes 1.5 s, of which 0.4 s remains serial
+next to the pool. The pool is therefore only used where it can pay off:
+- a level goes to the pool only if it has at least PARALLEL_MIN_FRONTIER
+  nodes. Expanding a node in-process costs about 1.6 microseconds, while
+  one pool.map round trip costs about 0.4 ms. A 4096-node level saves
+  several times that with two or more cores; smaller levels are expanded
+  in the main process.
+- with a single worker, or a graph with fewer nodes than that threshold,
+  no pool is started at all and the search is the deque BFS without the
+  start-up cost
+
+Usage:
+    python parallel_bfs.py <graph_file> <search_property> <search_value> [--workers N]
+    python parallel_bfs.py <graph_file> "<criteria>" [--workers N]
+
+Examples:
+    python parallel_bfs.py graph_large.json type warehouse
+    python parallel_bfs.py graph_1m.gbin "type=hub and priority=5" --workers 8
+
+The command line benchmarks 1..N workers (N defaults to the number of CPU
+cores) against the single-process deque BFS and checks that every run
+finds the same nodes in the same order.
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import os
+import sys
+import time
+from array import array
+from itertools import islice
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+from bfs_search import bfs_search_all_components
+from csr_graph import as_csr_graph
+from graph_binary import BINARY_EXTENSION, load_graph_binary
+from graph_stream import load_graph_streaming
+from search_criteria import check_limit, compile_criteria, match_mask
+
+
+# Frontiers smaller than this are expanded without the pool
+PARALLEL_MIN_FRONTIER = 4096
+
+# Chunks per worker and level (more chunks balance uneven degrees better)
+CHUNKS_PER_WORKER = 4
+
+# Shared arrays attached by each worker process: name -> memoryview
+_shared = {}
+
+
+def _attach_worker(blocks):
+    """
+    Pool initializer: attach to the shared CSR, visited and order arrays.
+
+    Each worker also gets its own "seen" scratch bitmap for _expand_chunk(),
+    allocated once and kept all zero between tasks.
+
+    Args:
+        blocks (dict): name -> (shared memory name, typecode, count)
+    """
+    for name, (block_name, typecode, count) in blocks.items():
+        block = SharedMemory(name=block_name)
+        _shared[name + "_block"] = block  # Keep the mapping alive
+        _shared[name] = block.buf[:count * array(typecode).itemsize].cast(typecode)
+    _shared["seen"] = bytearray(len(_shared["visited"]))
+
+
+def _expand_chunk(bounds):
+    """
+    Pool task: collect the unvisited neighbors of order[start:end].
+
+    The visited bitmap is only read here; the main process updates it
+    between levels. Neighbors found twice within the chunk are skipped with
+    the worker's scratch bitmap, which is cleared again at exactly the
+    entries set, so a task costs time in its edges rather than in the size
+    of the graph.
+
+    Args:
+        bounds (tuple): (start, end) positions in the order array
+
+    Returns:
+        bytes: Unvisited neighbors as packed int32 values, in discovery
+            order and each listed once
+    """
+    start, end = bounds
+    offsets, targets = _shared["offsets"], _shared["targets"]
+    visited = _shared["visited"]
+    found = array('i')
+    seen = _shared["seen"]
+    for node in _shared["order"][start:end]:
+        for neighbor in targets[offsets[node]:offsets[node + 1]]:
+            if not (visited[neighbor] or seen[neighbor]):
+                seen[neighbor] = 1
+                found.append(neighbor)
+    for neighbor in found:
+        seen[neighbor] = 0
+    return found.tobytes()
+
+
+class ParallelBFS:
+    """
+    A worker pool attached to one graph's CSR arrays in shared memory.
+
+    Creating the pool and copying the arrays happens once; any number of
+    searches can then run on it. Use it as a context manager (or call
+    close()) so the shared memory is released. With one worker, or fewer
+    nodes than PARALLEL_MIN_FRONTIER, no pool is started and every level is
+    expanded in the main process.
+
+    Attributes:
+        csr (CSRGraph): Graph searched
+        workers (int): Number of worker processes
+    """
+
+    def __init__(self, graph, workers=None):
+        self.csr = as_csr_graph(graph)
+        self.workers = workers or os.cpu_count() or 1
+        n = self.csr.num_nodes
+
+        self._blocks = []
+        specs = {}
+        views = {}
+        for name, typecode, source, count in (
+                ("offsets", 'q', self.csr.offsets, n + 1),
+                ("targets", 'i', self.csr.targets, self.csr.num_edges),
+                ("visited", 'B', None, n),
+                ("order", 'i', None, n)):
+            size = count * array(typecode).itemsize
+            block = SharedMemory(create=True, size=max(1, size))
+            self._blocks.append(block)
+            if source is not None:
+                block.buf[:size] = memoryview(source).cast('B')
+            specs[name] = (block.name, typecode, count)
+            views[name] = block.buf[:size].cast(typecode)
+        self._offsets, self._targets = views["offsets"], views["targets"]
+        self._visited, self._order = views["visited"], views["order"]
+
+        self._pool = None
+        if self.workers > 1 and n >= PARALLEL_MIN_FRONTIER:
+            self._pool = Pool(self.workers, initializer=_attach_worker, initargs=(specs,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        if self._blocks is None:
+            return
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        for view in (self._offsets, self._targets, self._visited, self._order):
+            view.release()
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = None
+
+    def iter_matches(self, search_property, search_value=None, start_node_id=None,
+                     stats=None):
+        """
+        Run a parallel BFS and yield matching node IDs in discovery order.
+
+        Args:
+            search_property (str): Property to search by, a criteria
+                expression such as "type=hub and priority=5", or compiled
+                criteria (see search_criteria.py)
+            search_value (str): Value to match (None for expressions)
+            start_node_id (str): Starting node ID, or None for all components
+            stats (dict): Optional dict; "nodes_explored" and
+                "parallel_levels" are kept up to date whenever a match is
+                yielded and when the search ends
+
+        Yields:
+            str: Node IDs that match criteria, in the deque BFS order
+        """
+        csr = self.csr
+        offsets, targets = self._offsets, self._targets
+        visited, order = self._visited, self._order
+        node_ids = csr.node_ids
+        match = match_mask(csr, search_property, search_value)
+
+        if start_node_id is None:
+            starts = range(csr.num_nodes)
+        else:
+            starts = (csr.index_of(start_node_id),)
+
+        visited[:] = bytes(csr.num_nodes)
+        tail = 0  # order[:tail] holds every node discovered so far
+        parallel_levels = 0
+
+        def report():
+            if stats is not None:
+                stats["nodes_explored"] = tail
+                stats["parallel_levels"] = parallel_levels
+
+        for start in starts:
+            if visited[start]:
+                continue
+            visited[start] = 1
+            order[tail] = start
+            level_start, tail = tail, tail + 1
+            if match[start]:
+                report()
+                yield node_ids[start]
+
+            while level_start < tail:
+                level_end = tail
+                size = level_end - level_start
+                merged = array('i')
+                if self._pool is None or size < PARALLEL_MIN_FRONTIER:
+                    for node in order[level_start:level_end]:
+                        for neighbor in targets[offsets[node]:offsets[node + 1]]:
+                            if not visited[neighbor]:
+                                visited[neighbor] = 1
+                                merged.append(neighbor)
+                else:
+                    parallel_levels += 1
+                    step = -(-size // (self.workers * CHUNKS_PER_WORKER))
+                    chunks = [(position, min(position + step, level_end))
+                              for position in range(level_start, level_end, step)]
+
+                    # Merge in frontier order; a node found by several chunks keeps its first place
+                    for data in self._pool.map(_expand_chunk, chunks):
+                        for node in memoryview(data).cast('i'):
+                            if not visited[node]:
+                                visited[node] = 1
+                                merged.append(node)
+                order[tail:tail + len(merged)] = merged
+                level_start, tail = level_end, tail + len(merged)
+                for node in merged:
+                    if match[node]:
+                        report()
+                        yield node_ids[node]
+
+        report()
+
+
+def parallel_bfs_search(graph, search_property, search_value=None, workers=None,
+                        limit=None):
+    """
+    Search all components with a parallel BFS.
+
+    Starts a worker pool, runs one search and shuts the pool down again;
+    use ParallelBFS directly to run several searches on one pool.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        search_property (str): Property to search by, or a criteria expression
+        search_value (str): Value to match (None for expressions)
+        workers (int): Worker processes (None for one per CPU core)
+        limit (int): Stop after this many matches (None for all)
+
+    Returns:
+        tuple: (found_nodes, nodes_explored, time_taken)
+
+    Raises:
+        ValueError: If limit is negative
+    """
+    check_limit(limit)
+
+    start_time = time.time()
+
+    stats = {}
+    with ParallelBFS(graph, workers) as bfs:
+        found_nodes = list(islice(bfs.iter_matches(search_property, search_value,
+                                                   stats=stats), limit))
+
+    end_time = time.time()
+    return found_nodes, stats.get("nodes_explored", 0), end_time - start_time
+
+
+def main():
+    """
+    Benchmark the parallel BFS with 1..N workers against the deque BFS.
+    """
+    args = sys.argv[1:]
+    max_workers = os.cpu_count() or 1
+    if "--workers" in args:
+        position = args.index("--workers")
+        try:
+            max_workers = int(args[position + 1])
+        except (IndexError, ValueError):
+            print("Error: --workers requires an integer value")
+            sys.exit(1)
+        del args[position:position + 2]
+
+    if len(args) not in (2, 3) or max_workers < 1:
+        print("Usage: python parallel_bfs.py <graph_file> <search_property> <search_value> [--workers N]")
+        print("       python parallel_bfs.py <graph_file> \"<criteria>\" [--workers N]")
+        print()
+        print("Examples:")
+        print("  python parallel_bfs.py graph_large.json type warehouse")
+        print("  python parallel_bfs.py graph_1m.gbin \"type=hub and priority=5\" --workers 8")
+        sys.exit(1)
+
+    filename = args[0]
+    if len(args) == 3:
+        search_property, search_value = args[1].lower(), args[2]
+    else:
+        search_property, search_value = args[1], None
+
+    # Validate the search criteria before loading the graph
+    try:
+        criteria = compile_criteria(search_property, search_value)
+    except ValueError as error:
+        print(f"Error: {error}")
+        sys.exit(1)
+
+    try:
+        if filename.endswith(BINARY_EXTENSION):
+            csr = load_graph_binary(filename)
+        else:
+            csr = load_graph_streaming(filename)
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found!")
+        sys.exit(1)
+    except ValueError as error:
+        print(f"Error: File '{filename}' is not a valid graph file ({error})!")
+        sys.exit(1)
+
+    print(f"Loaded graph with {csr.num_nodes} nodes and {csr.num_edges} edges")
+    print(f"Searching for nodes where {criteria.describe()}...")
+
+    expected, _, serial_time = bfs_search_all_components(csr, criteria, None)
+
+    print("\n" + "="*70)
+    print("PARALLEL BFS BENCHMARK")
+    print("="*70)
+    print(f"{'Workers':>7}  {'Time (s)':>10}  {'Speedup':>8}  {'Parallel Levels':>15}  Result")
+    print(f"{'deque':>7}  {serial_time:>10.3f}  {1.0:>8.2f}  {0:>15}  " +
+          f"{len(expected)} nodes found")
+    for workers in range(1, max_workers + 1):
+        with ParallelBFS(csr, workers) as bfs:
+            stats = {}
+            start_time = time.time()
+            found_nodes = list(bfs.iter_matches(criteria, stats=stats))
+            time_taken = time.time() - start_time
+        result = "same nodes, same order" if found_nodes == expected else "MISMATCH"
+        print(f"{workers:>7}  {time_taken:>10.3f}  {serial_time / time_taken:>8.2f}  " +
+              f"{stats['parallel_levels']:>15}  {result}")
+    print("="*70)
+    print(f"(pool start-up and shared memory copies are not timed; CPU cores: {os.cpu_count()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,639 @@
+"""
+Strongly Connected Components and Reachability Index
+====================================================
+This module answers "can node A reach node B?" and "can node A reach any
+warehouse?" without a traversal of the graph.
+
+Every node of a strongly connected component (SCC) reaches every other
+node of it, so reachability only depends on the condensation: the DAG with
+one node per SCC and an edge wherever an edge of the graph joins two SCCs.
+The SCCs are found with an iterative Tarjan pass over the CSR arrays
+(see csr_graph.py). Tarjan completes the SCCs in reverse topological order,
+so their numbers already satisfy
+
+    component A reaches component B  =>  B <= A
+
+On top of the DAG, INTERVAL_LABELS interval labels are computed (GRAIL):
+each labelling is a depth-first pass in a different random order that
+gives every component its post-order rank and the lowest rank below it.
+If B reaches nowhere near A's interval in some labelling, A cannot reach
+B; only the remaining pairs need a DFS over the DAG, pruned by the same
+test.
+
+For property criteria the index keeps, per criteria (see MASK_CACHE_SIZE):
+
+    match counts   matching nodes per SCC, so counts per SCC or for the
+                   whole graph are a sum over components, not nodes
+    reaches match  1 for every SCC that can reach a matching node, filled
+                   in one pass over the DAG in topological order
+
+after which "can A reach a warehouse?" is a single lookup.
+
+Usage:
+    python reachability.py <graph>
+    python reachability.py <graph> <node_id> <search_property> <search_value> [--compare]
+    python reachability.py <graph> <node_id> "<criteria>" [--compare]
+    python reachability.py <graph> <node_id> --to <node_id> [--compare]
+
+    graph: small, medium, large, or a graph file (.json, .gbin, ...)
+
+Examples:
+    python reachability.py large
+    python reachability.py graph_large.json
+    python reachability.py graph_large.gbin node_12 type warehouse --compare
+    python reachability.py graph_large.json node_12 --to node_9876
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import random
+import sys
+import time
+from array import array
+from collections import OrderedDict, deque
+
+from csr_graph import as_csr_graph, build_csr_arrays
+from graph_stream import open_graph
+from search_criteria import compile_criteria
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the condensation is then built in pure Python
+    np = None
+
+
+# Random interval labellings of the condensation
+INTERVAL_LABELS = 3
+
+# Per-criteria tables kept per index
+MASK_CACHE_SIZE = 8
+
+
+def strongly_connected_components(csr):
+    """
+    Find the strongly connected components with an iterative Tarjan pass.
+
+    Args:
+        csr (CSRGraph): Graph
+
+    Returns:
+        tuple: (component, count) where component is an array('i') with the
+            SCC number of every node; numbers are in reverse topological
+            order of the condensation
+    """
+    offsets, targets = csr.offsets, csr.targets
+    n = csr.num_nodes
+    order = array('i', [-1]) * n  # discovery number, -1 while unvisited
+    low = array('i', bytes(4 * n))
+    component = array('i', [-1]) * n  # -1 while the node is on the Tarjan stack
+    stack = array('i')
+    count = 0
+    discovered = 0
+
+    for root in range(n):
+        if order[root] >= 0:
+            continue
+        order[root] = low[root] = discovered
+        discovered += 1
+        stack.append(root)
+        # Explicit call stack: node and position of its next edge
+        call_nodes = [root]
+        call_edges = [offsets[root]]
+
+        while call_nodes:
+            node = call_nodes[-1]
+            position, end = call_edges[-1], offsets[node + 1]
+            while position < end:
+                neighbor = targets[position]
+                position += 1
+                if order[neighbor] < 0:
+                    break
+                if component[neighbor] < 0 and order[neighbor] < low[node]:
+                    low[node] = order[neighbor]
+            else:
+                # Every edge done: close the SCC if node is its root, then return
+                call_nodes.pop()
+                call_edges.pop()
+                if low[node] == order[node]:
+                    while True:
+                        member = stack.pop()
+                        component[member] = count
+                        if member == node:
+                            break
+                    count += 1
+                if call_nodes:
+                    parent = call_nodes[-1]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                continue
+
+            # Descend into the unvisited neighbor
+            call_edges[-1] = position
+            order[neighbor] = low[neighbor] = discovered
+            discovered += 1
+            stack.append(neighbor)
+            call_nodes.append(neighbor)
+            call_edges.append(offsets[neighbor])
+
+    return component, count
+
+
+def _condensation(csr, component, count):
+    """
+    Build the condensation DAG in CSR form, without duplicate edges.
+
+    Args:
+        csr (CSRGraph): Graph
+        component (array): SCC number per node
+        count (int): Number of SCCs
+
+    Returns:
+        tuple: (offsets, targets) arrays of the DAG
+    """
+    if np is not None:
+        sources = np.repeat(np.asarray(component, dtype=np.int64),
+                            np.diff(np.asarray(csr.offsets, dtype=np.int64)))
+        targets = np.asarray(component, dtype=np.int64)[np.asarray(csr.targets)]
+        keys = np.unique((sources * count + targets)[sources != targets])
+        edge_sources, edge_targets = keys // count, keys % count
+    else:
+        offsets, csr_targets = csr.offsets, csr.targets
+        keys = set()
+        for node in range(csr.num_nodes):
+            source = component[node]
+            for neighbor in csr_targets[offsets[node]:offsets[node + 1]]:
+                target = component[neighbor]
+                if target != source:
+                    keys.add(source * count + target)
+        keys = sorted(keys)
+        edge_sources = [key // count for key in keys]
+        edge_targets = [key % count for key in keys]
+
+    dag_offsets, dag_targets, _ = build_csr_arrays(
+        count, array('i', edge_sources), array('i', edge_targets),
+        array('d', bytes(8 * len(edge_sources))))
+    return dag_offsets, dag_targets
+
+
+def _interval_labels(dag_offsets, dag_targets, count, seed):
+    """
+    Label the DAG with one random post-order interval per component.
+
+    Args:
+        dag_offsets (array): DAG offsets
+        dag_targets (array): DAG targets
+        count (int): Number of components
+        seed (int): Seed of the random visiting order
+
+    Returns:
+        tuple: (low, rank) arrays; a component reaching another one has an
+            interval [low, rank] containing the other's
+    """
+    rng = random.Random(seed)
+    rank = array('i', [-1]) * count
+    low = array('i', bytes(4 * count))
+    roots = list(range(count))
+    rng.shuffle(roots)
+    next_rank = 0
+
+    for root in roots:
+        if rank[root] >= 0:
+            continue
+        rank[root] = -2  # on the DFS path
+        children = list(dag_targets[dag_offsets[root]:dag_offsets[root + 1]])
+        rng.shuffle(children)
+        path = [(root, children)]
+        lowest = [count]
+        while path:
+            node, children = path[-1]
+            if children:
+                child = children.pop()
+                if rank[child] == -1:
+                    rank[child] = -2
+                    grandchildren = list(dag_targets[dag_offsets[child]:dag_offsets[child + 1]])
+                    rng.shuffle(grandchildren)
+                    path.append((child, grandchildren))
+                    lowest.append(count)
+                elif low[child] < lowest[-1]:
+                    lowest[-1] = low[child]
+                continue
+            path.pop()
+            rank[node] = next_rank
+            low[node] = min(lowest.pop(), next_rank)
+            next_rank += 1
+            if lowest and low[node] < lowest[-1]:
+                lowest[-1] = low[node]
+    return low, rank
+
+
+class ReachabilityIndex:
+    """
+    SCCs, their condensation DAG and interval labels of one graph.
+
+    Attributes:
+        component (array): SCC number per node
+        num_components (int): Number of SCCs
+        sizes (array): Nodes per SCC
+        dag_offsets (array): Condensation edges per SCC, CSR offsets
+        dag_targets (array): Condensation edge targets
+        labels (list): (low, rank) interval arrays, one pair per labelling
+        tables (OrderedDict): Recently used per-criteria tables by criteria
+            text, each (match counts, reaches match)
+    """
+
+    def __init__(self, component, num_components, dag_offsets, dag_targets, labels):
+        self.component = component
+        self.num_components = num_components
+        self.sizes = array('i', bytes(4 * num_components))
+        for c in component:
+            self.sizes[c] += 1
+        self.dag_offsets = dag_offsets
+        self.dag_targets = dag_targets
+        self.labels = labels
+        self.tables = OrderedDict()
+
+    @classmethod
+    def build(cls, graph, interval_labels=INTERVAL_LABELS):
+        """
+        Find the SCCs, condense them and label the condensation.
+
+        Args:
+            graph (dict, CSRGraph or GraphHandle): Graph structure
+            interval_labels (int): Number of random interval labellings
+
+        Returns:
+            ReachabilityIndex: Index for the graph
+        """
+        csr = as_csr_graph(graph)
+        component, count = strongly_connected_components(csr)
+        dag_offsets, dag_targets = _condensation(csr, component, count)
+        labels = [_interval_labels(dag_offsets, dag_targets, count, seed)
+                  for seed in range(interval_labels)]
+        return cls(component, count, dag_offsets, dag_targets, labels)
+
+    @property
+    def num_dag_edges(self):
+        """int: Number of edges in the condensation DAG."""
+        return len(self.dag_targets)
+
+    def _may_reach(self, source, target):
+        """
+        Check the cheap necessary conditions for source reaching target.
+
+        Args:
+            source (int): Source component
+            target (int): Target component
+
+        Returns:
+            bool: False if source certainly cannot reach target
+        """
+        if target > source:
+            return False
+        for low, rank in self.labels:
+            if not (low[source] <= low[target] and rank[target] <= rank[source]):
+                return False
+        return True
+
+    def component_reaches(self, source, target, stats=None):
+        """
+        Check whether one SCC can reach another.
+
+        Args:
+            source (int): Source component
+            target (int): Target component
+            stats (dict): Optional dict that receives "components_visited"
+
+        Returns:
+            bool: True if there is a path from source to target
+        """
+        visited_count = 0
+        reached = source == target
+        if not reached and self._may_reach(source, target):
+            # DFS over the DAG, skipping components whose labels rule target out
+            offsets, targets = self.dag_offsets, self.dag_targets
+            visited = {source}
+            pending = [source]
+            while pending and not reached:
+                current = pending.pop()
+                visited_count += 1
+                for successor in targets[offsets[current]:offsets[current + 1]]:
+                    if successor == target:
+                        reached = True
+                        break
+                    if successor not in visited and self._may_reach(successor, target):
+                        visited.add(successor)
+                        pending.append(successor)
+        if stats is not None:
+            stats["components_visited"] = visited_count
+        return reached
+
+    def criteria_tables(self, csr, criteria):
+        """
+        Return the match counts and "reaches a match" flags of criteria.
+
+        Args:
+            csr (CSRGraph): Graph the index was built for
+            criteria (Criterion or CompoundCriteria): Compiled criteria
+
+        Returns:
+            tuple: (counts, reaches) with matching nodes per SCC (array('i'))
+                and 1 per SCC that can reach a matching node (bytearray)
+        """
+        key = criteria.describe()
+        tables = self.tables.get(key)
+        if tables is not None:
+            self.tables.move_to_end(key)
+            return tables
+
+        counts = array('i', bytes(4 * self.num_components))
+        component = self.component
+        mask = criteria.mask(csr)
+        start = mask.find(1)
+        while start >= 0:
+            counts[component[start]] += 1
+            start = mask.find(1, start + 1)
+
+        # Successors have smaller numbers, so one pass in increasing order suffices
+        offsets, targets = self.dag_offsets, self.dag_targets
+        reaches = bytearray(self.num_components)
+        for c in range(self.num_components):
+            if counts[c] or any(reaches[s] for s in targets[offsets[c]:offsets[c + 1]]):
+                reaches[c] = 1
+
+        tables = self.tables[key] = (counts, reaches)
+        if len(self.tables) > MASK_CACHE_SIZE:
+            self.tables.popitem(last=False)
+        return tables
+
+
+def get_reachability_index(graph):
+    """
+    Return the reachability index of a graph, building it once per graph.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+
+    Returns:
+        ReachabilityIndex: Index for the graph
+    """
+    return as_csr_graph(graph).derived_structure("reachability_index",
+                                                 ReachabilityIndex.build)
+
+
+def can_reach(graph, source_node_id, target_node_id):
+    """
+    Check whether there is a path from one node to another.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        source_node_id (str): Source node ID
+        target_node_id (str): Target node ID
+
+    Returns:
+        tuple: (reachable, components_visited, time_taken)
+
+    Raises:
+        KeyError: If a node ID is not in the graph
+    """
+    start_time = time.time()
+    csr = as_csr_graph(graph)
+    index = get_reachability_index(csr)
+    source = index.component[csr.index_of(source_node_id)]
+    target = index.component[csr.index_of(target_node_id)]
+    stats = {}
+    reachable = index.component_reaches(source, target, stats)
+    return reachable, stats["components_visited"], time.time() - start_time
+
+
+def reaches_match(graph, node_id, search_property, search_value=None):
+    """
+    Check whether a node can reach any node matching criteria.
+
+    A node reaches itself, so a matching node always qualifies.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        node_id (str): Starting node ID
+        search_property (str): Property to search by, a criteria expression
+            or compiled criteria (see search_criteria.py)
+        search_value (str): Value to match (None for expressions)
+
+    Returns:
+        tuple: (reachable, time_taken)
+
+    Raises:
+        KeyError: If the node ID is not in the graph
+        ValueError: If the criteria are invalid
+    """
+    start_time = time.time()
+    csr = as_csr_graph(graph)
+    index = get_reachability_index(csr)
+    _, reaches = index.criteria_tables(csr, compile_criteria(search_property, search_value))
+    reachable = bool(reaches[index.component[csr.index_of(node_id)]])
+    return reachable, time.time() - start_time
+
+
+def count_matches(graph, search_property, search_value=None, node_id=None):
+    """
+    Count the nodes matching criteria, in the whole graph or reachable from a node.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        search_property (str): Property to search by, a criteria expression
+            or compiled criteria (see search_criteria.py)
+        search_value (str): Value to match (None for expressions)
+        node_id (str): Count only nodes reachable from this node (None for
+            the whole graph)
+
+    Returns:
+        tuple: (count, time_taken)
+
+    Raises:
+        KeyError: If the node ID is not in the graph
+        ValueError: If the criteria are invalid
+    """
+    start_time = time.time()
+    csr = as_csr_graph(graph)
+    index = get_reachability_index(csr)
+    counts, reaches = index.criteria_tables(csr, compile_criteria(search_property, search_value))
+
+    if node_id is None:
+        total = sum(counts)
+    else:
+        # Sum over the components reachable from the node's component,
+        # skipping every component that cannot reach a match
+        start = index.component[csr.index_of(node_id)]
+        offsets, targets = index.dag_offsets, index.dag_targets
+        total = 0
+        if reaches[start]:
+            visited = {start}
+            pending = [start]
+            while pending:
+                current = pending.pop()
+                total += counts[current]
+                for successor in targets[offsets[current]:offsets[current + 1]]:
+                    if reaches[successor] and successor not in visited:
+                        visited.add(successor)
+                        pending.append(successor)
+    return total, time.time() - start_time
+
+
+def _bfs_reachable(csr, start):
+    """
+    Return every node reachable from a node, by plain BFS (for comparison).
+
+    Args:
+        csr (CSRGraph): Graph
+        start (int): Start node index
+
+    Returns:
+        bytearray: 1 for every node reached
+    """
+    offsets, targets = csr.offsets, csr.targets
+    visited = bytearray(csr.num_nodes)
+    visited[start] = 1
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                queue.append(neighbor)
+    return visited
+
+
+def display_summary(index, build_time, csr):
+    """
+    Display the SCC structure of a graph.
+
+    Args:
+        index (ReachabilityIndex): Index for the graph
+        build_time (float): Seconds taken to build the index
+        csr (CSRGraph): Graph
+    """
+    sizes = index.sizes
+    largest = max(sizes) if len(sizes) else 0
+    print("\n" + "="*70)
+    print("STRONGLY CONNECTED COMPONENTS")
+    print("="*70)
+    print(f"Nodes: {csr.num_nodes}, Edges: {csr.num_edges}")
+    print(f"Components: {index.num_components}")
+    print(f"Largest Component: {largest} nodes")
+    print(f"Single-Node Components: {sizes.count(1)}")
+    print(f"Condensation Edges: {index.num_dag_edges}")
+    print(f"Build Time: {build_time:.6f} seconds")
+    print("="*70)
+    print()
+
+
+def main():
+    """
+    Main function to build the reachability index and answer a query.
+    """
+    args = sys.argv[1:]
+    compare = "--compare" in args
+    if compare:
+        args.remove("--compare")
+
+    target_node_id = None
+    if "--to" in args:
+        position = args.index("--to")
+        if position + 1 >= len(args):
+            print("Error: --to requires a node ID")
+            sys.exit(1)
+        target_node_id = args[position + 1]
+        del args[position:position + 2]
+
+    valid = (len(args) == 2 and target_node_id is not None or
+             len(args) in (1, 3, 4) and target_node_id is None)
+    if not valid:
+        print("Usage: python reachability.py <graph>")
+        print("       python reachability.py <graph> <node_id> <search_property> <search_value> [--compare]")
+        print("       python reachability.py <graph> <node_id> \"<criteria>\" [--compare]")
+        print("       python reachability.py <graph> <node_id> --to <node_id> [--compare]")
+        print()
+        print("  graph: small, medium, large, or a graph file (.json, .gbin, ...)")
+        print()
+        print("Options:")
+        print("  --compare: also answer the query with a BFS over the graph")
+        print()
+        print("Examples:")
+        print("  python reachability.py large")
+        print("  python reachability.py graph_large.json")
+        print("  python reachability.py graph_large.gbin node_12 type warehouse --compare")
+        print("  python reachability.py graph_large.json node_12 --to node_9876")
+        sys.exit(1)
+
+    filename = args[0]
+    node_id = args[1] if len(args) > 1 else None
+    search_property = search_value = None
+    if len(args) == 4:
+        search_property, search_value = args[2].lower(), args[3]
+    elif len(args) == 3:
+        search_property = args[2]
+
+    # Validate the search criteria before loading the graph
+    if search_property is not None:
+        try:
+            criteria = compile_criteria(search_property, search_value)
+        except ValueError as error:
+            print(f"Error: {error}")
+            sys.exit(1)
+
+    csr = open_graph(filename)
+
+    for name in (node_id, target_node_id):
+        if name is not None and name not in csr.index:
+            print(f"Error: Node '{name}' not found in the graph")
+            sys.exit(1)
+
+    start_time = time.time()
+    index = get_reachability_index(csr)
+    display_summary(index, time.time() - start_time, csr)
+    if node_id is None:
+        return
+
+    component = index.component[csr.index_of(node_id)]
+    print(f"{node_id} is in component {component} ({index.sizes[component]} nodes)")
+    if target_node_id is not None:
+        reachable, visited, time_taken = can_reach(csr, node_id, target_node_id)
+        answer = "can" if reachable else "cannot"
+        print(f"{node_id} {answer} reach {target_node_id} " +
+              f"({visited} components visited, {time_taken:.6f} seconds)")
+        expected = None
+        if compare:
+            expected = bool(_bfs_reachable(csr, csr.index_of(node_id))[csr.index_of(target_node_id)])
+    else:
+        reachable, time_taken = reaches_match(csr, node_id, criteria)
+        answer = "can" if reachable else "cannot"
+        print(f"{node_id} {answer} reach a node where {criteria.describe()} " +
+              f"({time_taken:.6f} seconds)")
+        total, total_time = count_matches(csr, criteria)
+        print(f"Matching nodes in the graph: {total} ({total_time:.6f} seconds)")
+        counts, _ = index.criteria_tables(csr, criteria)
+        print(f"Matching nodes in {node_id}'s component: {counts[component]}")
+        reachable_count, count_time = count_matches(csr, criteria, node_id=node_id)
+        print(f"Matching nodes reachable from {node_id}: {reachable_count} " +
+              f"({count_time:.6f} seconds)")
+        if compare:
+            bfs_start = time.time()
+            visited = _bfs_reachable(csr, csr.index_of(node_id))
+            mask = criteria.mask(csr)
+            bfs_count = sum(1 for i in range(csr.num_nodes) if visited[i] and mask[i])
+            print(f"BFS: {bfs_count} matching nodes reachable " +
+                  f"({time.time() - bfs_start:.6f} seconds)")
+            expected = bfs_count > 0
+            if bfs_count != reachable_count:
+                print("Warning: the BFS counted a different number of nodes")
+
+    if compare:
+        if expected == reachable:
+            print("BFS gives the same answer")
+        else:
+            print("Warning: the BFS gives a different answer")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Search Result Cache
+===================
+This module caches the results of property searches so that repeated
+queries against the same graph are answered without searching again.
+
+Results are keyed on
+
+    (graph version, algorithm, criteria, start node, limit)
+
+where the graph version is a content hash of everything a search result
+depends on: the CSR arrays, the node IDs, the searchable attributes and
+the coordinates used by the greedy heuristic. It is computed once per
+loaded graph (see CSRGraph.derived_structure()), so modifying a graph and
+invalidating its GraphHandle gives it a new version and old results are
+never served for it. Criteria are keyed on their canonical text (see
+search_criteria.py), so "type warehouse" and "type=warehouse" share a
+result.
+
+The in-memory tier is an LRU bounded both by the number of entries and by
+their approximate size in bytes. With a directory, results are also
+written there (one pickle file per key) and read back on a memory miss, so
+they survive process restarts. Only point a cache at directories you
+trust: entries are loaded with pickle.
+
+Usage:
+    cache = ResultCache(max_entries=256, max_bytes=64 * 1024 * 1024, directory=".search_cache")
+    found, explored, time_taken = cached_search(graph, "bfs", "type", "warehouse", cache=cache)
+    print(cache.stats())
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from array import array
+from collections import OrderedDict
+
+from attribute_index import graph_fingerprint
+from attribute_index import indexed_search
+from bfs_search import bfs_search, bfs_search_all_components
+from csr_graph import as_csr_graph
+from greedy_search import greedy_search, greedy_search_all_components
+from search_criteria import check_limit, compile_criteria
+from shortest_path import node_coordinates
+
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+CACHE_EXTENSION = ".result"
+
+ALGORITHMS = ["bfs", "greedy", "indexed"]
+
+# Traversals: algorithm -> (search from one start node, search all components)
+_TRAVERSALS = {
+    "bfs": (bfs_search, bfs_search_all_components),
+    "greedy": (greedy_search, greedy_search_all_components)
+}
+
+
+def _content_hash(csr):
+    """
+    Hash everything a search result depends on.
+
+    Args:
+        csr (CSRGraph): Graph
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for column in (csr.offsets, csr.targets, csr.weights):
+        digest.update(memoryview(column).cast('B'))
+    for node_id in csr.node_ids:
+        digest.update(node_id.encode("utf-8") + b"\0")
+    digest.update(repr(graph_fingerprint(csr)).encode("utf-8"))
+    for values in node_coordinates(csr):
+        digest.update(array('d', values))
+    return digest.hexdigest()
+
+
+def graph_version(graph):
+    """
+    Return the content hash of a graph, computing it once per loaded graph.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+
+    Returns:
+        str: Hex digest that changes whenever search results could change
+    """
+    return as_csr_graph(graph).derived_structure("content_hash", _content_hash)
+
+
+class ResultCache:
+    """
+    LRU cache of search results with an optional on-disk tier.
+
+    Attributes:
+        max_entries (int): Most results kept in memory
+        max_bytes (int): Most bytes (pickled size) kept in memory
+        directory (str or None): Directory of the on-disk tier
+        hits (int): Lookups answered from memory
+        disk_hits (int): Lookups answered from the on-disk tier
+        misses (int): Lookups not answered
+        evictions (int): Results dropped from memory to stay within bounds
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES,
+                 directory=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._entries = OrderedDict()  # key -> (value, size in bytes)
+        self._bytes = 0
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _path(self, key):
+        """
+        Return the on-disk file of a key.
+
+        Args:
+            key (tuple): Cache key
+
+        Returns:
+            str: File in the cache directory
+        """
+        name = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + CACHE_EXTENSION)
+
+    def _remember(self, key, value, size):
+        """
+        Put a result in the memory tier and evict down to the bounds.
+
+        Args:
+            key (tuple): Cache key
+            value: Result
+            size (int): Approximate size in bytes
+        """
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def get(self, key):
+        """
+        Look up a result, in memory first and then on disk.
+
+        Args:
+            key (tuple): Cache key
+
+        Returns:
+            object or None: Cached result, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        if self.directory is not None:
+            try:
+                with open(self._path(key), 'rb') as f:
+                    data = f.read()
+                stored_key, value = pickle.loads(data)
+            except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+                stored_key = None
+            if stored_key == key:
+                self.disk_hits += 1
+                self._remember(key, value, len(data))
+                return value
+
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """
+        Store a result in memory and, with a directory, on disk.
+
+        Args:
+            key (tuple): Cache key
+            value: Result (must be picklable)
+        """
+        data = pickle.dumps((key, value), protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, value, len(data))
+
+        if self.directory is not None:
+            # Write to a temporary file first so readers never see half a result
+            handle, temporary = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(handle, 'wb') as f:
+                f.write(data)
+            os.replace(temporary, self._path(key))
+
+    def clear(self, disk=False):
+        """
+        Drop every result from memory (and from disk with disk=True).
+
+        Args:
+            disk (bool): Also delete the on-disk tier's files
+        """
+        self._entries.clear()
+        self._bytes = 0
+        if disk and self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(CACHE_EXTENSION):
+                    os.remove(os.path.join(self.directory, name))
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: entries, bytes, hits, disk_hits, misses, evictions
+        """
+        return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits,
+                "disk_hits": self.disk_hits, "misses": self.misses,
+                "evictions": self.evictions}
+
+
+# Cache used when cached_search() is not given one
+default_cache = ResultCache()
+
+
+def cached_search(graph, algorithm, search_property, search_value=None, start_node_id=None,
+                  limit=None, cache=None):
+    """
+    Run a property search, answering from the cache when possible.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        algorithm (str): "bfs", "greedy" or "indexed"
+        search_property (str): Property to search by, a criteria expression
+            such as "type=hub and priority=5", or compiled criteria
+        search_value (str): Value to match (None for expressions)
+        start_node_id (str): Starting node ID, or None for all components
+            (ignored by "indexed")
+        limit (int): Stop after this many matches (None for all)
+        cache (ResultCache): Cache to use (default_cache if None)
+
+    Returns:
+        tuple: (found_nodes, nodes_explored, time_taken) as returned by the
+            search; on a hit time_taken is the lookup time
+
+    Raises:
+        ValueError: If the algorithm, the criteria or the limit are invalid
+    """
+    start_time = time.time()
+
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{algorithm}'")
+    criteria = compile_criteria(search_property, search_value)
+    check_limit(limit)
+    if cache is None:
+        cache = default_cache
+    if algorithm == "indexed":
+        start_node_id = None
+
+    key = (graph_version(graph), algorithm, criteria.describe(), start_node_id, limit)
+    result = cache.get(key)
+    if result is not None:
+        found_nodes, nodes_explored = result
+        return list(found_nodes), nodes_explored, time.time() - start_time
+
+    if algorithm == "indexed":
+        found_nodes, nodes_explored, _ = indexed_search(graph, criteria, limit=limit)
+    elif start_node_id is None:
+        search = _TRAVERSALS[algorithm][1]
+        found_nodes, nodes_explored, _ = search(graph, criteria, None, limit=limit)
+    else:
+        search = _TRAVERSALS[algorithm][0]
+        found_nodes, nodes_explored, _ = search(graph, start_node_id, criteria, None,
+                                                limit=limit)
+    cache.put(key, (tuple(found_nodes), nodes_explored))
+
+    return found_nodes, nodes_explored, time.time() - start_time
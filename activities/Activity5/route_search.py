@@ -0,0 +1,396 @@
+"""
+Point-to-Point Routing (Bidirectional BFS / Dijkstra)
+=====================================================
+This module finds a route between two given nodes.
+
+A one-sided search from the source explores everything closer than the
+target before it reaches it. A bidirectional search runs a forward search
+from the source over the outgoing edges and a backward search from the
+target over the incoming edges (the reverse graph, see
+CSRGraph.reverse()), and stops when the two meet in the middle. Each side
+only has to cover about half the distance, so far fewer nodes are settled.
+
+Two modes are provided:
+- bidirectional BFS: fewest hops, ignoring edge weights
+- bidirectional Dijkstra: lowest total edge weight
+
+One-sided versions (bfs_route here, dijkstra_route in shortest_path.py) are
+used for comparison.
+With --alt, routes are found by A* with landmark lower bounds instead
+(see landmarks.py).
+
+Usage:
+    python route_search.py <graph_size> <source_node_id> <target_node_id> [--unweighted | --alt] [--compare]
+
+    graph_size: small, medium, or large
+    source_node_id: node to route from, e.g. node_12
+    target_node_id: node to route to, e.g. node_9876
+    --unweighted: fewest hops (bidirectional BFS) instead of lowest cost
+    --alt: lowest cost with landmark-guided A* (ALT)
+    --compare: also run the one-sided search and compare the work done
+
+Examples:
+    python route_search.py small node_0 node_400
+    python route_search.py large node_12 node_9876 --compare
+    python route_search.py large node_12 node_9876 --unweighted
+    python route_search.py large node_12 node_9876 --alt --compare
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import heapq
+import math
+import sys
+import time
+
+from csr_graph import as_csr_graph, get_metadata, get_node
+from graph_stream import open_named_graph
+from landmarks import alt_route, get_landmark_index
+from shortest_path import dijkstra_route
+
+
+# Longest path printed in full by display_results()
+PATH_DISPLAY_LIMIT = 12
+
+
+def _join_paths(forward_parent, backward_parent, node_ids, meeting):
+    """
+    Build the full route through the node where the two searches met.
+
+    Args:
+        forward_parent (dict): Predecessor of each node towards the source
+        backward_parent (dict): Successor of each node towards the target
+        node_ids (list): Node ID string per index
+        meeting (int): Node reached by both searches
+
+    Returns:
+        list: Node IDs from the source to the target
+    """
+    path = []
+    index = meeting
+    while index != -1:
+        path.append(node_ids[index])
+        index = forward_parent[index]
+    path.reverse()
+
+    index = backward_parent[meeting]
+    while index != -1:
+        path.append(node_ids[index])
+        index = backward_parent[index]
+    return path
+
+
+def bidirectional_bfs(graph, source_node_id, target_node_id):
+    """
+    Find the route with the fewest hops by searching from both ends.
+
+    Bidirectional BFS Algorithm:
+    1. Keep one BFS frontier growing forward from the source and one
+       growing backward from the target
+    2. Always expand one whole level of the smaller frontier
+    3. When a newly reached node has already been reached by the other
+       side, the searches have met; finish the level and keep the
+       shortest meeting
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        source_node_id (str): Node to route from
+        target_node_id (str): Node to route to
+
+    Returns:
+        tuple: (path, hops, nodes_explored, time_taken)
+            path (list): Node IDs from source to target (empty if unreachable)
+            hops (int or None): Number of edges on the path
+            nodes_explored (int): Nodes expanded by both searches
+            time_taken (float): Time in seconds
+    """
+    start_time = time.time()
+
+    csr = as_csr_graph(graph)
+    source, target = csr.index_of(source_node_id), csr.index_of(target_node_id)
+    sides = [
+        # (graph to expand, hops from own end, parents, frontier)
+        (csr, {source: 0}, {source: -1}, [source]),
+        (csr.reverse(), {target: 0}, {target: -1}, [target])
+    ]
+    nodes_explored = 0
+    best, meeting = (0, source) if source == target else (math.inf, None)
+
+    while meeting is None and sides[0][3] and sides[1][3]:
+        # Expand the side with the smaller frontier
+        side = 0 if len(sides[0][3]) <= len(sides[1][3]) else 1
+        expand, hops, parent, frontier = sides[side]
+        other_hops = sides[1 - side][1]
+        offsets, targets = expand.offsets, expand.targets
+
+        next_frontier = []
+        for current in frontier:
+            nodes_explored += 1
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if neighbor in hops:
+                    continue
+                hops[neighbor] = hops[current] + 1
+                parent[neighbor] = current
+                next_frontier.append(neighbor)
+
+                # Met the other search: remember the shortest meeting
+                if neighbor in other_hops:
+                    total = hops[neighbor] + other_hops[neighbor]
+                    if total < best:
+                        best, meeting = total, neighbor
+
+        sides[side] = (expand, hops, parent, next_frontier)
+
+    if meeting is None:
+        path, best = [], None
+    else:
+        path = _join_paths(sides[0][2], sides[1][2], csr.node_ids, meeting)
+
+    end_time = time.time()
+    return path, best, nodes_explored, end_time - start_time
+
+
+def bidirectional_dijkstra(graph, source_node_id, target_node_id):
+    """
+    Find the lowest-cost route by running Dijkstra from both ends.
+
+    Bidirectional Dijkstra Algorithm:
+    1. Run Dijkstra forward from the source and backward from the target
+       (over the reverse graph)
+    2. Always settle the node with the lowest cost on either side
+    3. Whenever an edge reaches a node labelled by the other side, a
+       complete route is known; keep the cheapest one (mu)
+    4. Stop when the two smallest frontier costs add up to at least mu:
+       no undiscovered route can be cheaper
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        source_node_id (str): Node to route from
+        target_node_id (str): Node to route to
+
+    Returns:
+        tuple: (path, cost, nodes_settled, time_taken)
+            path (list): Node IDs from source to target (empty if unreachable)
+            cost (float or None): Total edge weight of the path
+            nodes_settled (int): Nodes settled by both searches
+            time_taken (float): Time in seconds
+    """
+    start_time = time.time()
+
+    csr = as_csr_graph(graph)
+    source, target = csr.index_of(source_node_id), csr.index_of(target_node_id)
+    sides = [
+        # (graph to expand, best known cost, parents, settled, frontier)
+        (csr, {source: 0.0}, {source: -1}, set(), [(0.0, source)]),
+        (csr.reverse(), {target: 0.0}, {target: -1}, set(), [(0.0, target)])
+    ]
+    best, meeting = (0.0, source) if source == target else (math.inf, None)
+
+    while sides[0][4] and sides[1][4]:
+        # Stop once no route through unsettled nodes can beat the best one
+        if sides[0][4][0][0] + sides[1][4][0][0] >= best:
+            break
+
+        # Settle the cheaper of the two frontier nodes
+        side = 0 if sides[0][4][0][0] <= sides[1][4][0][0] else 1
+        expand, cost, parent, settled, frontier = sides[side]
+        other_cost = sides[1 - side][1]
+
+        current_cost, current = heapq.heappop(frontier)
+        # Skip outdated queue entries for nodes settled at a lower cost
+        if current in settled:
+            continue
+        settled.add(current)
+
+        offsets, targets, weights = expand.offsets, expand.targets, expand.weights
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[k]
+            new_cost = current_cost + weights[k]
+            if new_cost < cost.get(neighbor, math.inf):
+                cost[neighbor] = new_cost
+                parent[neighbor] = current
+                heapq.heappush(frontier, (new_cost, neighbor))
+
+            # Route source -> ... -> neighbor -> ... -> target
+            if neighbor in other_cost and cost[neighbor] + other_cost[neighbor] < best:
+                best, meeting = cost[neighbor] + other_cost[neighbor], neighbor
+
+    nodes_settled = len(sides[0][3]) + len(sides[1][3])
+    if meeting is None:
+        path, best = [], None
+    else:
+        path = _join_paths(sides[0][2], sides[1][2], csr.node_ids, meeting)
+
+    end_time = time.time()
+    return path, best, nodes_settled, end_time - start_time
+
+
+def bfs_route(graph, source_node_id, target_node_id):
+    """
+    Find the route with the fewest hops with a one-sided BFS.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        source_node_id (str): Node to route from
+        target_node_id (str): Node to route to
+
+    Returns:
+        tuple: (path, hops, nodes_explored, time_taken), as bidirectional_bfs()
+    """
+    start_time = time.time()
+
+    csr = as_csr_graph(graph)
+    offsets, targets, node_ids = csr.offsets, csr.targets, csr.node_ids
+    source, target = csr.index_of(source_node_id), csr.index_of(target_node_id)
+
+    parent = {source: -1}
+    frontier = [source]
+    nodes_explored = 0
+    while frontier and target not in parent:
+        next_frontier = []
+        for current in frontier:
+            nodes_explored += 1
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if neighbor not in parent:
+                    parent[neighbor] = current
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+
+    path = []
+    if target in parent:
+        index = target
+        while index != -1:
+            path.append(node_ids[index])
+            index = parent[index]
+        path.reverse()
+
+    end_time = time.time()
+    return path, (len(path) - 1 if path else None), nodes_explored, end_time - start_time
+
+
+def display_results(title, path, cost, nodes_settled, time_taken, graph, unweighted):
+    """
+    Display a route in a formatted manner.
+
+    Args:
+        title (str): Heading, e.g. "BIDIRECTIONAL DIJKSTRA"
+        path (list): Node IDs from source to target
+        cost (float or None): Route cost (hops when unweighted)
+        nodes_settled (int): Nodes settled or explored by the search
+        time_taken (float): Time in seconds
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        unweighted (bool): Whether cost counts hops
+    """
+    print("\n" + "="*70)
+    print(f"{title} ROUTE")
+    print("="*70)
+    metadata = get_metadata(graph)
+    print(f"Graph: {metadata['graph_type']} ({metadata['num_nodes']} nodes)")
+    print(f"Nodes Settled: {nodes_settled}")
+    print(f"Time Taken: {time_taken:.6f} seconds")
+    print("="*70)
+
+    if path:
+        if unweighted:
+            print(f"\nRoute: {cost} hops")
+        else:
+            print(f"\nRoute: cost {cost:g}, {len(path) - 1} hops")
+        if len(path) > PATH_DISPLAY_LIMIT:
+            shown = path[:PATH_DISPLAY_LIMIT // 2] + ["..."] + path[-PATH_DISPLAY_LIMIT // 2:]
+        else:
+            shown = path
+        print(f"  {' -> '.join(shown)}")
+        source, target = get_node(graph, path[0]), get_node(graph, path[-1])
+        print(f"  From: {source['name']} (ID: {path[0]})")
+        print(f"  To:   {target['name']} (ID: {path[-1]})")
+    else:
+        print("\nNo route exists between the two nodes.")
+
+    print()
+
+
+def main():
+    """
+    Main function to run point-to-point routing from command line.
+    """
+    # Check command line arguments
+    args = sys.argv[1:]
+    unweighted = "--unweighted" in args
+    if unweighted:
+        args.remove("--unweighted")
+    use_landmarks = "--alt" in args
+    if use_landmarks:
+        args.remove("--alt")
+    compare = "--compare" in args
+    if compare:
+        args.remove("--compare")
+
+    if len(args) != 3 or (unweighted and use_landmarks):
+        print("Usage: python route_search.py <graph_size> <source_node_id> <target_node_id> [--unweighted | --alt] [--compare]")
+        print()
+        print("Arguments:")
+        print("  graph_size: small, medium, or large")
+        print("  source_node_id: node to route from, e.g. node_12")
+        print("  target_node_id: node to route to, e.g. node_9876")
+        print("  --unweighted: fewest hops (bidirectional BFS) instead of lowest cost")
+        print("  --alt: lowest cost with landmark-guided A* (ALT)")
+        print("  --compare: also run the one-sided search and compare the work done")
+        print()
+        print("Examples:")
+        print("  python route_search.py small node_0 node_400")
+        print("  python route_search.py large node_12 node_9876 --compare")
+        print("  python route_search.py large node_12 node_9876 --unweighted")
+        print("  python route_search.py large node_12 node_9876 --alt --compare")
+        sys.exit(1)
+
+    # Parse arguments
+    graph_size = args[0].lower()
+    source_node_id = args[1]
+    target_node_id = args[2]
+
+    # Validate graph size
+    if graph_size not in ["small", "medium", "large"]:
+        print(f"Error: Invalid graph size '{graph_size}'")
+        print("Valid options: small, medium, large")
+        sys.exit(1)
+
+    # Load graph (memory-mapped .gbin if present, else streamed from JSON or graphs.zip)
+    graph = open_named_graph(graph_size)
+    metadata = get_metadata(graph)
+    print(f"Loaded graph with {metadata['num_nodes']} nodes " +
+          f"and {metadata['num_edges']} edges")
+
+    csr = as_csr_graph(graph)
+    for node_id in (source_node_id, target_node_id):
+        if node_id not in csr.index:
+            print(f"Error: Node '{node_id}' not found in the graph")
+            sys.exit(1)
+
+    # The reverse graph (and landmarks) are prepared once and reused by later queries
+    csr.reverse()
+    if use_landmarks:
+        print("Preparing landmarks (loaded from the .alt file, or built and saved to it)...")
+        get_landmark_index(csr, save=True)
+
+    print(f"\nRouting from {source_node_id} to {target_node_id}...")
+    if unweighted:
+        searches = [("BIDIRECTIONAL BFS", bidirectional_bfs)]
+        if compare:
+            searches.append(("ONE-SIDED BFS", bfs_route))
+    elif use_landmarks:
+        searches = [("ALT (LANDMARK A*)", alt_route)]
+        if compare:
+            searches.append(("ONE-SIDED DIJKSTRA", dijkstra_route))
+    else:
+        searches = [("BIDIRECTIONAL DIJKSTRA", bidirectional_dijkstra)]
+        if compare:
+            searches.append(("ONE-SIDED DIJKSTRA", dijkstra_route))
+
+    for title, search in searches:
+        path, cost, nodes_settled, time_taken = search(graph, source_node_id, target_node_id)
+        display_results(title, path, cost, nodes_settled, time_taken, graph, unweighted)
+
+
+if __name__ == "__main__":
+    main()
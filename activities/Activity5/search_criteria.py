@@ -0,0 +1,340 @@
+"""
+Compiled Search Criteria
+========================
+This module turns search criteria into validated predicate objects once,
+before a traversal starts.
+
+The original matches_search_criteria() in bfs_search.py and
+greedy_search.py walked an if/elif chain on the property name and parsed
+the value with int() for every node it checked, printing an error per
+node when the value was invalid. Here the property and value are checked once, and a predicate can
+either be called on a node dictionary or turned into a match mask: a
+bytearray with one byte per node (1 = match) computed over the attribute
+columns in one pass. The search loops then only test mask[node].
+
+Criteria can be combined with AND/OR:
+
+    type=warehouse and capacity_min=3000
+    region=north or region=south
+    type=hub and priority=5 or type=depot
+
+"and" binds tighter than "or", as in Python.
+
+Usage:
+    criteria = compile_criteria("type", "warehouse")
+    criteria = parse_criteria("type=warehouse and region=north")
+    mask = criteria.mask(csr)
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import re
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; masks fall back to pure Python
+    np = None
+
+from csr_graph import as_csr_graph, graph_nodes
+
+
+# Supported search properties: property -> (node attribute, comparison)
+SEARCH_PROPERTIES = {
+    "type": ("type", "eq"),
+    "region": ("region", "eq"),
+    "capacity_min": ("capacity", "ge"),
+    "capacity_max": ("capacity", "le"),
+    "priority": ("priority", "eq")
+}
+
+# Properties whose value must be an integer
+INTEGER_PROPERTIES = ["capacity_min", "capacity_max", "priority"]
+
+_OR = re.compile(r"(?:^|\s+)or(?:\s+|$)", re.IGNORECASE)
+_AND = re.compile(r"(?:^|\s+)and(?:\s+|$)", re.IGNORECASE)
+
+
+def _combine_masks(masks, operator):
+    """
+    Combine 0/1 byte masks with a bitwise AND or OR.
+
+    The masks are treated as big integers, so the combination runs in C
+    without NumPy.
+
+    Args:
+        masks (list): bytearrays of equal length
+        operator (str): "and" or "or"
+
+    Returns:
+        bytearray: Combined mask
+    """
+    length = len(masks[0])
+    combined = int.from_bytes(masks[0], "little")
+    for mask in masks[1:]:
+        if operator == "and":
+            combined &= int.from_bytes(mask, "little")
+        else:
+            combined |= int.from_bytes(mask, "little")
+    return bytearray(combined.to_bytes(length, "little"))
+
+
+class Criterion:
+    """
+    A single validated search criterion such as capacity_min >= 3000.
+
+    Attributes:
+        search_property (str): Property searched (type, region, ...)
+        search_value (str or int): Value to match, parsed for integer properties
+        attribute (str): Node attribute compared
+        comparison (str): "eq", "ge" or "le"
+    """
+
+    def __init__(self, search_property, search_value):
+        if search_property not in SEARCH_PROPERTIES:
+            raise ValueError(f"Unknown search property '{search_property}'")
+
+        if search_property in INTEGER_PROPERTIES:
+            try:
+                search_value = int(search_value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{search_property} requires an integer value") from None
+
+        self.search_property = search_property
+        self.search_value = search_value
+        self.attribute, self.comparison = SEARCH_PROPERTIES[search_property]
+
+    def __call__(self, node):
+        """
+        Check whether a node dictionary matches.
+
+        Args:
+            node (dict): Node data
+
+        Returns:
+            bool: True if the node matches
+        """
+        value = node[self.attribute]
+        if self.comparison == "eq":
+            return value == self.search_value
+        if self.comparison == "ge":
+            return value >= self.search_value
+        return value <= self.search_value
+
+    def mask(self, graph):
+        """
+        Evaluate the criterion for every node at once.
+
+        Uses the graph's attribute columns when it has them (bytes.translate
+        for categorical codes, NumPy comparisons for integers when NumPy is
+        installed), otherwise calls the predicate once per node.
+
+        Args:
+            graph (dict, CSRGraph or GraphHandle): Graph structure
+
+        Returns:
+            bytearray: One byte per node index, 1 where the node matches
+        """
+        csr = as_csr_graph(graph)
+        columns = csr.columns
+
+        if columns is None or self.attribute not in columns:
+            return bytearray(map(self, graph_nodes(csr)))
+
+        column = columns[self.attribute]
+        if csr.categories is not None and self.attribute in csr.categories:
+            table = bytearray(256)
+            for code, name in enumerate(csr.categories[self.attribute]):
+                table[code] = name == self.search_value
+            return bytearray(bytes(column).translate(table))
+
+        if np is not None:
+            values = np.asarray(column)
+            if self.comparison == "eq":
+                matches = values == self.search_value
+            elif self.comparison == "ge":
+                matches = values >= self.search_value
+            else:
+                matches = values <= self.search_value
+            return bytearray(matches.astype(np.uint8).tobytes())
+
+        target = self.search_value
+        if self.comparison == "eq":
+            return bytearray(value == target for value in column)
+        if self.comparison == "ge":
+            return bytearray(value >= target for value in column)
+        return bytearray(value <= target for value in column)
+
+    def describe(self):
+        """
+        Return the criterion in the textual form accepted by parse_criteria().
+
+        Returns:
+            str: e.g. "capacity_min=3000"
+        """
+        return f"{self.search_property}={self.search_value}"
+
+
+class CompoundCriteria:
+    """
+    Several criteria combined with AND or OR.
+
+    Attributes:
+        operator (str): "and" or "or"
+        children (list): Criterion or CompoundCriteria objects
+    """
+
+    def __init__(self, operator, children):
+        if operator not in ("and", "or"):
+            raise ValueError(f"Unknown operator '{operator}'")
+        self.operator = operator
+        self.children = children
+
+    def __call__(self, node):
+        """
+        Check whether a node dictionary matches.
+
+        Args:
+            node (dict): Node data
+
+        Returns:
+            bool: True if the node matches
+        """
+        if self.operator == "and":
+            return all(child(node) for child in self.children)
+        return any(child(node) for child in self.children)
+
+    def mask(self, graph):
+        """
+        Evaluate the combined criteria for every node at once.
+
+        Args:
+            graph (dict, CSRGraph or GraphHandle): Graph structure
+
+        Returns:
+            bytearray: One byte per node index, 1 where the node matches
+        """
+        return _combine_masks([child.mask(graph) for child in self.children],
+                              self.operator)
+
+    def describe(self):
+        """
+        Return the criteria in the textual form accepted by parse_criteria().
+
+        Returns:
+            str: e.g. "type=hub and priority=5"
+        """
+        return f" {self.operator} ".join(child.describe() for child in self.children)
+
+
+def parse_criteria(expression):
+    """
+    Parse a textual criteria expression.
+
+    Terms have the form property=value and are combined with "and"/"or";
+    "and" binds tighter than "or".
+
+    Args:
+        expression (str): e.g. "type=warehouse and capacity_min=3000"
+
+    Returns:
+        Criterion or CompoundCriteria: Validated criteria
+
+    Raises:
+        ValueError: If a term is malformed, a property is unknown or a
+            value is invalid
+    """
+    alternatives = []
+    for alternative in _OR.split(expression.strip()):
+        terms = []
+        for term in _AND.split(alternative.strip()):
+            search_property, separator, search_value = term.partition("=")
+            if not separator or not search_property.strip():
+                raise ValueError(f"Expected property=value, got '{term}'")
+            terms.append(Criterion(search_property.strip().lower(), search_value.strip()))
+        alternatives.append(terms[0] if len(terms) == 1 else CompoundCriteria("and", terms))
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return CompoundCriteria("or", alternatives)
+
+
+def compile_criteria(search_property, search_value=None):
+    """
+    Compile search criteria once, before a traversal.
+
+    Accepts the (search_property, search_value) pair used by the search
+    functions, a textual expression (with search_value None), or criteria
+    that are already compiled.
+
+    Args:
+        search_property (str, Criterion or CompoundCriteria): Property,
+            expression or compiled criteria
+        search_value (str): Value to match for a single property
+
+    Returns:
+        Criterion or CompoundCriteria: Validated criteria
+
+    Raises:
+        ValueError: If the criteria are invalid
+    """
+    if isinstance(search_property, (Criterion, CompoundCriteria)):
+        return search_property
+    if search_value is None:
+        return parse_criteria(search_property)
+    return Criterion(search_property, search_value)
+
+
+def compile_or_report(search_property, search_value=None):
+    """
+    Compile criteria, printing a single error if they are invalid.
+
+    Invalid criteria are reported once and then match no nodes, which is
+    what matches_search_criteria() did node by node.
+
+    Args:
+        search_property: Property, expression or compiled criteria
+        search_value (str): Value to match for a single property
+
+    Returns:
+        Criterion, CompoundCriteria or None: Criteria, or None if invalid
+    """
+    try:
+        return compile_criteria(search_property, search_value)
+    except ValueError as error:
+        print(f"Error: {error}")
+        return None
+
+
+def check_limit(limit):
+    """
+    Validate the optional match limit of a search.
+
+    Args:
+        limit (int or None): Maximum number of matches, or None for all
+
+    Raises:
+        ValueError: If the limit is not a non-negative integer
+    """
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or
+                              limit < 0):
+        raise ValueError(f"limit must be a non-negative integer, got {limit!r}")
+
+
+def match_mask(graph, search_property, search_value=None):
+    """
+    Compile criteria and return their match mask, reporting invalid criteria once.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        search_property: Property, expression or compiled criteria
+        search_value (str): Value to match for a single property
+
+    Returns:
+        bytearray: One byte per node index, 1 where the node matches
+            (all zeros if the criteria are invalid)
+    """
+    csr = as_csr_graph(graph)
+    criteria = compile_or_report(search_property, search_value)
+    if criteria is None:
+        return bytearray(csr.num_nodes)
+    return criteria.mask(csr)
@@ -0,0 +1,594 @@
+"""
+Weighted Shortest-Path Search (Dijkstra / A*)
+=============================================
+This module finds the nearest nodes matching search criteria by route cost,
+using the edge weights that bfs_search.py and greedy_search.py ignore.
+
+Dijkstra's algorithm settles nodes in order of their distance from the
+source, so the first k matching nodes it settles are the k nearest by
+route cost. A* settles nodes in order of distance plus an admissible
+estimate of the remaining cost: the straight-line (Euclidean) distance from
+the node's coordinates to the nearest matching node, scaled by the smallest
+weight-per-unit-distance of any edge in the graph. Because that estimate
+never overestimates, A* returns exactly the same matches and costs while
+settling fewer nodes.
+
+When to use A*: the heuristic costs O(matching nodes) per node it is
+computed for, and on the generated graphs the bound is loose (short edges
+with rounded-down weights pull the scale to about 0.4), so A* settles only
+5-30% fewer nodes than Dijkstra. On graph_large that saving did not pay for
+the heuristic even with 4 matching nodes. A* is worth trying on graphs
+whose weights follow straight-line distance closely and with selective
+criteria. It is only used when at most ASTAR_MAX_TARGETS nodes match;
+otherwise --astar runs Dijkstra, which returns the same results.
+
+Usage:
+    python shortest_path.py <graph_size> <source_node_id> <search_property> <search_value> [--astar] [--k K]
+    python shortest_path.py <graph_size> <source_node_id> "<criteria>" [--astar] [--k K]
+
+    graph_size: small, medium, or large
+    source_node_id: node to route from, e.g. node_0
+    search_property: type, region, capacity_min, capacity_max, priority
+    search_value: value to search for
+    criteria: property=value terms combined with "and"/"or"
+    --astar: use A* with the Euclidean heuristic instead of Dijkstra
+    --k K: number of nearest matching nodes to return (default 1)
+
+Examples:
+    python shortest_path.py small node_0 type depot
+    python shortest_path.py medium node_12 type warehouse --k 5
+    python shortest_path.py large node_0 "type=depot and capacity_min=4900" --astar
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import heapq
+import math
+import sys
+import time
+from array import array
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; heuristics fall back to pure Python
+    np = None
+
+from csr_graph import as_csr_graph, get_metadata, get_node
+from graph_stream import open_named_graph
+from node_columns import numeric_column
+from search_criteria import compile_criteria, match_mask
+
+
+ALGORITHMS = ["dijkstra", "astar"]
+
+# A* is only used when at most this many nodes match (see module docstring)
+ASTAR_MAX_TARGETS = 64
+
+# Longest path printed in full by display_results()
+PATH_DISPLAY_LIMIT = 12
+
+
+def _node_coordinates(csr):
+    """
+    Return the x and y coordinates of every node, in node index order.
+
+    Args:
+        csr (CSRGraph): Graph
+
+    Returns:
+        tuple: (xs, ys) lists of floats
+    """
+    return list(numeric_column(csr, "x")), list(numeric_column(csr, "y"))
+
+
+def node_coordinates(graph):
+    """
+    Return the coordinates of every node, computed once per graph.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+
+    Returns:
+        tuple: (xs, ys) lists of floats by integer node index
+    """
+    return as_csr_graph(graph).derived_structure("coordinates", _node_coordinates)
+
+
+def _euclidean_scale(csr):
+    """
+    Return the smallest ratio of edge weight to straight-line edge length.
+
+    Args:
+        csr (CSRGraph): Graph
+
+    Returns:
+        float: Scale factor (0.0 if no edge has a positive length)
+    """
+    xs, ys = node_coordinates(csr)
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+
+    if np is not None and csr.num_edges:
+        counts = np.diff(np.asarray(offsets, dtype=np.int64))
+        sources = np.repeat(np.arange(csr.num_nodes), counts)
+        edge_targets = np.asarray(targets)
+        x, y = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+        lengths = np.hypot(x[edge_targets] - x[sources], y[edge_targets] - y[sources])
+        positive = lengths > 0
+        if not positive.any():
+            return 0.0
+        return float(np.min(np.asarray(weights, dtype=float)[positive] / lengths[positive]))
+
+    scale = math.inf
+    for source in range(csr.num_nodes):
+        for k in range(offsets[source], offsets[source + 1]):
+            target = targets[k]
+            length = math.hypot(xs[target] - xs[source], ys[target] - ys[source])
+            if length > 0:
+                scale = min(scale, weights[k] / length)
+    return 0.0 if scale == math.inf else scale
+
+
+def euclidean_scale(graph):
+    """
+    Return the factor that turns straight-line distance into a cost bound.
+
+    For every edge, weight >= scale * length, so by the triangle inequality
+    scale * straight-line distance never exceeds the true route cost. The
+    generator's weights are the edge length with +-20% noise, rounded down
+    to an integer, so short edges pull the scale to about 0.4. Computed
+    once per graph.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+
+    Returns:
+        float: Scale factor for the Euclidean heuristic
+    """
+    return as_csr_graph(graph).derived_structure("euclidean_scale", _euclidean_scale)
+
+
+class EuclideanHeuristic:
+    """
+    Admissible A* heuristic towards the nearest of a set of target nodes.
+
+    h(v) = scale * min over targets t of |coordinates(v) - coordinates(t)|
+
+    Each node's value is computed the first time it is requested and then
+    kept. Computing it costs O(targets), which is why iter_nearest_matches()
+    only uses it for at most ASTAR_MAX_TARGETS targets.
+
+    Attributes:
+        scale (float): See euclidean_scale()
+        xs, ys (list): Coordinates of every node
+        target_xs, target_ys: Coordinates of the target nodes
+        values (dict): Heuristic values computed so far, by node index
+    """
+
+    def __init__(self, graph, match):
+        csr = as_csr_graph(graph)
+        self.scale = euclidean_scale(csr)
+        self.xs, self.ys = node_coordinates(csr)
+
+        targets = [i for i, matched in enumerate(match) if matched]
+        self.target_xs = [self.xs[i] for i in targets]
+        self.target_ys = [self.ys[i] for i in targets]
+        self.values = {}
+
+    def __call__(self, index):
+        """
+        Return the lower bound on the cost from a node to the nearest target.
+
+        Args:
+            index (int): Integer node index
+
+        Returns:
+            float: Heuristic value (0.0 when there are no targets)
+        """
+        value = self.values.get(index)
+        if value is None:
+            x, y = self.xs[index], self.ys[index]
+            if not self.target_xs:
+                value = 0.0
+            else:
+                # A plain loop beats NumPy's per-call overhead for a few targets
+                value = self.scale * min(math.hypot(tx - x, ty - y)
+                                         for tx, ty in zip(self.target_xs, self.target_ys))
+            self.values[index] = value
+        return value
+
+
+def _unpack_path(parent, node_ids, index):
+    """
+    Follow parent pointers back to the source.
+
+    Args:
+        parent (array): Predecessor index per node (-1 for the source)
+        node_ids (list): Node ID string per index
+        index (int): Last node of the path
+
+    Returns:
+        list: Node IDs from the source to the node
+    """
+    path = []
+    while index != -1:
+        path.append(node_ids[index])
+        index = parent[index]
+    path.reverse()
+    return path
+
+
+def iter_nearest_matches(graph, source_node_id, search_property, search_value=None,
+                         algorithm="dijkstra", stats=None):
+    """
+    Yield matching nodes in increasing order of route cost from a source.
+
+    Dijkstra's Algorithm:
+    1. Start from the source with cost 0
+    2. Always settle the unsettled node with the lowest known cost next
+    3. Use a priority queue (min-heap) keyed on cost to find it
+    4. Relax each outgoing edge: keep the cheaper of the known and new cost
+
+    A* orders the priority queue by cost + heuristic instead (see
+    EuclideanHeuristic). With a consistent heuristic every settled node
+    has its final cost and matches still come out in cost order. When
+    more than ASTAR_MAX_TARGETS nodes match, "astar" runs Dijkstra.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        source_node_id (str): Node to route from
+        search_property (str): Property to search by, a criteria expression
+            or compiled criteria (see search_criteria.py)
+        search_value (str): Value to match (None for expressions)
+        algorithm (str): "dijkstra" or "astar"
+        stats (dict): Optional dict; "nodes_settled" and "edges_relaxed" are
+            kept up to date whenever a match is yielded and when the search
+            ends, and "algorithm" is set to the algorithm actually run
+
+    Yields:
+        tuple: (node_id, cost, path) with path a list of node IDs from the
+            source to the match
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{algorithm}'")
+
+    csr = as_csr_graph(graph)
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    node_ids = csr.node_ids
+    source = csr.index_of(source_node_id)
+
+    # Criteria are validated and evaluated once: match[i] is 1 if node i matches
+    match = match_mask(csr, search_property, search_value)
+    heuristic = None
+    if algorithm == "astar" and match.count(1) <= ASTAR_MAX_TARGETS:
+        heuristic = EuclideanHeuristic(csr, match)
+    if stats is not None:
+        stats["algorithm"] = "dijkstra" if heuristic is None else "astar"
+
+    cost = [math.inf] * csr.num_nodes  # Best known cost per node
+    parent = array('i', [-1]) * csr.num_nodes  # Predecessor on the best path
+    settled = bytearray(csr.num_nodes)  # Nodes whose cost is final
+    cost[source] = 0.0
+    frontier = [(0.0 if heuristic is None else heuristic(source), source)]
+    nodes_settled = 0
+    edges_relaxed = 0
+
+    while frontier:
+        _, current = heapq.heappop(frontier)
+        # Skip outdated queue entries for nodes settled at a lower cost
+        if settled[current]:
+            continue
+        settled[current] = 1
+        nodes_settled += 1
+        current_cost = cost[current]
+
+        if match[current]:
+            if stats is not None:
+                stats["nodes_settled"] = nodes_settled
+                stats["edges_relaxed"] = edges_relaxed
+            yield node_ids[current], current_cost, _unpack_path(parent, node_ids, current)
+
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[k]
+            if settled[neighbor]:
+                continue
+            edges_relaxed += 1
+            new_cost = current_cost + weights[k]
+            if new_cost < cost[neighbor]:
+                cost[neighbor] = new_cost
+                parent[neighbor] = current
+                if heuristic is not None:
+                    heapq.heappush(frontier, (new_cost + heuristic(neighbor), neighbor))
+                else:
+                    heapq.heappush(frontier, (new_cost, neighbor))
+
+    if stats is not None:
+        stats["nodes_settled"] = nodes_settled
+        stats["edges_relaxed"] = edges_relaxed
+
+
+def nearest_matches(graph, source_node_id, search_property, search_value=None,
+                    k=1, algorithm="dijkstra"):
+    """
+    Find the k nearest nodes matching criteria by route cost.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        source_node_id (str): Node to route from
+        search_property (str): Property to search by, or a criteria expression
+        search_value (str): Value to match (None for expressions)
+        k (int): Number of matches to return (at least 1)
+        algorithm (str): "dijkstra" or "astar"
+
+    Returns:
+        tuple: (results, nodes_settled, time_taken)
+            results (list): (node_id, cost, path) tuples in cost order
+            nodes_settled (int): Nodes removed from the priority queue
+            time_taken (float): Time in seconds
+
+    Raises:
+        ValueError: If k is not a positive integer
+    """
+    if not isinstance(k, int) or isinstance(k, bool) or k < 1:
+        raise ValueError(f"k must be a positive integer, got {k!r}")
+
+    start_time = time.time()
+
+    stats = {}
+    matches = iter_nearest_matches(graph, source_node_id, search_property, search_value,
+                                   algorithm=algorithm, stats=stats)
+    results = list(islice(matches, k))
+
+    end_time = time.time()
+    time_taken = end_time - start_time
+
+    return results, stats.get("nodes_settled", 0), time_taken
+
+
+def dijkstra_costs(graph, sources):
+    """
+    Compute the route cost from a set of source nodes to every node.
+
+    A single Dijkstra run with every source starting at cost 0, so each
+    node gets the cost from its nearest source. Used for preprocessing
+    (see landmarks.py), where the whole graph has to be settled.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure (pass
+            csr.reverse() for costs *to* the sources)
+        sources (iterable): Integer indices of the source nodes
+
+    Returns:
+        array: Cost per node index ('d' array; inf where unreachable)
+    """
+    csr = as_csr_graph(graph)
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+
+    cost = array('d', [math.inf]) * csr.num_nodes
+    settled = bytearray(csr.num_nodes)
+    frontier = []
+    for source in sources:
+        cost[source] = 0.0
+        frontier.append((0.0, source))
+    heapq.heapify(frontier)
+
+    while frontier:
+        current_cost, current = heapq.heappop(frontier)
+        if settled[current]:
+            continue
+        settled[current] = 1
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[k]
+            new_cost = current_cost + weights[k]
+            if new_cost < cost[neighbor]:
+                cost[neighbor] = new_cost
+                heapq.heappush(frontier, (new_cost, neighbor))
+
+    return cost
+
+
+def dijkstra_route(graph, source_node_id, target_node_id):
+    """
+    Find the lowest-cost route between two nodes with plain Dijkstra.
+
+    The search stops as soon as the target is settled. This is the baseline
+    for the faster route queries in route_search.py and landmarks.py.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        source_node_id (str): Node to route from
+        target_node_id (str): Node to route to
+
+    Returns:
+        tuple: (path, cost, nodes_settled, time_taken)
+            path (list): Node IDs from source to target (empty if unreachable)
+            cost (float or None): Total edge weight of the path
+            nodes_settled (int): Nodes settled by the search
+            time_taken (float): Time in seconds
+    """
+    start_time = time.time()
+
+    csr = as_csr_graph(graph)
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    source, target = csr.index_of(source_node_id), csr.index_of(target_node_id)
+
+    cost = {source: 0.0}
+    parent = {source: -1}
+    settled = set()
+    frontier = [(0.0, source)]
+    while frontier:
+        current_cost, current = heapq.heappop(frontier)
+        if current in settled:
+            continue
+        settled.add(current)
+        if current == target:
+            break
+        for k in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[k]
+            new_cost = current_cost + weights[k]
+            if new_cost < cost.get(neighbor, math.inf):
+                cost[neighbor] = new_cost
+                parent[neighbor] = current
+                heapq.heappush(frontier, (new_cost, neighbor))
+
+    path = []
+    if target in settled:
+        index = target
+        while index != -1:
+            path.append(csr.node_ids[index])
+            index = parent[index]
+        path.reverse()
+
+    end_time = time.time()
+    return path, (cost[target] if path else None), len(settled), end_time - start_time
+
+
+def display_results(results, nodes_settled, time_taken, graph, source_node_id,
+                    search_property, search_value, algorithm):
+    """
+    Display shortest-path results in a formatted manner.
+
+    Args:
+        results (list): (node_id, cost, path) tuples in cost order
+        nodes_settled (int): Nodes settled by the search
+        time_taken (float): Time in seconds
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        source_node_id (str): Node routed from
+        search_property (str): Property searched, or a criteria expression
+        search_value (str): Value searched for (None for expressions)
+        algorithm (str): "dijkstra" or "astar"
+    """
+    print("\n" + "="*70)
+    print("SHORTEST PATH SEARCH RESULTS")
+    print("="*70)
+    metadata = get_metadata(graph)
+    print(f"Graph: {metadata['graph_type']} ({metadata['num_nodes']} nodes)")
+    print(f"Algorithm: {'A*' if algorithm == 'astar' else 'Dijkstra'}")
+    print(f"Source: {source_node_id}")
+    if search_value is None:
+        print(f"Search Criteria: {search_property}")
+    else:
+        print(f"Search Property: {search_property}")
+        print(f"Search Value: {search_value}")
+    print(f"Nodes Settled: {nodes_settled}")
+    print(f"Nodes Found: {len(results)}")
+    print(f"Time Taken: {time_taken:.6f} seconds")
+    print("="*70)
+
+    if results:
+        print(f"\nNearest {len(results)} matching nodes by route cost:")
+        for i, (node_id, cost, path) in enumerate(results):
+            node = get_node(graph, node_id)
+            print(f"  {i+1}. {node['name']} (ID: {node_id})")
+            print(f"      Type: {node['type']}, Region: {node['region']}, " +
+                  f"Capacity: {node['capacity']}, Priority: {node['priority']}")
+            print(f"      Cost: {cost:g}, Hops: {len(path) - 1}")
+            if len(path) > PATH_DISPLAY_LIMIT:
+                shown = path[:PATH_DISPLAY_LIMIT // 2] + ["..."] + path[-PATH_DISPLAY_LIMIT // 2:]
+            else:
+                shown = path
+            print(f"      Path: {' -> '.join(shown)}")
+    else:
+        print("\nNo reachable nodes match the search criteria.")
+
+    print()
+
+
+def main():
+    """
+    Main function to run the shortest-path search from command line.
+    """
+    # Check command line arguments
+    args = sys.argv[1:]
+    algorithm = "dijkstra"
+    if "--astar" in args:
+        args.remove("--astar")
+        algorithm = "astar"
+
+    k = 1
+    if "--k" in args:
+        position = args.index("--k")
+        try:
+            k = int(args[position + 1])
+        except (IndexError, ValueError):
+            k = 0
+        if k < 1:
+            print("Error: --k requires a positive integer value")
+            sys.exit(1)
+        del args[position:position + 2]
+
+    if len(args) not in (3, 4):
+        print("Usage: python shortest_path.py <graph_size> <source_node_id> <search_property> <search_value> [--astar] [--k K]")
+        print("       python shortest_path.py <graph_size> <source_node_id> \"<criteria>\" [--astar] [--k K]")
+        print()
+        print("Arguments:")
+        print("  graph_size: small, medium, or large")
+        print("  source_node_id: node to route from, e.g. node_0")
+        print("  search_property: type, region, capacity_min, capacity_max, or priority")
+        print("  search_value: value to search for")
+        print("  criteria: property=value terms combined with \"and\"/\"or\"")
+        print("  --astar: use A* with the Euclidean heuristic instead of Dijkstra")
+        print("  --k K: number of nearest matching nodes to return (default 1)")
+        print()
+        print("Examples:")
+        print("  python shortest_path.py small node_0 type depot")
+        print("  python shortest_path.py medium node_12 type warehouse --k 5")
+        print("  python shortest_path.py large node_0 \"type=depot and capacity_min=4900\" --astar")
+        sys.exit(1)
+
+    # Parse arguments
+    graph_size = args[0].lower()
+    source_node_id = args[1]
+    if len(args) == 4:
+        search_property = args[2].lower()
+        search_value = args[3]
+    else:
+        search_property = args[2]
+        search_value = None
+
+    # Validate graph size
+    if graph_size not in ["small", "medium", "large"]:
+        print(f"Error: Invalid graph size '{graph_size}'")
+        print("Valid options: small, medium, large")
+        sys.exit(1)
+
+    # Validate the search criteria before loading the graph
+    try:
+        compile_criteria(search_property, search_value)
+    except ValueError as error:
+        print(f"Error: {error}")
+        sys.exit(1)
+
+    # Load graph (memory-mapped .gbin if present, else streamed from JSON or graphs.zip)
+    graph = open_named_graph(graph_size)
+    metadata = get_metadata(graph)
+    print(f"Loaded graph with {metadata['num_nodes']} nodes " +
+          f"and {metadata['num_edges']} edges")
+
+    if source_node_id not in as_csr_graph(graph).index:
+        print(f"Error: Node '{source_node_id}' not found in the graph")
+        sys.exit(1)
+
+    if (algorithm == "astar" and
+            match_mask(graph, search_property, search_value).count(1) > ASTAR_MAX_TARGETS):
+        print(f"Note: more than {ASTAR_MAX_TARGETS} nodes match, so Dijkstra is used instead of A*")
+        algorithm = "dijkstra"
+
+    # Find the k nearest matching nodes by route cost
+    if search_value is None:
+        print(f"\nSearching from {source_node_id} for nodes where {search_property}...")
+    else:
+        print(f"\nSearching from {source_node_id} for nodes where " +
+              f"{search_property} = {search_value}...")
+    results, nodes_settled, time_taken = nearest_matches(
+        graph, source_node_id, search_property, search_value, k=k, algorithm=algorithm
+    )
+
+    # Display results
+    display_results(results, nodes_settled, time_taken, graph, source_node_id,
+                    search_property, search_value, algorithm)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,686 @@
+"""
+Spatial Index over Node Coordinates
+===================================
+This module answers "which nodes lie near this point?" without scanning
+every node.
+
+graph_generator.py lays the nodes out along a spiral, so they are far from
+evenly spread: a uniform grid over the bounding box leaves most cells
+empty and puts thousands of nodes in others. A KD-tree adapts to any
+layout instead. The nodes are split at the median x or y coordinate
+(whichever side of the box is wider) until at most LEAF_SIZE remain, and
+every tree node keeps the bounding box of its points, so a query skips
+whole subtrees whose box it cannot reach:
+
+    radius    nodes within distance r of a point
+    box       nodes inside an axis-aligned rectangle (subtrees whose box
+              lies inside are taken whole)
+    nearest   the k closest nodes, visiting boxes closest first until the
+              next box is farther away than the k-th best node
+
+Each query can be combined with the property criteria of search_criteria.py.
+The criteria are turned into a match mask once and kept with the index
+(see MASK_CACHE_SIZE), so repeated queries with the same criteria cost
+O(log N + nodes checked) instead of O(N). The tree is built once per graph
+(see CSRGraph.derived_structure()).
+
+Usage:
+    python spatial_index.py <graph_size> radius <x> <y> <r> [<search_property> <search_value> | "<criteria>"] [--compare]
+    python spatial_index.py <graph_size> box <min_x> <min_y> <max_x> <max_y> [criteria] [--compare]
+    python spatial_index.py <graph_size> nearest <x> <y> [criteria] [--k K] [--compare]
+
+    A point can also be given as a node ID, e.g. "nearest node_17 type hub".
+
+Examples:
+    python spatial_index.py large radius 0 0 50 type warehouse
+    python spatial_index.py large box -100 -100 100 100 "type=hub and priority=5"
+    python spatial_index.py large nearest node_17 type hub --k 5 --compare
+
+Author: AI Course Materials
+Date: October 2026
+"""
+
+import heapq
+import math
+import sys
+import time
+from array import array
+from collections import OrderedDict
+
+from csr_graph import as_csr_graph, get_metadata, get_node
+from graph_stream import open_named_graph
+from node_columns import numeric_column
+from search_criteria import compile_criteria
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the tree is then built in pure Python
+    np = None
+
+
+# Most nodes stored in one leaf of the tree
+LEAF_SIZE = 16
+
+# Match masks kept per index, by criteria
+MASK_CACHE_SIZE = 8
+
+QUERY_MODES = ["radius", "box", "nearest"]
+
+
+def _box_distance(x, y, min_x, max_x, min_y, max_y):
+    """
+    Return the squared distance from a point to a rectangle (0 inside it).
+
+    Args:
+        x, y (float): Point
+        min_x, max_x, min_y, max_y (float): Rectangle
+
+    Returns:
+        float: Squared distance
+    """
+    dx = min_x - x if x < min_x else x - max_x if x > max_x else 0.0
+    dy = min_y - y if y < min_y else y - max_y if y > max_y else 0.0
+    return dx * dx + dy * dy
+
+
+class SpatialIndex:
+    """
+    KD-tree over the node coordinates of one graph.
+
+    Tree node t covers order[start[t]:end[t]] and the bounding box of those
+    points; inner nodes split their range at the median of the wider side
+    into the children left[t] and right[t] (-1 for leaves). Node 0 is the
+    root.
+
+    Attributes:
+        xs (sequence): x coordinate per node index
+        ys (sequence): y coordinate per node index
+        order (array): Node indices, each tree node's points contiguous
+        start, end (array): Slice of order per tree node
+        left, right (array): Children per tree node, -1 for leaves
+        min_x, max_x, min_y, max_y (array): Bounding box per tree node
+        masks (OrderedDict): Recently used match masks by criteria text
+    """
+
+    def __init__(self, xs, ys, order, start, end, left, right, min_x, max_x, min_y, max_y):
+        self.xs = xs
+        self.ys = ys
+        self.order = order
+        self.start = start
+        self.end = end
+        self.left = left
+        self.right = right
+        self.min_x = min_x
+        self.max_x = max_x
+        self.min_y = min_y
+        self.max_y = max_y
+        self.masks = OrderedDict()
+
+    @property
+    def size(self):
+        """int: Number of tree nodes."""
+        return len(self.start)
+
+    @classmethod
+    def build(cls, graph, leaf_size=LEAF_SIZE):
+        """
+        Build the tree by splitting at the median, widest side first.
+
+        Args:
+            graph (dict, CSRGraph or GraphHandle): Graph structure
+            leaf_size (int): Most points per leaf
+
+        Returns:
+            SpatialIndex: KD-tree over the graph's coordinates
+        """
+        csr = as_csr_graph(graph)
+        xs, ys = numeric_column(csr, "x"), numeric_column(csr, "y")
+        n = csr.num_nodes
+        start, end = array('i'), array('i')
+        left, right = array('i'), array('i')
+        min_x, max_x, min_y, max_y = array('d'), array('d'), array('d'), array('d')
+
+        if np is not None:
+            coordinates = (np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+            order = np.arange(n, dtype=np.int32)
+        else:
+            coordinates = (xs, ys)
+            order = array('i', range(n))
+
+        def add_tree_node(first, last):
+            start.append(first)
+            end.append(last)
+            left.append(-1)
+            right.append(-1)
+            for bounds in (min_x, max_x, min_y, max_y):
+                bounds.append(0.0)
+            return len(start) - 1
+
+        # Tree nodes still to be bounded and split
+        pending = [add_tree_node(0, n)] if n else []
+        while pending:
+            t = pending.pop()
+            first, last = start[t], end[t]
+            points = order[first:last]
+            if np is not None:
+                px, py = coordinates[0][points], coordinates[1][points]
+                box = (float(px.min()), float(px.max()), float(py.min()), float(py.max()))
+            else:
+                px = [xs[i] for i in points]
+                py = [ys[i] for i in points]
+                box = (min(px), max(px), min(py), max(py))
+            min_x[t], max_x[t], min_y[t], max_y[t] = box
+            if last - first <= leaf_size:
+                continue
+
+            # Split the wider side at its median
+            axis = 0 if box[1] - box[0] >= box[3] - box[2] else 1
+            middle = (first + last) // 2
+            if np is not None:
+                values = px if axis == 0 else py
+                order[first:last] = points[np.argpartition(values, middle - first)]
+            else:
+                order[first:last] = array('i', sorted(points, key=coordinates[axis].__getitem__))
+
+            left[t] = add_tree_node(first, middle)
+            right[t] = add_tree_node(middle, last)
+            pending.append(left[t])
+            pending.append(right[t])
+
+        if np is not None:
+            order = array('i', order.tobytes())
+        return cls(xs, ys, order, start, end, left, right, min_x, max_x, min_y, max_y)
+
+    def box(self, min_x, min_y, max_x, max_y, mask=None, stats=None):
+        """
+        Return the nodes inside an axis-aligned rectangle (edges included).
+
+        Args:
+            min_x, min_y, max_x, max_y (float): Rectangle
+            mask (bytearray): Optional match mask; only nodes with a 1 count
+            stats (dict): Optional dict that receives "nodes_checked"
+
+        Returns:
+            list: Node indices in ascending order
+        """
+        xs, ys, order = self.xs, self.ys, self.order
+        found = []
+        checked = 0
+        pending = [0] if self.size else []
+        while pending:
+            t = pending.pop()
+            if (self.max_x[t] < min_x or self.min_x[t] > max_x or
+                    self.max_y[t] < min_y or self.min_y[t] > max_y):
+                continue
+            points = order[self.start[t]:self.end[t]]
+            if (min_x <= self.min_x[t] and self.max_x[t] <= max_x and
+                    min_y <= self.min_y[t] and self.max_y[t] <= max_y):
+                # The whole subtree lies inside the rectangle
+                checked += len(points)
+                found.extend(points if mask is None else (i for i in points if mask[i]))
+            elif self.left[t] < 0:
+                checked += len(points)
+                for i in points:
+                    if (min_x <= xs[i] <= max_x and min_y <= ys[i] <= max_y
+                            and (mask is None or mask[i])):
+                        found.append(i)
+            else:
+                pending.append(self.left[t])
+                pending.append(self.right[t])
+        if stats is not None:
+            stats["nodes_checked"] = checked
+        found.sort()
+        return found
+
+    def radius(self, x, y, radius, mask=None, stats=None):
+        """
+        Return the nodes within a distance of a point (boundary included).
+
+        Args:
+            x, y (float): Centre
+            radius (float): Largest distance
+            mask (bytearray): Optional match mask; only nodes with a 1 count
+            stats (dict): Optional dict that receives "nodes_checked"
+
+        Returns:
+            list: (distance, node index) pairs, closest first (ties by index)
+        """
+        xs, ys, order = self.xs, self.ys, self.order
+        limit = radius * radius
+        found = []
+        checked = 0
+        pending = [0] if self.size and radius >= 0 else []
+        while pending:
+            t = pending.pop()
+            if _box_distance(x, y, self.min_x[t], self.max_x[t],
+                             self.min_y[t], self.max_y[t]) > limit:
+                continue
+            if self.left[t] >= 0:
+                pending.append(self.left[t])
+                pending.append(self.right[t])
+                continue
+            points = order[self.start[t]:self.end[t]]
+            checked += len(points)
+            for i in points:
+                dx, dy = xs[i] - x, ys[i] - y
+                squared = dx * dx + dy * dy
+                if squared <= limit and (mask is None or mask[i]):
+                    found.append((squared, i))
+        if stats is not None:
+            stats["nodes_checked"] = checked
+        found.sort()
+        return [(math.sqrt(squared), i) for squared, i in found]
+
+    def nearest(self, x, y, k=1, mask=None, stats=None):
+        """
+        Return the k nodes closest to a point.
+
+        Tree nodes are visited closest bounding box first; the search stops
+        once the next box is farther away than the k-th best node.
+
+        Args:
+            x, y (float): Query point
+            k (int): Number of nodes to return
+            mask (bytearray): Optional match mask; only nodes with a 1 count
+            stats (dict): Optional dict that receives "nodes_checked"
+
+        Returns:
+            list: Up to k (distance, node index) pairs, closest first (ties
+                by index)
+        """
+        xs, ys, order = self.xs, self.ys, self.order
+        best = []  # max-heap of (-squared distance, -index), at most k entries
+        checked = 0
+        boxes = [(0.0, 0)] if self.size and k > 0 else []  # (squared distance, tree node)
+        while boxes:
+            distance, t = heapq.heappop(boxes)
+            # A box at the same distance may still hold a tie with a smaller index
+            if len(best) == k and distance > -best[0][0]:
+                break
+            if self.left[t] >= 0:
+                for child in (self.left[t], self.right[t]):
+                    heapq.heappush(boxes, (_box_distance(
+                        x, y, self.min_x[child], self.max_x[child],
+                        self.min_y[child], self.max_y[child]), child))
+                continue
+            points = order[self.start[t]:self.end[t]]
+            checked += len(points)
+            for i in points:
+                if mask is not None and not mask[i]:
+                    continue
+                dx, dy = xs[i] - x, ys[i] - y
+                entry = (-(dx * dx + dy * dy), -i)
+                if len(best) < k:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+        if stats is not None:
+            stats["nodes_checked"] = checked
+        return [(math.sqrt(-squared), -negative_index)
+                for squared, negative_index in sorted(best, reverse=True)]
+
+
+def get_spatial_index(graph):
+    """
+    Return the KD-tree of a graph, building it once per graph.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+
+    Returns:
+        SpatialIndex: Grid over the graph's coordinates
+    """
+    return as_csr_graph(graph).derived_structure("spatial_index", SpatialIndex.build)
+
+
+def _criteria_mask(csr, index, search_property, search_value):
+    """
+    Return the match mask of the criteria, reusing a recent one.
+
+    Args:
+        csr (CSRGraph): Graph
+        index (SpatialIndex): The graph's spatial index
+        search_property: Property, criteria expression, compiled criteria or
+            None for every node
+        search_value (str): Value to match (None for expressions)
+
+    Returns:
+        bytearray or None: Match mask, or None when every node matches
+
+    Raises:
+        ValueError: If the criteria are invalid
+    """
+    if search_property is None:
+        return None
+    criteria = compile_criteria(search_property, search_value)
+    key = criteria.describe()
+    mask = index.masks.get(key)
+    if mask is None:
+        mask = index.masks[key] = criteria.mask(csr)
+        if len(index.masks) > MASK_CACHE_SIZE:
+            index.masks.popitem(last=False)
+    else:
+        index.masks.move_to_end(key)
+    return mask
+
+
+def radius_search(graph, x, y, radius, search_property=None, search_value=None):
+    """
+    Find the matching nodes within a distance of a point.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        x, y (float): Centre
+        radius (float): Largest distance
+        search_property (str): Property to search by, a criteria expression,
+            compiled criteria, or None for every node
+        search_value (str): Value to match (None for expressions)
+
+    Returns:
+        tuple: (results, nodes_checked, time_taken)
+            results (list): (node_id, distance) pairs, closest first
+            nodes_checked (int): Nodes in the leaves read
+            time_taken (float): Time in seconds
+
+    Raises:
+        ValueError: If the criteria are invalid
+    """
+    start_time = time.time()
+    csr = as_csr_graph(graph)
+    index = get_spatial_index(csr)
+    mask = _criteria_mask(csr, index, search_property, search_value)
+    stats = {}
+    found = index.radius(x, y, radius, mask, stats)
+    results = [(csr.node_ids[i], distance) for distance, i in found]
+    return results, stats["nodes_checked"], time.time() - start_time
+
+
+def box_search(graph, min_x, min_y, max_x, max_y, search_property=None, search_value=None):
+    """
+    Find the matching nodes inside an axis-aligned rectangle.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        min_x, min_y, max_x, max_y (float): Rectangle
+        search_property (str): Property to search by, a criteria expression,
+            compiled criteria, or None for every node
+        search_value (str): Value to match (None for expressions)
+
+    Returns:
+        tuple: (found_nodes, nodes_checked, time_taken) with the node IDs in
+            node index order
+
+    Raises:
+        ValueError: If the criteria are invalid
+    """
+    start_time = time.time()
+    csr = as_csr_graph(graph)
+    index = get_spatial_index(csr)
+    mask = _criteria_mask(csr, index, search_property, search_value)
+    stats = {}
+    found = index.box(min_x, min_y, max_x, max_y, mask, stats)
+    found_nodes = [csr.node_ids[i] for i in found]
+    return found_nodes, stats["nodes_checked"], time.time() - start_time
+
+
+def nearest_search(graph, x, y, k=1, search_property=None, search_value=None):
+    """
+    Find the k matching nodes closest to a point (straight-line distance).
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        x, y (float): Query point
+        k (int): Number of nodes to return
+        search_property (str): Property to search by, a criteria expression,
+            compiled criteria, or None for every node
+        search_value (str): Value to match (None for expressions)
+
+    Returns:
+        tuple: (results, nodes_checked, time_taken)
+            results (list): Up to k (node_id, distance) pairs, closest first
+            nodes_checked (int): Nodes in the leaves read
+            time_taken (float): Time in seconds
+
+    Raises:
+        ValueError: If the criteria are invalid
+    """
+    start_time = time.time()
+    csr = as_csr_graph(graph)
+    index = get_spatial_index(csr)
+    mask = _criteria_mask(csr, index, search_property, search_value)
+    stats = {}
+    found = index.nearest(x, y, k, mask, stats)
+    results = [(csr.node_ids[i], distance) for distance, i in found]
+    return results, stats["nodes_checked"], time.time() - start_time
+
+
+def linear_scan(graph, mode, query, search_property=None, search_value=None):
+    """
+    Answer a spatial query by checking every node, for comparison.
+
+    Args:
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        mode (str): "radius", "box" or "nearest"
+        query (tuple): (x, y, radius), (min_x, min_y, max_x, max_y) or (x, y, k)
+        search_property: Criteria as for radius_search()
+        search_value (str): Value to match (None for expressions)
+
+    Returns:
+        tuple: (results, time_taken) with results shaped as returned by
+            radius_search(), box_search() or nearest_search()
+    """
+    start_time = time.time()
+    csr = as_csr_graph(graph)
+    xs, ys = numeric_column(csr, "x"), numeric_column(csr, "y")
+    if search_property is None:
+        candidates = range(csr.num_nodes)
+    else:
+        mask = compile_criteria(search_property, search_value).mask(csr)
+        candidates = [i for i in range(csr.num_nodes) if mask[i]]
+
+    if mode == "box":
+        min_x, min_y, max_x, max_y = query
+        results = [csr.node_ids[i] for i in candidates
+                   if min_x <= xs[i] <= max_x and min_y <= ys[i] <= max_y]
+    else:
+        x, y = query[0], query[1]
+        squared = sorted(((xs[i] - x) * (xs[i] - x) + (ys[i] - y) * (ys[i] - y), i)
+                         for i in candidates)
+        if mode == "radius":
+            squared = [(value, i) for value, i in squared if value <= query[2] * query[2]]
+        else:
+            squared = squared[:query[2]]
+        results = [(csr.node_ids[i], math.sqrt(value)) for value, i in squared]
+    return results, time.time() - start_time
+
+
+def display_results(mode, query, results, nodes_checked, time_taken, graph,
+                    search_property, search_value):
+    """
+    Display spatial query results in a formatted manner.
+
+    Args:
+        mode (str): "radius", "box" or "nearest"
+        query (tuple): Query arguments (see linear_scan())
+        results (list): Node IDs (box) or (node_id, distance) pairs
+        nodes_checked (int): Nodes in the leaves read
+        time_taken (float): Time in seconds
+        graph (dict, CSRGraph or GraphHandle): Graph structure
+        search_property (str): Property searched, a criteria expression or None
+        search_value (str): Value searched for (None for expressions)
+    """
+    print("\n" + "="*70)
+    print("SPATIAL SEARCH RESULTS")
+    print("="*70)
+    metadata = get_metadata(graph)
+    print(f"Graph: {metadata['graph_type']} ({metadata['num_nodes']} nodes)")
+    if mode == "radius":
+        print(f"Query: within {query[2]:g} of ({query[0]:g}, {query[1]:g})")
+    elif mode == "box":
+        print(f"Query: inside ({query[0]:g}, {query[1]:g}) - ({query[2]:g}, {query[3]:g})")
+    else:
+        print(f"Query: {query[2]} nearest to ({query[0]:g}, {query[1]:g})")
+    if search_property is None:
+        print("Search Criteria: (any node)")
+    elif search_value is None:
+        print(f"Search Criteria: {search_property}")
+    else:
+        print(f"Search Property: {search_property}")
+        print(f"Search Value: {search_value}")
+    print(f"Nodes Checked: {nodes_checked}")
+    print(f"Nodes Found: {len(results)}")
+    print(f"Time Taken: {time_taken:.6f} seconds")
+    print("="*70)
+
+    if results:
+        print(f"\nFound {len(results)} matching nodes:")
+        # Display first 10 matches
+        display_limit = min(10, len(results))
+        for i, result in enumerate(results[:display_limit]):
+            node_id, distance = (result, None) if mode == "box" else result
+            node = get_node(graph, node_id)
+            suffix = "" if distance is None else f", Distance: {distance:.2f}"
+            print(f"  {i+1}. {node['name']} (ID: {node_id})")
+            print(f"      Type: {node['type']}, Region: {node['region']}, " +
+                  f"Capacity: {node['capacity']}, Priority: {node['priority']}{suffix}")
+
+        if len(results) > display_limit:
+            print(f"  ... and {len(results) - display_limit} more")
+    else:
+        print("\nNo nodes found matching the search criteria.")
+
+    print()
+
+
+def _print_usage():
+    """Print the command-line usage and exit."""
+    print("Usage: python spatial_index.py <graph_size> radius <x> <y> <r> [criteria] [--compare]")
+    print("       python spatial_index.py <graph_size> box <min_x> <min_y> <max_x> <max_y> [criteria] [--compare]")
+    print("       python spatial_index.py <graph_size> nearest <x> <y> [criteria] [--k K] [--compare]")
+    print()
+    print("Arguments:")
+    print("  graph_size: small, medium, or large")
+    print("  <x> <y>: a point, or a single node ID such as node_17")
+    print("  criteria: <search_property> <search_value>, or \"property=value and ...\"")
+    print("            (omit to match every node)")
+    print("  --k K: number of nearest nodes to return (default 1)")
+    print("  --compare: also answer the query with a linear scan over every node")
+    print()
+    print("Examples:")
+    print("  python spatial_index.py large radius 0 0 50 type warehouse")
+    print("  python spatial_index.py large box -100 -100 100 100 \"type=hub and priority=5\"")
+    print("  python spatial_index.py large nearest node_17 type hub --k 5 --compare")
+    sys.exit(1)
+
+
+def main():
+    """
+    Main function to run a spatial query from command line.
+    """
+    args = sys.argv[1:]
+    compare = "--compare" in args
+    if compare:
+        args.remove("--compare")
+
+    k = 1
+    if "--k" in args:
+        position = args.index("--k")
+        try:
+            k = int(args[position + 1])
+        except (IndexError, ValueError):
+            print("Error: --k requires an integer value")
+            sys.exit(1)
+        del args[position:position + 2]
+
+    if len(args) < 3 or args[1].lower() not in QUERY_MODES:
+        _print_usage()
+
+    graph_size = args[0].lower()
+    mode = args[1].lower()
+    rest = args[2:]
+
+    # Validate graph size
+    if graph_size not in ["small", "medium", "large"]:
+        print(f"Error: Invalid graph size '{graph_size}'")
+        print("Valid options: small, medium, large")
+        sys.exit(1)
+
+    # A point is "x y" or one node ID; the rectangle of a box query is numeric
+    point_node = None
+    numbers = 4 if mode == "box" else 3 if mode == "radius" else 2
+    try:
+        float(rest[0])
+    except ValueError:
+        if mode != "box":
+            point_node, rest = rest[0], rest[1:]
+            numbers -= 2
+    try:
+        values = [float(value) for value in rest[:numbers]]
+    except ValueError:
+        _print_usage()
+    if len(values) != numbers:
+        _print_usage()
+    rest = rest[numbers:]
+
+    if len(rest) == 2:
+        search_property, search_value = rest[0].lower(), rest[1]
+    elif len(rest) == 1:
+        search_property, search_value = rest[0], None
+    elif not rest:
+        search_property = search_value = None
+    else:
+        _print_usage()
+
+    # Validate the search criteria before loading the graph
+    if search_property is not None:
+        try:
+            compile_criteria(search_property, search_value)
+        except ValueError as error:
+            print(f"Error: {error}")
+            sys.exit(1)
+
+    # Load graph (memory-mapped .gbin if present, else streamed from JSON or graphs.zip)
+    graph = open_named_graph(graph_size)
+    metadata = get_metadata(graph)
+    print(f"Loaded graph with {metadata['num_nodes']} nodes " +
+          f"and {metadata['num_edges']} edges")
+
+    if point_node is not None:
+        if point_node not in as_csr_graph(graph).index:
+            print(f"Error: Node '{point_node}' not found in the graph")
+            sys.exit(1)
+        coordinates = get_node(graph, point_node)["coordinates"]
+        values = [coordinates["x"], coordinates["y"]] + values
+    if mode == "nearest":
+        values.append(k)
+    query = tuple(values)
+
+    build_start = time.time()
+    index = get_spatial_index(graph)
+    print(f"Built a KD-tree with {index.size} tree nodes in " +
+          f"{time.time() - build_start:.6f} seconds")
+
+    if mode == "radius":
+        results, nodes_checked, time_taken = radius_search(graph, *query, search_property,
+                                                           search_value)
+    elif mode == "box":
+        results, nodes_checked, time_taken = box_search(graph, *query, search_property,
+                                                        search_value)
+    else:
+        results, nodes_checked, time_taken = nearest_search(graph, *query, search_property,
+                                                            search_value)
+    display_results(mode, query, results, nodes_checked, time_taken, graph,
+                    search_property, search_value)
+
+    if compare:
+        expected, scan_time = linear_scan(graph, mode, query, search_property, search_value)
+        print(f"Linear scan: {scan_time:.6f} seconds, {metadata['num_nodes']} nodes checked")
+        if expected == results:
+            print("Linear scan returned the same nodes in the same order")
+        else:
+            print("Warning: the linear scan returned different nodes")
+        print()
+
+
+if __name__ == "__main__":
+    main()
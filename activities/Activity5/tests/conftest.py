@@ -0,0 +1,47 @@
+"""
+Shared fixtures for the Activity 5 tests.
+
+The tests run against a small generated graph (same structure as
+graph_small.json, fewer nodes) written to a temporary directory, so they
+do not need the graph files or graphs.zip.
+
+Run from the Activity5 directory:
+    python -m pytest -q tests
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# The modules are plain scripts in the directory above
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graph_generator import generate_structured_graph, save_graph_to_json  # noqa: E402
+from graph_stream import load_graph_streaming  # noqa: E402
+
+
+NUM_NODES = 300
+SEED = 7
+
+
+@pytest.fixture(scope="session")
+def graph_file(tmp_path_factory):
+    """Path of a generated graph JSON file."""
+    filename = str(tmp_path_factory.mktemp("graphs") / "graph_test.json")
+    save_graph_to_json(generate_structured_graph(NUM_NODES, "test", seed=SEED), filename)
+    return filename
+
+
+@pytest.fixture(scope="session")
+def graph_dict(graph_file):
+    """The generated graph as loaded by json.load()."""
+    with open(graph_file) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def csr(graph_file):
+    """A freshly streamed CSRGraph of the generated graph (no cached indexes)."""
+    return load_graph_streaming(graph_file)
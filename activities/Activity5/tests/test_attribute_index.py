@@ -0,0 +1,77 @@
+"""
+The attribute index answers property queries like a full scan and is reused from disk.
+"""
+
+import shutil
+
+import pytest
+
+import attribute_index
+from attribute_index import (AttributeIndex, get_attribute_index, index_filename_for,
+                             indexed_search)
+from graph_stream import load_graph_streaming
+from search_criteria import compile_criteria
+
+
+QUERIES = [("type", "warehouse"), ("region", "north"), ("priority", "5"),
+           ("capacity_min", "3000"), ("capacity_max", "500"), ("type", "nosuch")]
+
+
+@pytest.mark.parametrize("search_property, search_value", QUERIES)
+def test_lookup_matches_scan(csr, search_property, search_value):
+    mask = compile_criteria(f"{search_property}={search_value}").mask(csr)
+    found, _, _ = indexed_search(csr, search_property, search_value)
+    assert sorted(found) == sorted(csr.node_ids[i] for i in range(csr.num_nodes) if mask[i])
+
+
+def test_compound_criteria_match_scan(csr):
+    criteria = "type=hub and capacity_min=2500 or region=west"
+    mask = compile_criteria(criteria).mask(csr)
+    found, _, _ = indexed_search(csr, criteria)
+    assert found == [csr.node_ids[i] for i in range(csr.num_nodes) if mask[i]]
+
+
+def test_gidx_round_trip(csr, tmp_path):
+    index = AttributeIndex.build(csr)
+    filename = str(tmp_path / "graph_test.gidx")
+    index.save(filename)
+    loaded = AttributeIndex.load(filename)
+
+    assert loaded.fingerprint == index.fingerprint
+    for search_property, search_value in QUERIES:
+        assert list(loaded.lookup(search_property, search_value)) == \
+            list(index.lookup(search_property, search_value))
+
+
+def test_other_files_are_rejected(tmp_path):
+    filename = str(tmp_path / "not_an_index")
+    with open(filename, 'wb') as f:
+        f.write(b"NOTMAGIC" + bytes(64))
+    with pytest.raises(ValueError):
+        AttributeIndex.load(filename)
+
+
+def test_saved_index_is_reused_without_reading_attributes(graph_file, csr, tmp_path,
+                                                          monkeypatch):
+    copy = str(tmp_path / "graph_test.json")
+    shutil.copy(graph_file, copy)
+    get_attribute_index(csr).save(index_filename_for(copy))
+
+    def fail(*args):
+        raise AssertionError("attribute values were read")
+
+    # Checking the saved index must not touch the attributes node by node
+    monkeypatch.setattr(attribute_index, "_attribute_column", fail)
+    index = get_attribute_index(load_graph_streaming(copy))
+    assert isinstance(index.capacity_order, memoryview)
+
+
+def test_changed_attributes_rebuild_the_index(graph_file, csr, tmp_path):
+    copy = str(tmp_path / "graph_test.json")
+    shutil.copy(graph_file, copy)
+    get_attribute_index(csr).save(index_filename_for(copy))
+
+    reloaded = load_graph_streaming(copy)
+    reloaded.columns["capacity"][0] += 1
+    index = get_attribute_index(reloaded)
+    assert not isinstance(index.capacity_order, memoryview)
@@ -0,0 +1,61 @@
+"""
+A batch of queries returns what bfs_search_all_components() returns for each query.
+"""
+
+import pytest
+
+from batch_search import batch_search, load_queries, parse_query
+from bfs_search import bfs_search_all_components
+
+
+QUERIES = ["type=warehouse", ("region", "north"), "capacity_min=3000 or priority=1",
+           "type=warehouse", "type=nosuch"]
+
+
+@pytest.mark.parametrize("limit", [None, 0, 5])
+def test_results_match_separate_searches(csr, limit):
+    results, stats = batch_search(csr, QUERIES, limit=limit)
+    assert stats["nodes_explored"] == csr.num_nodes
+    for query, (found, _) in zip(QUERIES, results):
+        search_property, search_value = query if isinstance(query, tuple) else (query, None)
+        expected, _, _ = bfs_search_all_components(csr, search_property, search_value,
+                                                   limit=limit)
+        assert found == expected
+
+
+def test_negative_limit_is_rejected(csr):
+    with pytest.raises(ValueError, match="non-negative"):
+        batch_search(csr, QUERIES, limit=-1)
+
+
+@pytest.mark.parametrize("line, description", [
+    ("type warehouse", "type=warehouse"),
+    ("Capacity_min 3000", "capacity_min=3000"),
+    ("type=hub and priority=5", "type=hub and priority=5"),
+    ("type = hub", "type=hub"),
+    # A value is taken as it is, even with an "=" in it
+    ("type warehouse=x", "type=warehouse=x"),
+])
+def test_parse_query(line, description):
+    assert parse_query(line).describe() == description
+
+
+@pytest.mark.parametrize("line, message", [
+    ("priority high", "priority requires an integer value"),
+    ("colour red", "Unknown search property 'colour'"),
+    ("warehouse", "Expected 'property value'"),
+])
+def test_invalid_queries(line, message):
+    with pytest.raises(ValueError, match=message):
+        parse_query(line)
+
+
+def test_load_queries_names_the_bad_line(tmp_path):
+    filename = tmp_path / "queries.txt"
+    filename.write_text("# warehouses\ntype warehouse\n\nregion north\npriority high\n")
+    with pytest.raises(ValueError, match="line 5: priority requires an integer value"):
+        load_queries(str(filename))
+
+    filename.write_text("# warehouses\ntype warehouse\n\nregion north\n")
+    assert [query.describe() for query in load_queries(str(filename))] == \
+        ["type=warehouse", "region=north"]
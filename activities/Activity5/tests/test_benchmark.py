@@ -0,0 +1,115 @@
+"""
+The benchmark suite records reproducible counters and flags only real regressions.
+"""
+
+import copy
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from batch_search import parse_query
+from benchmark import (MIN_TIME_DELTA_NS, compare_with_baseline, generate_benchmark_graph,
+                       percentile, run_benchmarks)
+from bfs_search import bfs_search_all_components
+from greedy_search import greedy_search_all_components
+
+
+ACTIVITY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUERIES = ["type warehouse", "type=hub and priority=5"]
+
+
+@pytest.fixture(scope="module")
+def results():
+    return run_benchmarks([150, 400], ["bfs", "greedy"], [parse_query(q) for q in QUERIES],
+                          seed=3, repeat=3, warmup=1)
+
+
+def test_percentile():
+    values = [5, 1, 4, 2, 3]
+    assert percentile(values, 50) == 3
+    assert percentile(values, 95) == 5
+    assert percentile(values, 0) == 1
+
+
+def test_counters_match_the_searches(results):
+    assert len(results["cases"]) == 2 * 2 * len(QUERIES)
+    searches = {"bfs": bfs_search_all_components, "greedy": greedy_search_all_components}
+    graphs = {size: generate_benchmark_graph(size, 3) for size in (150, 400)}
+    for case in results["cases"]:
+        found, explored, _ = searches[case["algorithm"]](graphs[case["nodes"]],
+                                                         parse_query(case["query"]), None)
+        assert (case["found"], case["nodes_explored"]) == (len(found), explored)
+        assert len(case["times_ns"]) == 3
+        assert case["min_ns"] <= case["median_ns"] <= case["p95_ns"]
+        assert case["peak_memory_bytes"] > 0
+
+
+def test_same_seed_same_counters(results):
+    again = run_benchmarks([150], ["bfs"], [parse_query(QUERIES[0])], seed=3, repeat=1,
+                           warmup=0)
+    first = next(case for case in results["cases"]
+                 if (case["algorithm"], case["nodes"], case["query"]) ==
+                 ("bfs", 150, "type=warehouse"))
+    for counter in ("found", "nodes_explored", "edges_checked"):
+        assert again["cases"][0][counter] == first[counter]
+
+
+def _problems(results, change):
+    current = copy.deepcopy(results)
+    change(current["cases"][0])
+    return compare_with_baseline(current, results, threshold=10.0)[0][2]
+
+
+def test_only_real_regressions_are_flagged(results):
+    assert all(problems == [] for _, _, problems in compare_with_baseline(results, results))
+
+    base = results["cases"][0]
+    slower = max(base["p95_ns"] + 1, int(base["median_ns"] * 1.2)) + MIN_TIME_DELTA_NS
+
+    def slow(case):
+        case["median_ns"] = slower
+
+    def slightly_slower(case):
+        # Over the threshold, but within timer noise
+        case["median_ns"] = min(int(base["median_ns"] * 1.5),
+                                base["median_ns"] + MIN_TIME_DELTA_NS - 1)
+
+    def more_memory(case):
+        case["peak_memory_bytes"] = base["peak_memory_bytes"] * 2 + 1024 * 1024
+
+    def more_work(case):
+        case["edges_checked"] += 1
+
+    assert _problems(results, slow) == ["slower"]
+    assert _problems(results, slightly_slower) == []
+    assert _problems(results, more_memory) == ["more memory"]
+    assert _problems(results, more_work) == ["edges_checked changed"]
+
+
+def test_new_cases_have_no_baseline(results):
+    baseline = dict(results, cases=results["cases"][1:])
+    case, base, problems = compare_with_baseline(results, baseline)[0]
+    assert base is None and problems == []
+
+
+def test_command_line_round_trip(tmp_path):
+    output = str(tmp_path / "results.json")
+    command = [sys.executable, os.path.join(ACTIVITY_DIR, "benchmark.py"), "--sizes", "120",
+               "--algorithms", "bfs", "--repeat", "2", "--warmup", "0"]
+    result = subprocess.run(command + ["--output", output], capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout
+    with open(output) as f:
+        assert len(json.load(f)["cases"]) == 6
+
+    # Compared with itself, the counters are the same and nothing is flagged for them
+    result = subprocess.run(command + ["--baseline", output], capture_output=True, text=True)
+    assert "COMPARISON WITH BASELINE" in result.stdout
+    assert "changed" not in result.stdout
+
+    command[command.index("120")] = "0"
+    result = subprocess.run(command, capture_output=True, text=True)
+    assert result.returncode == 1 and "must be positive" in result.stdout
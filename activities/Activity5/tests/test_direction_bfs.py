@@ -0,0 +1,68 @@
+"""
+The direction-optimizing BFS finds the same nodes as the deque BFS, level by level.
+"""
+
+from collections import deque
+
+import pytest
+
+import direction_bfs
+from bfs_search import iter_bfs_matches
+from direction_bfs import direction_optimizing_search, iter_direction_optimizing_matches
+
+
+CRITERIA = ["type=warehouse", "region=north or priority=5", "type=nosuch"]
+
+
+def _levels(csr, start):
+    """BFS level of every node reachable from start."""
+    level = {start: 0}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for neighbor in csr.neighbors(node):
+            if neighbor not in level:
+                level[neighbor] = level[node] + 1
+                queue.append(neighbor)
+    return level
+
+
+@pytest.fixture(params=["heuristic", "bottom-up early"])
+def switching(request, monkeypatch):
+    """Run with the default thresholds and with bottom-up steps from the second level."""
+    if request.param == "bottom-up early":
+        monkeypatch.setattr(direction_bfs, "TOP_DOWN_ALPHA", 10 ** 6)
+    return request.param
+
+
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_all_components_match_deque_bfs(csr, switching, criteria):
+    stats = {}
+    found = list(iter_direction_optimizing_matches(csr, criteria, stats=stats))
+    assert sorted(found) == sorted(iter_bfs_matches(csr, criteria))
+    assert len(found) == len(set(found))
+    assert stats["nodes_explored"] == csr.num_nodes
+
+
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_matches_come_level_by_level(csr, switching, criteria):
+    level = _levels(csr, csr.index_of("node_17"))
+    found = list(iter_direction_optimizing_matches(csr, criteria, start_node_id="node_17"))
+    assert sorted(found) == sorted(iter_bfs_matches(csr, criteria, start_node_id="node_17"))
+    depths = [level[csr.index_of(node_id)] for node_id in found]
+    assert depths == sorted(depths)
+
+
+def test_both_directions_are_used(csr, monkeypatch):
+    monkeypatch.setattr(direction_bfs, "TOP_DOWN_ALPHA", 10 ** 6)
+    stats = {}
+    list(iter_direction_optimizing_matches(csr, "type=hub", start_node_id="node_0",
+                                           stats=stats))
+    assert {direction for direction, _, _ in stats["levels"]} == {"top-down", "bottom-up"}
+
+
+def test_limit(csr):
+    found, _, _, _ = direction_optimizing_search(csr, "type", "hub", limit=3)
+    assert found == list(iter_direction_optimizing_matches(csr, "type", "hub"))[:3]
+    with pytest.raises(ValueError, match="non-negative"):
+        direction_optimizing_search(csr, "type", "hub", limit=-1)
@@ -0,0 +1,70 @@
+"""
+The memory-mapped .gbin format loads back what was saved and rejects damaged files.
+"""
+
+import os
+
+import pytest
+
+from bfs_search import bfs_search_all_components
+from graph_binary import load_graph_binary, save_graph_to_binary
+from graph_generator import save_graph
+from graph_stream import load_named_graph
+
+
+def test_gbin_round_trip(csr, tmp_path):
+    filename = str(tmp_path / "graph_test.gbin")
+    save_graph_to_binary(csr, filename)
+    loaded = load_graph_binary(filename)
+
+    assert list(loaded.node_ids) == list(csr.node_ids)
+    assert list(loaded.offsets) == list(csr.offsets)
+    assert list(loaded.targets) == list(csr.targets)
+    assert list(loaded.weights) == list(csr.weights)
+    assert list(loaded.nodes) == list(csr.nodes)
+    assert bfs_search_all_components(loaded, "type", "hub")[:2] == \
+        bfs_search_all_components(csr, "type", "hub")[:2]
+
+
+@pytest.mark.parametrize("damage", ["magic", "empty", "preamble", "header", "truncated"])
+def test_damaged_files_raise_value_error(csr, tmp_path, damage):
+    filename = str(tmp_path / "graph_test.gbin")
+    save_graph_to_binary(csr, filename)
+    with open(filename, 'rb') as f:
+        data = f.read()
+
+    data = {
+        "magic": b"NOTMAGIC" + data[8:],
+        "empty": b"",
+        "preamble": data[:10],
+        "header": data[:16] + data[16:48].replace(b'"', b"'") + data[48:],
+        "truncated": data[:len(data) // 2]
+    }[damage]
+    with open(filename, 'wb') as f:
+        f.write(data)
+    with pytest.raises(ValueError):
+        load_graph_binary(filename)
+
+
+def test_close_unmaps_the_file(csr, tmp_path):
+    filename = str(tmp_path / "graph_test.gbin")
+    save_graph_to_binary(csr, filename)
+    loaded = load_graph_binary(filename)
+    mapping = loaded.mapping
+
+    loaded.close()
+    assert mapping.closed and loaded.mapping is None
+
+
+def test_outdated_gbin_is_not_loaded(graph_dict, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_graph(graph_dict, "graph_small.json", binary=True)
+    assert load_named_graph("small").mapping is not None
+
+    # A JSON file written after the .gbin wins over it
+    os.utime("graph_small.gbin", (0, 0))
+    assert load_named_graph("small").mapping is None
+
+    # Saving without binary removes the old .gbin
+    save_graph(graph_dict, "graph_small.json")
+    assert not os.path.exists("graph_small.gbin")
@@ -0,0 +1,70 @@
+"""
+The vectorised generator builds graphs with the structure of the loop-based one.
+"""
+
+import math
+
+import pytest
+
+from bfs_search import bfs_search_all_components
+from graph_generator import generate_structured_graph_vectorized
+
+
+np = pytest.importorskip("numpy")
+
+NUM_NODES = 2000
+
+
+@pytest.fixture(scope="module")
+def generated():
+    return generate_structured_graph_vectorized(NUM_NODES, "test", seed=3)
+
+
+def test_same_seed_same_graph(generated):
+    again = generate_structured_graph_vectorized(NUM_NODES, "test", seed=3)
+    other = generate_structured_graph_vectorized(NUM_NODES, "test", seed=4)
+
+    assert list(again.targets) == list(generated.targets)
+    assert list(again.weights) == list(generated.weights)
+    assert list(again.nodes) == list(generated.nodes)
+    assert list(other.targets) != list(generated.targets)
+
+
+def test_nodes_match_the_loop_generator(generated, graph_dict):
+    assert generated.num_nodes == NUM_NODES
+    for i in (0, 1, 17, NUM_NODES - 1):
+        node = generated.nodes[i]
+        # Same spiral coordinates as iter_structured_graph()
+        angle = 2 * math.pi * i / NUM_NODES
+        radius = math.sqrt(i) * 10
+        assert node["coordinates"] == {"x": round(radius * math.cos(angle), 2),
+                                       "y": round(radius * math.sin(angle), 2)}
+        assert node["id"] == f"node_{i}"
+        assert node["name"] == f"{node['type']}_{node['region']}_{i}"
+        assert set(node) == set(graph_dict["nodes"]["node_0"])
+        assert 100 <= node["capacity"] <= 5000 and 1 <= node["priority"] <= 5
+
+
+def test_edges_follow_the_loop_generator(generated):
+    edges_per_node_avg = max(3, min(10, NUM_NODES // 100))
+    xs = [node["coordinates"]["x"] for node in generated.nodes]
+    ys = [node["coordinates"]["y"] for node in generated.nodes]
+    for i in range(NUM_NODES):
+        targets = list(generated.neighbors(i))
+        assert i not in targets and len(targets) == len(set(targets))
+        # Next node by index, up to num_connections - 1 nearby plus the random ones
+        assert (i + 1) % NUM_NODES in targets
+        assert len(targets) <= edges_per_node_avg + 2 + (edges_per_node_avg + 3) // 3
+
+        for target, weight in generated.edges(i):
+            distance = math.hypot(xs[i] - xs[target], ys[i] - ys[target])
+            # Distance with ±20% noise, rounded down, at least 1
+            assert weight == int(weight)
+            assert max(1, math.floor(distance * 0.8)) <= weight <= max(1, distance * 1.2)
+
+
+def test_searches_run_on_generated_graphs(generated):
+    found, explored, _ = bfs_search_all_components(generated, "type", "hub")
+    assert explored == NUM_NODES
+    assert sorted(found, key=lambda node_id: int(node_id.split("_")[1])) == \
+        [node["id"] for node in generated.nodes if node["type"] == "hub"]
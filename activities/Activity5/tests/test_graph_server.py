@@ -0,0 +1,87 @@
+"""
+The query server answers invalid requests with error replies and keeps the connection open.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import graph_server
+from bfs_search import bfs_search_all_components
+from graph_server import GraphServer, QueryError, run_query
+
+
+@pytest.mark.parametrize("request_fields, message", [
+    ({"op": "bfs", "criteria": "type=hub", "limit": -1}, "'limit'"),
+    ({"op": "bfs", "criteria": "type=hub", "limit": True}, "'limit'"),
+    ({"op": "bfs", "criteria": "type=hub", "limit": "5"}, "'limit'"),
+    ({"op": "bfs", "criteria": 5}, "'criteria' must be a string"),
+    ({"op": "bfs", "criteria": "type=hub or"}, "Expected property=value"),
+    ({"op": "bfs"}, "'criteria' or 'property'"),
+    ({"op": "bfs", "criteria": "type=hub", "start": ["node_0"]}, "not found"),
+    ({"op": "route", "source": "node_0", "target": "node_x"}, "'node_x' not found"),
+    ({"op": "route", "source": "node_0", "target": "node_1", "algorithm": "nosuch"},
+     "Unknown route algorithm"),
+    ({"op": "nearest", "source": "node_0", "criteria": "type=hub", "k": 0}, "'k'"),
+    ({"op": "explode"}, "Unknown operation"),
+])
+def test_invalid_requests_raise_query_error(csr, request_fields, message):
+    with pytest.raises(QueryError, match=message):
+        run_query(csr, request_fields)
+
+
+def test_valid_queries(csr):
+    result = run_query(csr, {"op": "bfs", "criteria": "type=hub", "limit": 0})
+    assert result["found"] == []
+    result = run_query(csr, {"op": "bfs", "property": "type", "value": "hub"})
+    assert result["found"] == bfs_search_all_components(csr, "type", "hub")[0]
+    result = run_query(csr, {"op": "route", "source": "node_0", "target": "node_9",
+                             "algorithm": "alt"})
+    assert result["path"][0] == "node_0" and result["path"][-1] == "node_9"
+
+
+def _exchange(csr, lines, tmp_path):
+    """Send raw request lines over one connection and return the decoded replies."""
+    async def session():
+        server = GraphServer()
+        server.graphs["small"] = csr
+        socket_path = str(tmp_path / "server.sock")
+        listener = await asyncio.start_unix_server(server.handle_connection, socket_path)
+        async with listener:
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+            replies = []
+            for line in lines:
+                writer.write(line.encode("utf-8") + b"\n")
+                await writer.drain()
+                replies.append(json.loads(await reader.readline()))
+            writer.close()
+            await writer.wait_closed()
+        return replies
+
+    return asyncio.run(session())
+
+
+def test_connection_survives_errors(csr, tmp_path, monkeypatch):
+    def broken_query(graph, request, cache=None):
+        if request["op"] == "crash":
+            raise RuntimeError("boom")
+        return run_query(graph, request, cache)
+
+    monkeypatch.setattr(graph_server, "run_query", broken_query)
+    replies = _exchange(csr, [
+        "not json",
+        json.dumps(["op", "bfs"]),
+        json.dumps({"op": "bfs", "graph": "huge", "criteria": "type=hub"}),
+        json.dumps({"op": "bfs", "graph": ["small"], "criteria": "type=hub"}),
+        json.dumps({"op": "bfs", "graph": "small", "criteria": "type=hub", "limit": -1}),
+        json.dumps({"op": "crash", "graph": "small"}),
+        json.dumps({"op": "bfs", "graph": "small", "criteria": "type=hub", "limit": 2}),
+        json.dumps({"op": "ping"}),
+    ], tmp_path)
+
+    assert [reply["ok"] for reply in replies] == [False] * 6 + [True] * 2
+    assert replies[0]["error"] == "Request is not valid JSON"
+    assert "Invalid graph size" in replies[2]["error"]
+    assert "boom" in replies[5]["error"]
+    assert len(replies[6]["result"]["found"]) == 2
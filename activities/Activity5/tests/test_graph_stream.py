@@ -0,0 +1,71 @@
+"""
+The streaming reader loads every layout alike and reports malformed nodes by name.
+"""
+
+import json
+
+import pytest
+
+from graph_stream import load_graph_streaming, write_graph_streaming
+
+
+@pytest.mark.parametrize("filename", ["graph.json.gz", "graph.ndjson"])
+def test_layouts_load_the_same_graph(graph_dict, csr, tmp_path, filename):
+    path = str(tmp_path / filename)
+    layout = "ndjson" if "ndjson" in filename else "compact"
+    write_graph_streaming(graph_dict, path, layout=layout)
+    loaded = load_graph_streaming(path)
+
+    assert list(loaded.node_ids) == list(csr.node_ids)
+    assert list(loaded.targets) == list(csr.targets)
+    assert list(loaded.nodes) == list(csr.nodes)
+
+
+@pytest.mark.parametrize("node, message", [
+    ({"id": "a", "type": "hub"}, "node 'a': missing attribute 'coordinates'"),
+    ({"id": "a", "type": "hub", "region": "north", "capacity": "big", "priority": 1,
+      "name": "hub_north_0", "coordinates": {"x": 0.0, "y": 0.0}},
+     "node 'a': invalid attribute 'capacity'"),
+    ({"id": "a", "type": "hub", "region": "north", "capacity": 5, "priority": 1,
+      "name": "hub_north_0", "coordinates": {"x": 0.0}},
+     "node 'a': missing attribute 'y'"),
+    ("a", "node 'a' is not a JSON object"),
+])
+def test_malformed_nodes_raise_value_error(tmp_path, node, message):
+    path = tmp_path / "graph_bad.json"
+    path.write_text(json.dumps({"nodes": {"a": node}, "edges": []}))
+    with pytest.raises(ValueError, match=message):
+        load_graph_streaming(str(path))
+
+
+@pytest.mark.parametrize("edge, message", [
+    (["a", "a"], "invalid edge"),
+    ({"source": "a"}, "has no 'source' and 'target'"),
+    ({"source": "a", "target": "b"}, "unknown node 'b'"),
+    ({"source": "a", "target": "a", "weight": "far"}, "invalid edge"),
+])
+def test_malformed_edges_raise_value_error(tmp_path, edge, message):
+    node = {"id": "a", "type": "hub", "region": "north", "capacity": 5, "priority": 1,
+            "name": "hub_north_0", "coordinates": {"x": 0.0, "y": 0.0}}
+    path = tmp_path / "graph_bad.json"
+    path.write_text(json.dumps({"nodes": {"a": node}, "edges": [edge]}))
+    with pytest.raises(ValueError, match=message):
+        load_graph_streaming(str(path))
+
+
+def test_corrupt_compressed_files_raise_value_error(graph_dict, tmp_path):
+    path = str(tmp_path / "graph.json.gz")
+    write_graph_streaming(graph_dict, path)
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    for damaged in (b"not gzip at all", data[:len(data) // 2]):
+        with open(path, 'wb') as f:
+            f.write(damaged)
+        with pytest.raises(ValueError, match="corrupt compressed data"):
+            load_graph_streaming(path)
+
+    archive = tmp_path / "graphs.zip"
+    archive.write_bytes(b"not a zip archive")
+    with pytest.raises(ValueError, match="corrupt compressed data"):
+        load_graph_streaming(str(archive), member="graph_small.json")
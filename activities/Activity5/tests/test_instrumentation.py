@@ -0,0 +1,92 @@
+"""
+Instrumented runs report their phases and counters as JSON without changing the results.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from bfs_search import bfs_search_all_components
+from graph_generator import save_graph
+from greedy_search import greedy_search_all_components
+from instrumentation import Instrumentation, search_counters
+
+
+ACTIVITY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPTS = {"bfs_search.py": bfs_search_all_components,
+           "greedy_search.py": greedy_search_all_components}
+
+
+@pytest.fixture
+def graph_dir(graph_dict, tmp_path):
+    """A directory holding the test graph as graph_small.json."""
+    save_graph(graph_dict, str(tmp_path / "graph_small.json"))
+    return tmp_path
+
+
+def _run(script, graph_dir, *options):
+    command = [sys.executable, os.path.join(ACTIVITY_DIR, script), "small", "type", "hub",
+               *options]
+    return subprocess.run(command, cwd=str(graph_dir), capture_output=True, text=True)
+
+
+@pytest.mark.parametrize("script", SCRIPTS)
+def test_report_phases_and_counters(script, graph_dir, csr):
+    result = _run(script, graph_dir, "--instrument", "report.json", "--trace-memory")
+    assert result.returncode == 0, result.stdout + result.stderr
+    with open(graph_dir / "report.json") as f:
+        report = json.load(f)
+
+    assert list(report["phases"]) == ["load", "prepare", "traverse", "display"]
+    assert report["total_time"] == pytest.approx(sum(report["phases"].values()))
+    assert list(report["memory"]["phase_peak_bytes"]) == list(report["phases"])
+
+    found, explored, _ = SCRIPTS[script](csr, "type", "hub")
+    assert report["found"] == len(found)
+    counters = report["counters"]
+    assert counters["nodes_explored"] == explored == csr.num_nodes
+    assert counters["edges_scanned"] == csr.num_edges
+    assert counters["predicate_evaluations"] == csr.num_nodes
+    assert ("heuristic_lookups" in counters) == (script == "greedy_search.py")
+
+
+def test_profile_lists_the_search(graph_dir):
+    result = _run("bfs_search.py", graph_dir, "--instrument", "-", "--profile")
+    report = json.loads(result.stdout[result.stdout.index("{\n"):])
+    assert any(row["function"] == "iter_bfs_indices" for row in report["profile"])
+
+
+def test_profile_requires_instrument(graph_dir):
+    result = _run("bfs_search.py", graph_dir, "--profile")
+    assert result.returncode == 1
+    assert "--profile requires --instrument FILE" in result.stdout
+
+
+def test_counters_follow_from_the_search_stats():
+    stats = {"nodes_explored": 40, "edges_checked": 310, "queued": 7}
+    assert search_counters(stats, 100, heuristic=True) == {
+        "nodes_explored": 40, "edges_scanned": 310, "queue_pushes": 47, "queue_pops": 40,
+        "match_checks": 47, "predicate_evaluations": 100, "heuristic_lookups": 47,
+        "heuristic_evaluations": 100}
+
+
+def test_traverse_phase_is_split_at_the_prepare_time():
+    instrumentation = Instrumentation()
+    instrumentation.phases["traverse"] = 2.0
+    instrumentation.record_search({"prepare_time": 0.5}, 10)
+    assert instrumentation.phases == {"prepare": 0.5, "traverse": 1.5}
+
+
+def test_disabled_instrumentation_records_nothing():
+    instrumentation = Instrumentation(enabled=False, profile=True, trace_memory=True)
+    instrumentation.start()
+    with instrumentation.phase("traverse"):
+        pass
+    instrumentation.record_search({"nodes_explored": 5}, 10)
+    instrumentation.stop()
+    assert instrumentation.phases == {} and instrumentation.counters == {}
+    assert instrumentation.profiler is None
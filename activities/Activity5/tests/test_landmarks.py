@@ -0,0 +1,60 @@
+"""
+Landmarks give exact ALT routes and are persisted to and reused from .alt files.
+"""
+
+import os
+import shutil
+
+import pytest
+
+from graph_stream import load_graph_streaming
+from landmarks import LandmarkIndex, get_landmark_index, landmark_filename_for
+
+
+def test_alt_round_trip(csr, tmp_path):
+    index = LandmarkIndex.build(csr, count=4)
+    filename = str(tmp_path / "graph_test.alt")
+    index.save(filename)
+    loaded = LandmarkIndex.load(filename)
+
+    assert loaded.fingerprint == index.fingerprint
+    assert list(loaded.landmarks) == list(index.landmarks)
+    for arrays in ("forward", "backward"):
+        for saved, original in zip(getattr(loaded, arrays), getattr(index, arrays)):
+            assert list(saved) == list(original)
+
+
+def test_other_files_are_rejected(tmp_path):
+    filename = str(tmp_path / "not_an_index")
+    with open(filename, 'wb') as f:
+        f.write(b"NOTMAGIC" + bytes(64))
+    with pytest.raises(ValueError):
+        LandmarkIndex.load(filename)
+
+
+def test_built_landmarks_are_saved_and_reused(graph_file, tmp_path):
+    copy = str(tmp_path / "graph_test.json")
+    shutil.copy(graph_file, copy)
+
+    # Without save=True nothing is written
+    get_landmark_index(load_graph_streaming(copy))
+    assert not os.path.exists(landmark_filename_for(copy))
+
+    built = get_landmark_index(load_graph_streaming(copy), save=True)
+    assert os.path.exists(landmark_filename_for(copy))
+
+    loaded = get_landmark_index(load_graph_streaming(copy))
+    assert isinstance(loaded.forward[0], memoryview)
+    assert list(loaded.forward[0]) == list(built.forward[0])
+
+
+def test_stale_alt_file_is_replaced(graph_file, tmp_path):
+    copy = str(tmp_path / "graph_test.json")
+    shutil.copy(graph_file, copy)
+    get_landmark_index(load_graph_streaming(copy), save=True)
+
+    changed = load_graph_streaming(copy)
+    changed.weights[0] += 1
+    index = get_landmark_index(changed, save=True)
+    assert not isinstance(index.forward[0], memoryview)
+    assert LandmarkIndex.load(landmark_filename_for(copy)).fingerprint == index.fingerprint
@@ -0,0 +1,94 @@
+"""
+Multi-source labels give every node the facility a search of its own finds nearest.
+"""
+
+import math
+
+import pytest
+
+from csr_graph import CSRGraph
+from nearest_facility import FacilityLabels, label_nearest_facilities, multi_source_bfs
+from search_criteria import compile_criteria
+from shortest_path import dijkstra_costs
+
+
+CRITERIA = ["type=hub", "type=warehouse and capacity_min=3000"]
+
+
+def _brute_force(csr, criteria, weighted, direction):
+    """(distance, lowest facility index at that distance) per node, one search per node."""
+    traversed = csr if direction == "to" else csr.reverse()
+    facilities = [i for i, matched in enumerate(compile_criteria(criteria).mask(csr)) if matched]
+    expected = []
+    for index in range(csr.num_nodes):
+        if weighted:
+            distance = dijkstra_costs(traversed, [index])
+        else:
+            hops, _ = multi_source_bfs(traversed, [index])
+            distance = [math.inf if hop < 0 else hop for hop in hops]
+        best = min((distance[i] for i in facilities), default=math.inf)
+        nearest = min((i for i in facilities if distance[i] == best), default=-1)
+        expected.append((best, nearest if best < math.inf else -1))
+    return expected
+
+
+@pytest.mark.parametrize("direction", ["to", "from"])
+@pytest.mark.parametrize("weighted", [True, False], ids=["weighted", "hops"])
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_labels_match_one_search_per_node(csr, criteria, weighted, direction):
+    # Edge weights are integers, so equal route costs compare equal
+    labels, _ = label_nearest_facilities(csr, criteria, weighted=weighted, direction=direction)
+    for index, (distance, facility) in enumerate(_brute_force(csr, criteria, weighted,
+                                                             direction)):
+        assert labels.facility[index] == facility
+        if facility >= 0:
+            assert labels.distance[index] == distance
+
+
+def test_unreachable_nodes_have_no_facility():
+    # c only has incoming edges, so it reaches no facility
+    graph = {"nodes": {node_id: {"type": node_type} for node_id, node_type in
+                       (("a", "hub"), ("b", "depot"), ("c", "depot"))},
+             "edges": [{"source": "b", "target": "a", "weight": 2},
+                       {"source": "a", "target": "c", "weight": 1}]}
+    csr = CSRGraph.from_graph(graph)
+    for weighted, unreachable in ((True, math.inf), (False, -1)):
+        labels, _ = label_nearest_facilities(csr, "type", "hub", weighted=weighted)
+        assert list(labels.facility) == [0, 0, -1]
+        assert labels.distance[2] == unreachable and not labels.reached(2)
+
+
+@pytest.mark.parametrize("weighted", [True, False], ids=["weighted", "hops"])
+def test_gnf_round_trip(csr, tmp_path, weighted):
+    labels, _ = label_nearest_facilities(csr, "type", "hub", weighted=weighted)
+    filename = str(tmp_path / "graph_test.gnf")
+    labels.save(filename)
+    loaded = FacilityLabels.load(filename)
+
+    assert (loaded.criteria, loaded.weighted, loaded.direction, loaded.num_facilities) == \
+        (labels.criteria, labels.weighted, labels.direction, labels.num_facilities)
+    assert list(loaded.facility) == list(labels.facility)
+    assert list(loaded.distance) == list(labels.distance)
+
+
+def test_unreachable_labels_round_trip(csr, tmp_path):
+    labels, _ = label_nearest_facilities(csr, "type", "nosuch")
+    filename = str(tmp_path / "graph_test.gnf")
+    labels.save(filename)
+    loaded = FacilityLabels.load(filename)
+    assert loaded.num_facilities == 0
+    assert all(math.isinf(distance) for distance in loaded.distance)
+    assert set(loaded.facility) == {-1}
+
+
+def test_other_files_are_rejected(tmp_path):
+    filename = str(tmp_path / "not_labels")
+    with open(filename, 'wb') as f:
+        f.write(b"NOTMAGIC" + bytes(64))
+    with pytest.raises(ValueError):
+        FacilityLabels.load(filename)
+
+
+def test_unknown_direction_is_rejected(csr):
+    with pytest.raises(ValueError, match="Unknown direction"):
+        label_nearest_facilities(csr, "type", "hub", direction="sideways")
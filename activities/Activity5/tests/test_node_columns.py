@@ -0,0 +1,48 @@
+"""
+Column-backed nodes rebuild the JSON node dictionaries, for any valid index.
+"""
+
+import json
+
+import pytest
+
+from graph_stream import load_graph_streaming
+
+
+@pytest.fixture(params=["generated names", "stored names"])
+def graph(request, graph_dict, tmp_path):
+    """The test graph as (json dict, streamed CSRGraph), with or without a names column."""
+    graph_dict = json.loads(json.dumps(graph_dict))
+    if request.param == "stored names":
+        graph_dict["nodes"]["node_3"]["name"] = "Central Depot"
+    filename = str(tmp_path / "graph_test.json")
+    with open(filename, 'w') as f:
+        json.dump(graph_dict, f)
+    csr = load_graph_streaming(filename)
+    assert (csr.nodes.names is None) == (request.param == "generated names")
+    return graph_dict, csr
+
+
+def test_nodes_match_the_json(graph):
+    graph_dict, csr = graph
+    for node_id, node in zip(csr.node_ids, csr.nodes):
+        assert node == graph_dict["nodes"][node_id]
+
+
+def test_negative_indices_count_from_the_end(graph):
+    _, csr = graph
+    nodes, n = csr.nodes, csr.num_nodes
+    for index in (-1, -2, -n):
+        assert nodes[index] == nodes[n + index]
+        assert nodes.name(index) == nodes.name(n + index) == nodes[n + index]["name"]
+
+
+@pytest.mark.parametrize("offset", [0, 1])
+def test_out_of_range_indices_raise(graph, offset):
+    _, csr = graph
+    n = csr.num_nodes
+    for index in (n + offset, -n - 1 - offset):
+        with pytest.raises(IndexError):
+            csr.nodes[index]
+        with pytest.raises(IndexError):
+            csr.nodes.name(index)
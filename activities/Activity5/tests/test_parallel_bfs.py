@@ -0,0 +1,46 @@
+"""
+The parallel BFS finds the same nodes in the same order as the deque BFS.
+"""
+
+import pytest
+
+import parallel_bfs
+from bfs_search import iter_bfs_matches
+from parallel_bfs import ParallelBFS, parallel_bfs_search
+
+
+CRITERIA = ["type=warehouse", "region=north or priority=5", "type=nosuch"]
+
+
+@pytest.fixture
+def every_level_in_parallel(monkeypatch):
+    """Send every level to the pool, however small the test graph is."""
+    monkeypatch.setattr(parallel_bfs, "PARALLEL_MIN_FRONTIER", 1)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_same_order_as_deque_bfs(csr, every_level_in_parallel, workers):
+    with ParallelBFS(csr, workers) as bfs:
+        for criteria in CRITERIA:
+            stats = {}
+            assert list(bfs.iter_matches(criteria, stats=stats)) == \
+                list(iter_bfs_matches(csr, criteria))
+            assert stats["nodes_explored"] == csr.num_nodes
+            assert (stats["parallel_levels"] > 0) == (workers > 1)
+            assert list(bfs.iter_matches(criteria, start_node_id="node_42")) == \
+                list(iter_bfs_matches(csr, criteria, start_node_id="node_42"))
+
+
+def test_small_graphs_start_no_pool(csr):
+    with ParallelBFS(csr, 3) as bfs:
+        stats = {}
+        assert list(bfs.iter_matches("type=hub", stats=stats)) == \
+            list(iter_bfs_matches(csr, "type=hub"))
+        assert stats["parallel_levels"] == 0
+
+
+def test_limit(csr, every_level_in_parallel):
+    found, _, _ = parallel_bfs_search(csr, "type", "hub", workers=2, limit=4)
+    assert found == list(iter_bfs_matches(csr, "type", "hub"))[:4]
+    with pytest.raises(ValueError, match="non-negative"):
+        parallel_bfs_search(csr, "type", "hub", workers=2, limit=-1)
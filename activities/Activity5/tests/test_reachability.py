@@ -0,0 +1,73 @@
+"""
+The SCC reachability index answers like a BFS over the graph.
+"""
+
+import random
+from collections import deque
+
+import pytest
+
+from csr_graph import CSRGraph
+from reachability import can_reach, count_matches, reaches_match, strongly_connected_components
+from search_criteria import compile_criteria
+
+
+@pytest.fixture
+def csr(graph_dict):
+    """
+    The generated graph is one strongly connected component; keeping only
+    forward edges and the back edges inside blocks of 20 nodes splits it
+    into many components with a non-trivial condensation.
+    """
+    def position(node_id):
+        return int(node_id.split("_")[1])
+
+    edges = [edge for edge in graph_dict["edges"]
+             if position(edge["source"]) < position(edge["target"]) or
+             position(edge["source"]) // 20 == position(edge["target"]) // 20]
+    return CSRGraph.from_graph(dict(graph_dict, edges=edges))
+
+
+def _reachable(csr, source):
+    """Indices reachable from a node (including itself), by plain BFS."""
+    seen = {source}
+    queue = deque([source])
+    while queue:
+        for neighbor, _ in csr.edges(queue.popleft()):
+            if neighbor not in seen:
+                seen.add(neighbor)
+                queue.append(neighbor)
+    return seen
+
+
+def _sample(csr, count=25):
+    return random.Random(11).sample(range(csr.num_nodes), count)
+
+
+def test_components_are_mutually_reachable(csr):
+    component, count = strongly_connected_components(csr)
+    assert count > 1
+    for source in _sample(csr, 10):
+        reachable = _reachable(csr, source)
+        same = {i for i in range(csr.num_nodes) if component[i] == component[source]}
+        assert same == {i for i in reachable if source in _reachable(csr, i)}
+
+
+def test_can_reach_matches_bfs(csr):
+    targets = _sample(csr)
+    for source in _sample(csr):
+        reachable = _reachable(csr, source)
+        for target in targets:
+            answer, _, _ = can_reach(csr, csr.node_ids[source], csr.node_ids[target])
+            assert answer == (target in reachable)
+
+
+@pytest.mark.parametrize("criteria", ["type=warehouse", "capacity_min=4500 and region=south"])
+def test_criteria_queries_match_bfs(csr, criteria):
+    mask = compile_criteria(criteria).mask(csr)
+    for source in _sample(csr):
+        matches = [i for i in _reachable(csr, source) if mask[i]]
+        node_id = csr.node_ids[source]
+        assert reaches_match(csr, node_id, criteria)[0] == bool(matches)
+        assert count_matches(csr, criteria, node_id=node_id)[0] == len(matches)
+    assert count_matches(csr, criteria)[0] == mask.count(1)
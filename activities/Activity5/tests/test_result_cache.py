@@ -0,0 +1,113 @@
+"""
+Repeated searches are answered from the cache, also after a restart, but never for a changed graph.
+"""
+
+import os
+
+import pytest
+
+import result_cache
+from bfs_search import bfs_search, bfs_search_all_components
+from graph_stream import load_graph_streaming
+from result_cache import CACHE_EXTENSION, ResultCache, cached_search, graph_version
+
+
+@pytest.fixture
+def no_searches(monkeypatch):
+    """Make every traversal fail, so only cached results can be returned."""
+    def fail(*args, **kwargs):
+        raise AssertionError("searched instead of using the cache")
+
+    def forbid():
+        for algorithm in result_cache._TRAVERSALS:
+            monkeypatch.setitem(result_cache._TRAVERSALS, algorithm, (fail, fail))
+        monkeypatch.setattr(result_cache, "indexed_search", fail)
+    return forbid
+
+
+def test_second_query_is_a_memory_hit(csr, no_searches):
+    cache = ResultCache()
+    found, explored, _ = cached_search(csr, "bfs", "type", "warehouse", limit=5, cache=cache)
+    assert (found, explored) == bfs_search_all_components(csr, "type", "warehouse", limit=5)[:2]
+
+    no_searches()
+    # The expression form has the same canonical criteria
+    assert cached_search(csr, "bfs", "type=warehouse", limit=5, cache=cache)[:2] == \
+        (found, explored)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_start_node_and_limit_are_part_of_the_key(csr):
+    cache = ResultCache()
+    for start_node_id, limit in [(None, None), (None, 3), ("node_8", None), ("node_9", None)]:
+        cached_search(csr, "bfs", "region=north", start_node_id=start_node_id, limit=limit,
+                      cache=cache)
+    assert cache.stats()["misses"] == 4
+    assert cached_search(csr, "bfs", "region=north", start_node_id="node_8",
+                         cache=cache)[0] == bfs_search(csr, "node_8", "region", "north")[0]
+
+
+def test_disk_hit_after_restart(graph_file, csr, tmp_path, no_searches):
+    directory = str(tmp_path / "cache")
+    expected = cached_search(csr, "greedy", "capacity_min=3000", cache=ResultCache(
+        directory=directory))[:2]
+
+    # A new process: fresh cache object, graph loaded again
+    no_searches()
+    cache = ResultCache(directory=directory)
+    assert cached_search(load_graph_streaming(graph_file), "greedy", "capacity_min=3000",
+                         cache=cache)[:2] == expected
+    assert cache.stats()["disk_hits"] == 1
+    assert cached_search(csr, "greedy", "capacity_min=3000", cache=cache)[:2] == expected
+    assert cache.stats()["hits"] == 1
+
+
+def test_changed_graph_misses(graph_file, tmp_path):
+    cache = ResultCache(directory=str(tmp_path / "cache"))
+    cached_search(load_graph_streaming(graph_file), "bfs", "type=hub", cache=cache)
+
+    changed = load_graph_streaming(graph_file)
+    changed.weights[0] += 1
+    assert graph_version(changed) != graph_version(load_graph_streaming(graph_file))
+    cached_search(changed, "bfs", "type=hub", cache=cache)
+    assert cache.stats()["misses"] == 2
+
+
+def test_damaged_disk_entries_are_misses(csr, tmp_path):
+    directory = str(tmp_path / "cache")
+    cached_search(csr, "indexed", "type=hub", cache=ResultCache(directory=directory))
+    for name in os.listdir(directory):
+        if name.endswith(CACHE_EXTENSION):
+            with open(os.path.join(directory, name), 'wb') as f:
+                f.write(b"not a pickle")
+
+    cache = ResultCache(directory=directory)
+    found, _, _ = cached_search(csr, "indexed", "type=hub", cache=cache)
+    assert cache.stats()["misses"] == 1 and len(found) > 0
+
+
+def test_memory_tier_is_bounded():
+    cache = ResultCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key * 10)
+    assert cache.get("a") is None and cache.get("c") == "c" * 10
+    assert cache.stats()["evictions"] == 1
+
+    cache = ResultCache(max_bytes=1000)
+    cache.put("big", b"x" * 2000)
+    cache.put("small", b"x")
+    assert cache.get("big") is None and len(cache) == 1
+
+
+@pytest.mark.parametrize("arguments, message", [
+    (("dfs", "type=hub"), "Unknown algorithm"),
+    (("bfs", "type=hub or"), "Expected property=value"),
+])
+def test_invalid_searches_are_rejected(csr, arguments, message):
+    with pytest.raises(ValueError, match=message):
+        cached_search(csr, *arguments, cache=ResultCache())
+
+
+def test_negative_limit_is_rejected(csr):
+    with pytest.raises(ValueError, match="non-negative"):
+        cached_search(csr, "bfs", "type=hub", limit=-1, cache=ResultCache())
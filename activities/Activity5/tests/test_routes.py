@@ -0,0 +1,63 @@
+"""
+Bidirectional and ALT route queries find routes as cheap (or as short) as one-sided searches.
+"""
+
+import random
+
+import pytest
+
+from landmarks import alt_route
+from route_search import bidirectional_bfs, bfs_route, bidirectional_dijkstra
+from shortest_path import dijkstra_route
+
+
+NUM_PAIRS = 40
+
+
+def _pairs(csr):
+    rng = random.Random(3)
+    pairs = [(rng.randrange(csr.num_nodes), rng.randrange(csr.num_nodes))
+             for _ in range(NUM_PAIRS)]
+    return [(csr.node_ids[s], csr.node_ids[t]) for s, t in pairs] + [("node_5", "node_5")]
+
+
+def _path_cost(csr, path):
+    """Cost of a path over the cheapest edge between each pair of nodes."""
+    cost = 0.0
+    for source, target in zip(path, path[1:]):
+        weights = [w for t, w in csr.edges(csr.index_of(source)) if t == csr.index_of(target)]
+        assert weights, f"no edge {source} -> {target}"
+        cost += min(weights)
+    return cost
+
+
+@pytest.mark.parametrize("route", [bidirectional_dijkstra, alt_route],
+                         ids=["bidirectional", "alt"])
+def test_route_cost_equals_dijkstra(csr, route):
+    for source, target in _pairs(csr):
+        path, cost, _, _ = route(csr, source, target)
+        _, expected, _, _ = dijkstra_route(csr, source, target)
+        if expected is None:
+            assert (path, cost) == ([], None)
+        else:
+            assert cost == pytest.approx(expected)
+            assert path[0] == source and path[-1] == target
+            assert _path_cost(csr, path) == pytest.approx(cost)
+
+
+def test_bidirectional_bfs_hops_equal_one_sided(csr):
+    for source, target in _pairs(csr):
+        path, hops, _, _ = bidirectional_bfs(csr, source, target)
+        assert hops == bfs_route(csr, source, target)[1]
+        if path:
+            assert len(path) == hops + 1
+
+
+@pytest.mark.parametrize("route", [bidirectional_dijkstra, bidirectional_bfs],
+                         ids=["dijkstra", "bfs"])
+def test_unreachable_target_gives_no_route(route):
+    graph = {"nodes": {"a": {}, "b": {}, "c": {}},
+             "edges": [{"source": "a", "target": "b", "weight": 1},
+                       {"source": "c", "target": "a", "weight": 1}]}
+    assert route(graph, "a", "c")[:2] == ([], None)
+    assert route(graph, "c", "b")[:2] == (["c", "a", "b"], 2)
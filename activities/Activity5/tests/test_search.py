@@ -0,0 +1,162 @@
+"""
+BFS and greedy search return the same results as the original dictionary-based versions.
+"""
+
+import heapq
+import math
+import os
+import subprocess
+import sys
+from collections import deque
+
+import pytest
+
+from attribute_index import indexed_search
+from bfs_search import bfs_search, bfs_search_all_components, matches_search_criteria
+from greedy_search import calculate_heuristic, greedy_search, greedy_search_all_components
+
+
+ACTIVITY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUERIES = [("type", "warehouse"), ("region", "north"), ("capacity_min", "3000"),
+           ("capacity_max", "500"), ("priority", "5")]
+
+
+def _adjacency(graph):
+    adjacency = {node_id: [] for node_id in graph["nodes"]}
+    for edge in graph["edges"]:
+        adjacency[edge["source"]].append(edge["target"])
+    return adjacency
+
+
+def _matches(node, search_property, search_value):
+    """The original matches_search_criteria() for valid criteria."""
+    if search_property in ("type", "region"):
+        return node[search_property] == search_value
+    if search_property == "capacity_min":
+        return node["capacity"] >= int(search_value)
+    if search_property == "capacity_max":
+        return node["capacity"] <= int(search_value)
+    return node["priority"] == int(search_value)
+
+
+def _reference_heuristics(graph, search_property, search_value):
+    """Heuristic per node ID, computed as the original calculate_heuristic() did."""
+    nodes = graph["nodes"]
+    if search_property in ("type", "region"):
+        matching = [n for n in nodes.values() if n[search_property] == search_value]
+        avg_x = avg_y = 0.0
+        if matching:
+            avg_x = sum(n["coordinates"]["x"] for n in matching) / len(matching)
+            avg_y = sum(n["coordinates"]["y"] for n in matching) / len(matching)
+        return {node_id: math.sqrt((n["coordinates"]["x"] - avg_x)**2 +
+                                   (n["coordinates"]["y"] - avg_y)**2)
+                for node_id, n in nodes.items()}
+    if search_property == "priority":
+        return {node_id: abs(n["priority"] - int(search_value)) * 1000
+                for node_id, n in nodes.items()}
+    return {node_id: abs(n["capacity"] - int(search_value)) for node_id, n in nodes.items()}
+
+
+def _reference_search(graph, search_property, search_value, greedy):
+    """The original *_search_all_components() on the graph dictionary."""
+    adjacency = _adjacency(graph)
+    heuristic = _reference_heuristics(graph, search_property, search_value) if greedy else None
+    visited, found, explored = set(), [], 0
+    for start in graph["nodes"]:
+        if start in visited:
+            continue
+        visited.add(start)
+        if _matches(graph["nodes"][start], search_property, search_value):
+            found.append(start)
+        queue = [(heuristic[start], start)] if greedy else deque([start])
+        while queue:
+            current = heapq.heappop(queue)[1] if greedy else queue.popleft()
+            explored += 1
+            for neighbor in adjacency[current]:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    if greedy:
+                        heapq.heappush(queue, (heuristic[neighbor], neighbor))
+                    else:
+                        queue.append(neighbor)
+                    if _matches(graph["nodes"][neighbor], search_property, search_value):
+                        found.append(neighbor)
+    return found, explored
+
+
+@pytest.mark.parametrize("search_property, search_value", QUERIES)
+@pytest.mark.parametrize("greedy", [False, True], ids=["bfs", "greedy"])
+def test_all_components_matches_reference(graph_dict, csr, search_property, search_value,
+                                          greedy):
+    search = greedy_search_all_components if greedy else bfs_search_all_components
+    expected = _reference_search(graph_dict, search_property, search_value, greedy)
+
+    for graph in (graph_dict, csr):
+        found, explored, _ = search(graph, search_property, search_value)
+        assert (found, explored) == expected
+
+
+@pytest.mark.parametrize("greedy", [False, True], ids=["bfs", "greedy"])
+def test_limit_returns_prefix(csr, greedy):
+    search = greedy_search_all_components if greedy else bfs_search_all_components
+    found, _, _ = search(csr, "region", "north")
+    limited, _, _ = search(csr, "region", "north", limit=5)
+    assert limited == found[:5]
+
+
+def test_single_start_searches_reach_the_same_nodes(csr):
+    bfs_found, _, _ = bfs_search(csr, "node_0", "type", "hub")
+    greedy_found, _, _ = greedy_search(csr, "node_0", "type", "hub")
+    assert sorted(bfs_found) == sorted(greedy_found)
+
+
+def test_calculate_heuristic_matches_reference(graph_dict):
+    expected = _reference_heuristics(graph_dict, "type", "hub")
+    for node_id in ("node_0", "node_17", "node_299"):
+        node = graph_dict["nodes"][node_id]
+        assert calculate_heuristic(node, "type", "hub", graph_dict) == \
+            pytest.approx(expected[node_id])
+
+
+@pytest.mark.parametrize("search_property, search_value", QUERIES)
+def test_matches_search_criteria(graph_dict, search_property, search_value):
+    for node in graph_dict["nodes"].values():
+        assert matches_search_criteria(node, search_property, search_value) == \
+            _matches(node, search_property, search_value)
+
+
+def test_invalid_criteria_match_nothing(graph_dict, capsys):
+    node = graph_dict["nodes"]["node_0"]
+    assert not matches_search_criteria(node, "priority", "high")
+    assert "priority requires an integer value" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("greedy", [False, True], ids=["bfs", "greedy"])
+def test_limit_stops_the_traversal_early(csr, greedy):
+    search = greedy_search_all_components if greedy else bfs_search_all_components
+    _, explored, _ = search(csr, "region", "north")
+    limited, limited_explored, _ = search(csr, "region", "north", limit=1)
+    assert len(limited) == 1 and limited_explored < explored
+    assert search(csr, "region", "north", limit=0)[0] == []
+
+
+@pytest.mark.parametrize("search", [
+    lambda csr, limit: bfs_search_all_components(csr, "type", "hub", limit=limit),
+    lambda csr, limit: greedy_search_all_components(csr, "type", "hub", limit=limit),
+    lambda csr, limit: bfs_search(csr, "node_0", "type", "hub", limit=limit),
+    lambda csr, limit: greedy_search(csr, "node_0", "type", "hub", limit=limit),
+    lambda csr, limit: indexed_search(csr, "type", "hub", limit=limit),
+], ids=["bfs", "greedy", "bfs-start", "greedy-start", "indexed"])
+@pytest.mark.parametrize("limit", [-1, 1.5, True])
+def test_invalid_limits_are_rejected(csr, search, limit):
+    with pytest.raises(ValueError, match="limit must be a non-negative integer"):
+        search(csr, limit)
+
+
+@pytest.mark.parametrize("script", ["bfs_search.py", "greedy_search.py"])
+def test_cli_rejects_negative_limit(script):
+    result = subprocess.run([sys.executable, script, "small", "type", "hub", "--limit", "-1"],
+                            cwd=ACTIVITY_DIR, capture_output=True, text=True)
+    assert result.returncode == 1
+    assert "Error: --limit requires a non-negative integer value" in result.stdout
@@ -0,0 +1,77 @@
+"""
+Dijkstra and A* return the k nearest matching nodes by route cost.
+"""
+
+import math
+
+import pytest
+
+from search_criteria import compile_criteria
+from shortest_path import (ASTAR_MAX_TARGETS, dijkstra_costs, dijkstra_route,
+                           iter_nearest_matches, nearest_matches)
+
+
+SOURCES = ["node_0", "node_57", "node_123", "node_299"]
+
+# 9, 61 and 130 matches in the test graph: A* runs for the first two only
+CRITERIA = ["type=depot and priority=5", "type=hub", "region=north or region=south"]
+
+
+def _expected(csr, source_node_id, criteria, k):
+    """The k matching nodes with the lowest route cost, from a full Dijkstra."""
+    costs = dijkstra_costs(csr, [csr.index_of(source_node_id)])
+    mask = compile_criteria(criteria).mask(csr)
+    return sorted(costs[i] for i in range(csr.num_nodes) if mask[i] and costs[i] < math.inf)[:k]
+
+
+def _path_cost(csr, path):
+    cost = 0.0
+    for source, target in zip(path, path[1:]):
+        cost += min(w for t, w in csr.edges(csr.index_of(source)) if t == csr.index_of(target))
+    return cost
+
+
+@pytest.mark.parametrize("algorithm", ["dijkstra", "astar"])
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_nearest_matches_are_cheapest(csr, algorithm, criteria):
+    for source in SOURCES:
+        results, _, _ = nearest_matches(csr, source, criteria, k=5, algorithm=algorithm)
+        assert [cost for _, cost, _ in results] == \
+            pytest.approx(_expected(csr, source, criteria, 5))
+        for node_id, cost, path in results:
+            assert path[0] == source and path[-1] == node_id
+            assert _path_cost(csr, path) == pytest.approx(cost)
+
+
+@pytest.mark.parametrize("criteria", CRITERIA)
+def test_astar_settles_no_more_than_dijkstra(csr, criteria):
+    for source in SOURCES:
+        _, dijkstra_settled, _ = nearest_matches(csr, source, criteria, algorithm="dijkstra")
+        _, astar_settled, _ = nearest_matches(csr, source, criteria, algorithm="astar")
+        assert astar_settled <= dijkstra_settled
+
+
+def test_astar_falls_back_to_dijkstra_for_many_targets(csr):
+    for criteria in CRITERIA:
+        stats = {}
+        next(iter_nearest_matches(csr, "node_0", criteria, algorithm="astar", stats=stats))
+        matches = compile_criteria(criteria).mask(csr).count(1)
+        assert stats["algorithm"] == ("astar" if matches <= ASTAR_MAX_TARGETS else "dijkstra")
+
+
+@pytest.mark.parametrize("k", [0, -1, 1.5, True])
+def test_invalid_k_is_rejected(csr, k):
+    with pytest.raises(ValueError, match="k must be a positive integer"):
+        nearest_matches(csr, "node_0", "type=hub", k=k)
+
+
+def test_k_limits_the_results(csr):
+    assert len(nearest_matches(csr, "node_0", "type=hub", k=1)[0]) == 1
+    assert nearest_matches(csr, "node_0", "type=nosuch", k=3)[0] == []
+
+
+def test_dijkstra_route_matches_costs(csr):
+    costs = dijkstra_costs(csr, [0])
+    for target in (1, 50, 150, 299):
+        _, cost, _, _ = dijkstra_route(csr, "node_0", csr.node_ids[target])
+        assert cost == pytest.approx(costs[target])
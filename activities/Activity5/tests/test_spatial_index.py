@@ -0,0 +1,51 @@
+"""
+KD-tree radius, box and nearest queries return what a linear scan returns.
+"""
+
+import random
+
+import pytest
+
+from node_columns import numeric_column
+from spatial_index import box_search, linear_scan, nearest_search, radius_search
+
+
+CRITERIA = [(None, None), ("type", "warehouse"), ("region=north or priority=5", None)]
+
+
+def _points(csr, count=10):
+    rng = random.Random(5)
+    xs, ys = numeric_column(csr, "x"), numeric_column(csr, "y")
+    points = [(rng.uniform(min(xs), max(xs)), rng.uniform(min(ys), max(ys)))
+              for _ in range(count)]
+    # Query points on nodes exercise distance ties and zero distances
+    return points + [(xs[i], ys[i]) for i in range(0, csr.num_nodes, 97)]
+
+
+@pytest.mark.parametrize("search_property, search_value", CRITERIA)
+def test_radius_matches_linear_scan(csr, search_property, search_value):
+    for x, y in _points(csr):
+        for radius in (0.0, 25.0, 80.0):
+            results, _, _ = radius_search(csr, x, y, radius, search_property, search_value)
+            expected, _ = linear_scan(csr, "radius", (x, y, radius), search_property,
+                                      search_value)
+            assert results == expected
+
+
+@pytest.mark.parametrize("search_property, search_value", CRITERIA)
+def test_box_matches_linear_scan(csr, search_property, search_value):
+    for x, y in _points(csr):
+        box = (x - 40.0, y - 15.0, x + 20.0, y + 60.0)
+        found, _, _ = box_search(csr, *box, search_property, search_value)
+        expected, _ = linear_scan(csr, "box", box, search_property, search_value)
+        assert found == expected
+
+
+@pytest.mark.parametrize("search_property, search_value", CRITERIA)
+def test_nearest_matches_linear_scan(csr, search_property, search_value):
+    for x, y in _points(csr):
+        for k in (1, 7, csr.num_nodes + 1):
+            results, _, _ = nearest_search(csr, x, y, k, search_property, search_value)
+            expected, _ = linear_scan(csr, "nearest", (x, y, k), search_property,
+                                      search_value)
+            assert results == expected